@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+
+"""
+Standalone performance test of suite config loading for a large
+parameterized suite, similar to dev/suites/busy_param but with several
+graph sections, e.g. for an ensemble.
+
+Usage: config-load-benchmark.py [N_MEMBERS [N_SECTIONS [N_PROCESSES]]]
+
+Compares loading the suite with a single process against loading it with
+N_PROCESSES (default: number of processor cores) graph parser processes, and
+checks that the results are the same.
+"""
+
+import os
+import shutil
+import sys
+import time
+from multiprocessing import cpu_count
+from tempfile import mkdtemp
+
+CYLC_DIR = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+os.environ.setdefault("CYLC_DIR", CYLC_DIR)
+sys.path.insert(0, os.path.join(CYLC_DIR, "lib"))
+
+from cylc.cfgspec.glbl_cfg import glbl_cfg
+from cylc.config import SuiteConfig
+
+# Number of ensemble members.
+N_MEMBERS = 50
+# Number of graph sections (cycling sequences).
+N_SECTIONS = 8
+# Number of tasks per member in each graph section.
+N_TASKS = 25
+
+
+def write_suite(fpath, n_members, n_sections):
+    """Write the suite definition."""
+    handle = open(fpath, "wb")
+    handle.write("""[cylc]
+    UTC mode = True
+    [[parameters]]
+        m = 1..%d
+        s = 1..4
+[scheduling]
+    initial cycle point = 20130101T00
+    final cycle point = 20130103T00
+    [[dependencies]]
+""" % n_members)
+    for sec in range(n_sections):
+        handle.write("        [[[T%02d]]]\n" % (sec % 24))
+        handle.write('            graph = """\n')
+        first = sec * N_TASKS
+        last = first + N_TASKS - 1
+        handle.write("t%d<m,s>[-P1D] => t%d<m,s>\n" % (last, first))
+        for i in range(first, last):
+            handle.write("t%d<m,s> => t%d<m,s>\n" % (i, i + 1))
+        handle.write('"""\n')
+    handle.write("""[runtime]
+    [[root]]
+        script = true
+    [[ENS<m>]]
+""")
+    for i in range(n_sections * N_TASKS):
+        handle.write("    [[t%d<m,s>]]\n" % i)
+        handle.write("        inherit = ENS<m>\n")
+    handle.close()
+
+
+def load(fpath, n_procs):
+    """Load the suite config, return (elapsed time, result summary)."""
+    glbl_cfg().sparse['suite config processes'] = n_procs
+    start = time.time()
+    config = SuiteConfig("benchmark", fpath, use_proc_pool=True)
+    elapsed = time.time() - start
+    summary = (
+        [str(seq) for seq in config.sequences],
+        sorted(
+            (name, str(seq), str(dep))
+            for name, tdef in config.taskdefs.items()
+            for seq, deps in tdef.dependencies.items()
+            for dep in deps))
+    return elapsed, summary
+
+
+def main():
+    n_members = N_MEMBERS
+    n_sections = N_SECTIONS
+    n_procs = cpu_count()
+    if len(sys.argv) > 1:
+        n_members = int(sys.argv[1])
+    if len(sys.argv) > 2:
+        n_sections = int(sys.argv[2])
+    if len(sys.argv) > 3:
+        n_procs = int(sys.argv[3])
+
+    suite_dir = mkdtemp(prefix="cylc-config-load-benchmark-")
+    try:
+        fpath = os.path.join(suite_dir, "suite.rc")
+        write_suite(fpath, n_members, n_sections)
+        t_serial, serial = load(fpath, 1)
+        t_parallel, parallel = load(fpath, n_procs)
+    finally:
+        shutil.rmtree(suite_dir)
+
+    print "Members: %d, graph sections: %d, tasks: %d" % (
+        n_members, n_sections, len(set(item[0] for item in serial[1])))
+    print "1 process:", t_serial, "sec"
+    print "%d processes:" % n_procs, t_parallel, "sec"
+    print " => factor of", t_serial / t_parallel
+    if serial != parallel:
+        sys.exit("ERROR: results differ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+
+"""
+Standalone performance test of global config host item look ups, as done
+in task job preparation for every task (job log directory, work directory,
+task communication method, etc.).
+
+Usage: host-item-benchmark.py [N_TASKS [N_HOST_PATTERNS]]
+
+Compares memoized look ups against look ups with the cache cleared before
+each call (i.e. the original per-call regular expression matching).
+"""
+
+import os
+import shutil
+import sys
+import time
+from tempfile import mkdtemp
+
+CYLC_DIR = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+os.environ.setdefault("CYLC_DIR", CYLC_DIR)
+sys.path.insert(0, os.path.join(CYLC_DIR, "lib"))
+
+from cylc.cfgspec.globalcfg import GlobalConfig, SPEC, upg
+
+# Number of tasks.
+N_TASKS = 10000
+# Number of host sections (patterns) in the global config.
+N_HOSTS = 50
+
+ITEMS = [
+    "task communication method",
+    "use login shell",
+    "cylc executable",
+    "ssh command",
+]
+DERIVED_ITEMS = [
+    "suite job log directory",
+    "suite work directory",
+    "suite run directory",
+]
+
+
+def main():
+    n_tasks = N_TASKS
+    n_hosts = N_HOSTS
+    if len(sys.argv) > 1:
+        n_tasks = int(sys.argv[1])
+    if len(sys.argv) > 2:
+        n_hosts = int(sys.argv[2])
+
+    conf_dir = mkdtemp(prefix="cylc-host-item-benchmark-")
+    try:
+        handle = open(os.path.join(conf_dir, GlobalConfig.CONF_BASE), "wb")
+        handle.write("[hosts]\n")
+        for i in range(n_hosts):
+            handle.write("    [[hpc%d-login\\d+\\.example\\.org]]\n" % i)
+            handle.write("        use login shell = False\n")
+        handle.close()
+        os.environ["CYLC_CONF_PATH"] = conf_dir
+        gcfg = GlobalConfig(SPEC, upg)
+        gcfg.load()
+    finally:
+        shutil.rmtree(conf_dir)
+
+    # Spread tasks over the hosts, the last pattern matching worst case.
+    hosts = ["hpc%d-login%d.example.org" % (i % n_hosts, i % 4)
+             for i in range(n_tasks)]
+
+    def prep(clear):
+        """Emulate the host item look ups of job preparation."""
+        for host in hosts:
+            for item in ITEMS:
+                if clear:
+                    gcfg.clear_host_item_cache()
+                gcfg.get_host_item(item, host, None)
+            for item in DERIVED_ITEMS:
+                if clear:
+                    gcfg.clear_host_item_cache()
+                gcfg.get_derived_host_item("my.suite", item, host, None, True)
+
+    start = time.time()
+    prep(True)
+    t_uncached = time.time() - start
+
+    gcfg.clear_host_item_cache()
+    start = time.time()
+    prep(False)
+    t_cached = time.time() - start
+
+    print "Tasks: %d, host patterns: %d" % (n_tasks, n_hosts)
+    print "Uncached:", t_uncached, "sec"
+    print "Cached:", t_cached, "sec"
+    print " => factor of", t_uncached / t_cached
+
+
+if __name__ == "__main__":
+    main()
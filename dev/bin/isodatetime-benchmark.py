@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+
+"""
+Standalone performance test of isodatetime time point comparison and
+addition, for the time point subtraction test cases of isodatetime.
+
+Usage: isodatetime-benchmark.py [N_REPEATS]
+
+Compares the comparison and addition of time points using the ordinal key
+and the whole seconds arithmetic of the time points, against the original
+methods that tick over each unit in turn, and checks that the results are
+the same.
+"""
+
+import os
+import sys
+import time
+
+CYLC_DIR = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(CYLC_DIR, "lib"))
+
+from isodatetime.data import TimePoint
+from isodatetime.parsers import DurationParser
+from isodatetime.tests import get_timepoint_subtract_tests
+
+# Number of times to repeat the test cases.
+N_REPEATS = 100
+
+
+def run(cases, n_repeats):
+    """Compare and add the time points of each case, return the results."""
+    results = []
+    for _ in range(n_repeats):
+        for point1, point2, duration in cases:
+            # Copy the time points, as a suite does with new cycle points.
+            point1 = point1.copy()
+            point2 = point2.copy()
+            results.append(cmp(point1, point2))
+            results.append(cmp(point2, point1))
+            results.append(cmp(point1, point1.copy()))
+            results.append(point2 + duration)
+            results.append(point1 - duration)
+    return results
+
+
+def main():
+    n_repeats = N_REPEATS
+    if len(sys.argv) > 1:
+        n_repeats = int(sys.argv[1])
+
+    parser = DurationParser()
+    cases = []
+    for kwargs1, kwargs2, duration_string in get_timepoint_subtract_tests():
+        cases.append((
+            TimePoint(**kwargs1), TimePoint(**kwargs2),
+            parser.parse(duration_string)))
+    print "Cases: %d, repeats: %d" % (len(cases), n_repeats)
+
+    t_start = time.time()
+    results = run(cases, n_repeats)
+    t_fast = time.time() - t_start
+
+    get_ordinal_key = TimePoint.get_ordinal_key
+    add_whole_seconds = TimePoint._add_whole_seconds
+    TimePoint.get_ordinal_key = lambda self: None
+    TimePoint._add_whole_seconds = lambda self, duration: False
+    try:
+        t_start = time.time()
+        tick_over_results = run(cases, n_repeats)
+        t_tick_over = time.time() - t_start
+    finally:
+        TimePoint.get_ordinal_key = get_ordinal_key
+        TimePoint._add_whole_seconds = add_whole_seconds
+
+    print "tick over:", t_tick_over, "sec"
+    print "ordinal key, whole seconds:", t_fast, "sec"
+    print "   => factor of", t_tick_over / t_fast
+    if map(str, results) != map(str, tick_over_results):
+        sys.exit("ERROR: results differ")
+
+
+if __name__ == "__main__":
+    main()
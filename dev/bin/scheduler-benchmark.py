@@ -0,0 +1,371 @@
+#!/usr/bin/env python
+
+"""
+Standalone performance test of the suite server program with large synthetic
+suites, with regression tracking against the results of a previous run.
+
+Usage: scheduler-benchmark.py [OPTIONS] [GRAPH ...]
+
+For each GRAPH type (default: all), generate a suite and time:
+  config-load         loading the suite config (including graph parsing)
+  graph-expand        expanding the graph over the first cycle points, as
+                      for "cylc graph"
+  release-runahead    TaskPool.release_runahead_tasks
+  match-dependencies  TaskPool.match_dependencies
+  state-summary       StateSummaryMgr.update
+  put-task-pool       SuiteDatabaseManager.put_task_pool, and writing the
+                      queued statements to the suite database
+
+The task pool benchmarks are the total time of the calls made while running
+the suite for a number of steps, like the main loop of a simulation mode
+suite, but with every task that is ready to run starting at once, and
+succeeding after a fixed number of steps.
+
+Graph types:
+  fan-out      one task triggers a wide family, which triggers one task
+  chain        a deep chain of tasks
+  cycles       a small graph with a sequential task, which runs behind the
+               other tasks by up to many active cycle points
+  param        a heavily parameterised graph
+  conditional  a graph of conditional triggers
+
+Write the results as JSON with "--output=FILE". Compare with the results of a
+previous run (on the same host!) with "--baseline=FILE": exit with an error
+if any benchmark is slower than its baseline by more than the tolerance.
+"""
+
+import json
+import logging
+from optparse import OptionParser
+import os
+import shutil
+import sys
+import time
+from tempfile import mkdtemp
+
+CYLC_DIR = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+os.environ.setdefault("CYLC_DIR", CYLC_DIR)
+sys.path.insert(0, os.path.join(CYLC_DIR, "lib"))
+
+from cylc.config import SuiteConfig
+from cylc.cycling.loader import get_interval
+from cylc.hostuserutil import get_host
+from cylc.state_summary_mgr import StateSummaryMgr
+from cylc.suite_db_mgr import SuiteDatabaseManager
+from cylc.suite_logging import SUITE_LOG
+from cylc.task_events_mgr import TaskEventsManager
+from cylc.task_pool import TaskPool
+from cylc.task_proxy import TaskProxy
+from cylc.task_state import (
+    TASK_STATUS_RUNNING, TASK_STATUS_SUCCEEDED, TASK_STATUS_WAITING)
+from cylc.version import CYLC_VERSION
+
+# Benchmarks, in order of reporting.
+BENCHMARKS = [
+    "config-load", "graph-expand", "release-runahead", "match-dependencies",
+    "state-summary", "put-task-pool"]
+# Size of each graph type at scale 1.
+SIZE = 1000
+# Number of main loop steps to run the task pool for.
+N_STEPS = 20
+# Number of main loop steps that each task runs for.
+RUN_STEPS = 2
+# Number of runs to take the best time of each benchmark from.
+N_REPEATS = 3
+# Interval to expand the graph over.
+GRAPH_EXPAND_INTERVAL = "P2D"
+# Report a regression if a benchmark is slower than its baseline by more than
+# this fraction, and by more than MIN_REGRESSION seconds (to ignore noise).
+TOLERANCE = 0.25
+MIN_REGRESSION = 0.1
+
+SUITE_HEAD = """[cylc]
+    UTC mode = True
+    [[parameters]]
+%(parameters)s
+[scheduling]
+    initial cycle point = 20000101T00
+    max active cycle points = %(max_active)d
+    spawn to max active cycle points = %(spawn_to_max)s
+    [[dependencies]]
+        [[[%(recurrence)s]]]
+            graph = \"\"\"
+%(graph)s
+\"\"\"
+[runtime]
+    [[root]]
+        script = true
+%(runtime)s
+"""
+
+
+def get_fan_out_suite(size):
+    """Return a suite with a wide family fan-out and fan-in."""
+    runtime = ["    [[FAN]]"]
+    for i in range(size):
+        runtime.append("    [[fan%04d]]\n        inherit = FAN" % i)
+    return SUITE_HEAD % {
+        "parameters": "",
+        "max_active": 3,
+        "spawn_to_max": False,
+        "recurrence": "P1D",
+        "graph": "in[-P1D] => in => FAN\nFAN:succeed-all => out",
+        "runtime": "\n".join(runtime)}
+
+
+def get_chain_suite(size):
+    """Return a suite with a deep chain of tasks."""
+    graph = ["chain%04d[-P1D] => chain0000" % (size - 1)]
+    for i in range(size - 1):
+        graph.append("chain%04d => chain%04d" % (i, i + 1))
+    return SUITE_HEAD % {
+        "parameters": "",
+        "max_active": 3,
+        "spawn_to_max": False,
+        "recurrence": "P1D",
+        "graph": "\n".join(graph),
+        "runtime": ""}
+
+
+def get_cycles_suite(size):
+    """Return a suite with a small graph and many active cycle points."""
+    return SUITE_HEAD % {
+        "parameters": "",
+        "max_active": size // 4,
+        "spawn_to_max": True,
+        "recurrence": "PT1H",
+        "graph": "get => proc1 & proc2 => put\nput[-PT1H] => put",
+        "runtime": ""}
+
+
+def get_param_suite(size):
+    """Return a suite with a heavily parameterised graph."""
+    return SUITE_HEAD % {
+        "parameters": "        m = 1..%d\n        n = 1..%d" % (
+            max(size // 20, 1), 20),
+        "max_active": 3,
+        "spawn_to_max": False,
+        "recurrence": "P1D",
+        "graph": (
+            "prep[-P1D] => prep => model<m> => post<m,n> => arch<m>\n"
+            "arch<m> => done"),
+        "runtime": ""}
+
+
+def get_conditional_suite(size):
+    """Return a suite with a graph of conditional triggers."""
+    return SUITE_HEAD % {
+        "parameters": "        i = 1..%d" % max(size // 4, 1),
+        "max_active": 3,
+        "spawn_to_max": False,
+        "recurrence": "P1D",
+        "graph": (
+            "e<i>[-P1D] | d<i>[-P1D] => a<i> & b<i>\n"
+            "a<i> | b<i> => c<i>\n"
+            "(a<i> & b<i>) | c<i> => d<i>\n"
+            "c<i> | d<i> | a<i>:fail => e<i>"),
+        "runtime": ""}
+
+
+GRAPHS = {
+    "fan-out": get_fan_out_suite,
+    "chain": get_chain_suite,
+    "cycles": get_cycles_suite,
+    "param": get_param_suite,
+    "conditional": get_conditional_suite}
+GRAPH_NAMES = ["fan-out", "chain", "cycles", "param", "conditional"]
+
+
+class BenchmarkScheduler(object):
+    """The scheduler attributes needed by StateSummaryMgr.update."""
+
+    def __init__(self, config, pool):
+        self.config = config
+        self.pool = pool
+        self.run_mode = "simulation"
+        self.stop_mode = None
+        self.stop_point = None
+        self.stop_clock_time = None
+        self.stop_clock_time_string = None
+        self.stop_task = None
+        self.final_point = None
+
+
+class Timer(object):
+    """Accumulate the elapsed time of calls, by benchmark name."""
+
+    def __init__(self):
+        self.results = dict((name, 0.0) for name in BENCHMARKS)
+
+    def call(self, name, func, *args):
+        """Call func(*args), add its elapsed time, return its result."""
+        start = time.time()
+        ret = func(*args)
+        self.results[name] += time.time() - start
+        return ret
+
+
+def run(graph_name, size, n_steps):
+    """Run the benchmarks for a graph type.
+
+    Return (results, number of tasks in the pool at the end).
+    """
+    timer = Timer()
+    suite_dir = mkdtemp(prefix="cylc-scheduler-benchmark-")
+    try:
+        fpath = os.path.join(suite_dir, "suite.rc")
+        handle = open(fpath, "wb")
+        handle.write(GRAPHS[graph_name](size))
+        handle.close()
+        config = timer.call(
+            "config-load", SuiteConfig, graph_name, fpath, None, None,
+            "simulation")
+        start_point = config.start_point
+        # Ungroup all families, to expand the graph of every task.
+        timer.call(
+            "graph-expand", config.get_graph_raw, str(start_point),
+            str(start_point + get_interval(GRAPH_EXPAND_INTERVAL)),
+            None, None, False, False, True)
+
+        srv_dir = os.path.join(suite_dir, ".service")
+        log_dir = os.path.join(suite_dir, "log")
+        os.mkdir(srv_dir)
+        os.mkdir(log_dir)
+        suite_db_mgr = SuiteDatabaseManager(srv_dir, log_dir)
+        suite_db_mgr.on_suite_start(False)
+        pool = TaskPool(
+            config, None, suite_db_mgr,
+            TaskEventsManager(graph_name, None, suite_db_mgr))
+        for name in config.get_task_name_list():
+            pool.add_to_runahead_pool(TaskProxy(
+                config.get_taskdef(name), start_point, is_startup=True))
+        schd = BenchmarkScheduler(config, pool)
+        state_summary_mgr = StateSummaryMgr()
+        start_steps = {}
+        for step in range(n_steps):
+            timer.call("release-runahead", pool.release_runahead_tasks)
+            timer.call("match-dependencies", pool.match_dependencies)
+            for itask in pool.get_tasks():
+                if itask.state.status == TASK_STATUS_RUNNING:
+                    if step >= start_steps[itask.identity] + RUN_STEPS:
+                        itask.state.reset_state(TASK_STATUS_SUCCEEDED)
+                elif (itask.state.status == TASK_STATUS_WAITING and
+                        not itask.is_waiting_prereqs()):
+                    itask.state.reset_state(TASK_STATUS_RUNNING)
+                    start_steps[itask.identity] = step
+            pool.spawn_all_tasks()
+            pool.remove_spent_tasks()
+            timer.call("state-summary", state_summary_mgr.update, schd)
+            timer.call("put-task-pool", put_task_pool, suite_db_mgr, pool)
+        n_tasks = len(pool.get_all_tasks())
+        suite_db_mgr.on_suite_shutdown()
+    finally:
+        shutil.rmtree(suite_dir)
+    return timer.results, n_tasks
+
+
+def put_task_pool(suite_db_mgr, pool):
+    """Queue statements to update the task pool tables, and write them."""
+    suite_db_mgr.put_task_pool(pool)
+    suite_db_mgr.process_queued_ops()
+
+
+def compare(results, baseline, tolerance):
+    """Compare results with baseline results.
+
+    Return a list of (graph name, benchmark name, result, baseline result)
+    for each regression.
+    """
+    regressions = []
+    for graph_name, graph_results in sorted(results.items()):
+        for name, result in sorted(graph_results.items()):
+            try:
+                base = baseline[graph_name][name]
+            except KeyError:
+                continue
+            if (result > base * (1.0 + tolerance) and
+                    result - base > MIN_REGRESSION):
+                regressions.append((graph_name, name, result, base))
+    return regressions
+
+
+def main():
+    parser = OptionParser(usage=__doc__.split("Usage: ", 1)[1].rstrip())
+    parser.add_option(
+        "--scale", help="Multiply the size of each graph by this.",
+        type="float", default=1.0, dest="scale")
+    parser.add_option(
+        "--steps", help="Number of steps to run the task pool for.",
+        type="int", default=N_STEPS, dest="n_steps")
+    parser.add_option(
+        "--repeat", help="Repeat, and take the best time of each benchmark.",
+        type="int", default=N_REPEATS, dest="repeat")
+    parser.add_option(
+        "--output", help="Write results as JSON to this file.",
+        metavar="FILE", dest="output")
+    parser.add_option(
+        "--baseline", help="Compare with results in this file.",
+        metavar="FILE", dest="baseline")
+    parser.add_option(
+        "--tolerance",
+        help="Slow down (fraction) tolerated before reporting a regression.",
+        type="float", default=TOLERANCE, dest="tolerance")
+    options, args = parser.parse_args()
+    for arg in args:
+        if arg not in GRAPHS:
+            parser.error("%s: unknown graph type" % arg)
+    graph_names = args or GRAPH_NAMES
+    size = max(int(SIZE * options.scale), 4)
+    # Discard the suite log, as for a suite without "--debug".
+    logger = logging.getLogger(SUITE_LOG)
+    logger.addHandler(logging.NullHandler())
+    logger.setLevel(logging.INFO)
+
+    results = {}
+    n_tasks = {}
+    for graph_name in graph_names:
+        for _ in range(options.repeat):
+            graph_results, n_tasks[graph_name] = run(
+                graph_name, size, options.n_steps)
+            if graph_name in results:
+                for name, result in graph_results.items():
+                    results[graph_name][name] = min(
+                        results[graph_name][name], result)
+            else:
+                results[graph_name] = graph_results
+
+    print "%-12s%8s" % ("graph", "tasks") + "".join(
+        "%20s" % name for name in BENCHMARKS)
+    for graph_name in graph_names:
+        print "%-12s%8d" % (graph_name, n_tasks[graph_name]) + "".join(
+            "%20.3f" % results[graph_name][name] for name in BENCHMARKS)
+
+    if options.output:
+        handle = open(options.output, "wb")
+        json.dump(
+            {"cylc version": CYLC_VERSION, "host": get_host(),
+             "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+             "scale": options.scale, "steps": options.n_steps,
+             "results": results},
+            handle, indent=4, sort_keys=True)
+        handle.close()
+
+    if options.baseline:
+        baseline = json.load(open(options.baseline))
+        if (baseline["scale"], baseline["steps"]) != (
+                options.scale, options.n_steps):
+            sys.exit("ERROR: %s: scale and steps differ from this run" % (
+                options.baseline))
+        regressions = compare(results, baseline["results"], options.tolerance)
+        for graph_name, name, result, base in regressions:
+            print "REGRESSION: %s %s: %.3f sec (baseline %.3f sec)" % (
+                graph_name, name, result, base)
+        if regressions:
+            sys.exit("ERROR: %d regression(s) against %s" % (
+                len(regressions), options.baseline))
+        print "No regressions against %s" % options.baseline
+
+
+if __name__ == "__main__":
+    main()
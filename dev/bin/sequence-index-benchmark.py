@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+
+"""
+Standalone performance test of ISO8601 sequence point look ups far from the
+start of long-running sequences, as done e.g. for the prerequisites of
+sequential tasks in a suite that started years ago.
+
+Usage: sequence-index-benchmark.py [N_DAYS [N_POINTS]]
+
+Compares look ups with arithmetic indexing of the recurrences against look
+ups by iterating the recurrences from the start, and checks that the
+results are the same.
+"""
+
+import os
+import sys
+import time
+
+CYLC_DIR = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(CYLC_DIR, "lib"))
+
+from cylc.cycling.iso8601 import (
+    init, ISO8601Interval, ISO8601Point, ISO8601Sequence)
+
+# Number of days since the start of the sequences.
+N_DAYS = 100
+# Number of points to look up.
+N_POINTS = 10
+# Sequence specifications.
+SPECS = ["PT1H", "PT6H", "T00!T00/P7D", "P1M"]
+METHODS = ["is_on_sequence", "get_nearest_prev_point", "get_next_point",
+           "get_first_point"]
+
+
+def run(sequence, points):
+    """Call each look up method for each point, return the results."""
+    results = []
+    for point in points:
+        for method in METHODS:
+            results.append(getattr(sequence, method)(point))
+    return results
+
+
+def main():
+    n_days = N_DAYS
+    n_points = N_POINTS
+    if len(sys.argv) > 1:
+        n_days = int(sys.argv[1])
+    if len(sys.argv) > 2:
+        n_points = int(sys.argv[2])
+
+    init(time_zone="Z")
+    start = ISO8601Point("20000101T0000Z")
+    points = [
+        start + ISO8601Interval("P%dDT%dM" % (n_days + i, 30 * (i % 2)))
+        for i in range(n_points)]
+    print "Days since start: %d, look ups: %d" % (
+        n_days, n_points * len(METHODS))
+    for spec in SPECS:
+        indexed = ISO8601Sequence(spec, str(start))
+        iterated = ISO8601Sequence(spec, str(start))
+        iterated._index_seconds = iterated._index_months = None
+        t_start = time.time()
+        results = run(indexed, points)
+        t_indexed = time.time() - t_start
+        t_start = time.time()
+        iterated_results = run(iterated, points)
+        t_iterated = time.time() - t_start
+        print "%s:" % spec
+        print "  iterated:", t_iterated, "sec"
+        print "  indexed:", t_indexed, "sec"
+        print "   => factor of", t_iterated / t_indexed
+        if results != iterated_results:
+            sys.exit("ERROR: results differ")
+
+
+if __name__ == "__main__":
+    main()
@@ -108,13 +108,15 @@ import stat
 from subprocess import Popen, PIPE
 import sys
 import traceback
+from cylc.cfgspec.glbl_cfg import glbl_cfg
 from cylc.mkdir_p import mkdir_p
 from cylc.task_message import (
     CYLC_JOB_PID, CYLC_JOB_INIT_TIME, CYLC_JOB_EXIT_TIME, CYLC_JOB_EXIT,
-    CYLC_MESSAGE)
+    CYLC_MESSAGE, VACATION_MESSAGE_PREFIX)
 from cylc.task_outputs import TASK_OUTPUT_SUCCEEDED
 from cylc.task_job_logs import (
-    JOB_LOG_JOB, JOB_LOG_OUT, JOB_LOG_ERR, JOB_LOG_STATUS)
+    JOB_LOG_JOB, JOB_LOG_OUT, JOB_LOG_ERR, JOB_LOG_STATUS,
+    append_task_job_status_journal, get_task_job_status_journal)
 from cylc.wallclock import get_current_time_string
 
 
@@ -278,8 +280,12 @@ class BatchSysManager(object):
         ctx_list = []  # Contexts for all relevant jobs
         ctx_list_by_batch_sys = {}  # {batch_sys_name1: [ctx1, ...], ...}
 
+        journal_ctxs = self._jobs_poll_status_journals(
+            job_log_root, job_log_dirs)
         for job_log_dir in job_log_dirs:
-            ctx = self._jobs_poll_status_files(job_log_root, job_log_dir)
+            ctx = journal_ctxs.get(job_log_dir)
+            if ctx is None:
+                ctx = self._jobs_poll_status_files(job_log_root, job_log_dir)
             if ctx is None:
                 continue
             ctx_list.append(ctx)
@@ -455,20 +461,56 @@ class BatchSysManager(object):
                 match = rec_id.match(line)
                 if match:
                     job_id = match.group("id")
-                    job_status_file = open(st_file_path, "a")
-                    job_status_file.write("%s=%s\n" % (
-                        self.CYLC_BATCH_SYS_JOB_ID, job_id))
-                    job_status_file.write("%s=%s\n" % (
+                    text = "%s=%s\n%s=%s\n" % (
+                        self.CYLC_BATCH_SYS_JOB_ID, job_id,
                         self.CYLC_BATCH_SYS_JOB_SUBMIT_TIME,
-                        get_current_time_string()))
+                        get_current_time_string())
+                    job_status_file = open(st_file_path, "a")
+                    job_status_file.write(text)
                     job_status_file.close()
+                    append_task_job_status_journal(st_file_path, text)
                     break
         if hasattr(batch_sys, "filter_submit_output"):
             out, err = batch_sys.filter_submit_output(out, err)
         return out, err, job_id
 
+    def _jobs_poll_status_journals(self, job_log_root, job_log_dirs):
+        """Helper 1a for self.jobs_poll(job_log_root, job_log_dirs).
+
+        Read the job status journals of the cycle points of the jobs, if
+        enabled. Return {job_log_dir: ctx, ...} for the jobs with complete
+        records, i.e. from the start of their submission, in the journals.
+        The other jobs should be polled from their job status files.
+
+        """
+        ctxs = {}
+        if not glbl_cfg().get_host_item('job status journal'):
+            return ctxs
+        job_log_dirs_of_points = {}  # {point: set([job_log_dir, ...]), ...}
+        for job_log_dir in job_log_dirs:
+            job_log_dirs_of_points.setdefault(
+                job_log_dir.split(os.sep, 1)[0], set()).add(job_log_dir)
+        for point, point_job_log_dirs in job_log_dirs_of_points.items():
+            try:
+                handle = open(get_task_job_status_journal(job_log_root, point))
+            except IOError:
+                continue
+            for line in handle:
+                if "|" not in line:
+                    continue
+                job_log_dir, line = line.split("|", 1)
+                if job_log_dir not in point_job_log_dirs:
+                    continue
+                if line.startswith(self.CYLC_BATCH_SYS_NAME + "="):
+                    # Start of a (re-)submission, as in a new job status file
+                    ctxs[job_log_dir] = JobPollContext(job_log_dir)
+                if job_log_dir in ctxs:
+                    self._jobs_poll_status_line(ctxs[job_log_dir], line)
+            handle.close()
+        return ctxs
+
     def _jobs_poll_status_files(self, job_log_root, job_log_dir):
-        """Helper 1 for self.jobs_poll(job_log_root, job_log_dirs)."""
+        """Helper 1b for self.jobs_poll(job_log_root, job_log_dirs)."""
         ctx = JobPollContext(job_log_dir)
         try:
             handle = open(os.path.join(
@@ -477,35 +519,47 @@ class BatchSysManager(object):
             sys.stderr.write(str(exc) + "\n")
             return
         for line in handle:
-            if "=" not in line:
-                continue
-            key, value = line.strip().split("=", 1)
-            if key == self.CYLC_BATCH_SYS_NAME:
-                ctx.batch_sys_name = value
-            elif key == self.CYLC_BATCH_SYS_JOB_ID:
-                ctx.batch_sys_job_id = value
-            elif key == self.CYLC_BATCH_SYS_EXIT_POLLED:
-                ctx.batch_sys_exit_polled = 1
-            elif key == CYLC_JOB_PID:
-                ctx.pid = value
-            elif key == self.CYLC_BATCH_SYS_JOB_SUBMIT_TIME:
-                ctx.time_submit_exit = value
-            elif key == CYLC_JOB_INIT_TIME:
-                ctx.time_run = value
-            elif key == CYLC_JOB_EXIT_TIME:
-                ctx.time_run_exit = value
-            elif key == CYLC_JOB_EXIT:
-                if value == TASK_OUTPUT_SUCCEEDED.upper():
-                    ctx.run_status = 0
-                else:
-                    ctx.run_status = 1
-                    ctx.run_signal = value
-            elif key == CYLC_MESSAGE:
-                ctx.messages.append(value)
+            self._jobs_poll_status_line(ctx, line)
         handle.close()
 
         return ctx
 
+    def _jobs_poll_status_line(self, ctx, line):
+        """Update a job poll context with a line of its job status file."""
+        if "=" not in line:
+            return
+        key, value = line.strip().split("=", 1)
+        if key == self.CYLC_BATCH_SYS_NAME:
+            ctx.batch_sys_name = value
+        elif key == self.CYLC_BATCH_SYS_JOB_ID:
+            ctx.batch_sys_job_id = value
+        elif key == self.CYLC_BATCH_SYS_EXIT_POLLED:
+            ctx.batch_sys_exit_polled = 1
+        elif key == CYLC_JOB_PID:
+            ctx.pid = value
+        elif key == self.CYLC_BATCH_SYS_JOB_SUBMIT_TIME:
+            ctx.time_submit_exit = value
+        elif key == CYLC_JOB_INIT_TIME:
+            ctx.time_run = value
+        elif key == CYLC_JOB_EXIT_TIME:
+            ctx.time_run_exit = value
+        elif key == CYLC_JOB_EXIT:
+            if value == TASK_OUTPUT_SUCCEEDED.upper():
+                ctx.run_status = 0
+            else:
+                ctx.run_status = 1
+                ctx.run_signal = value
+        elif key == CYLC_MESSAGE:
+            if value.split("|", 2)[-1].startswith(VACATION_MESSAGE_PREFIX):
+                # Job vacated, forget entries related to the current job, as
+                # they are removed from the job status file.
+                ctx.pid = None
+                ctx.time_run = None
+                ctx.time_run_exit = None
+                ctx.run_status = None
+                ctx.run_signal = None
+            ctx.messages.append(value)
+
     def _jobs_poll_batch_sys(self, job_log_root, batch_sys_name, my_ctx_list):
         """Helper 2 for self.jobs_poll(job_log_root, job_log_dirs)."""
         exp_job_ids = [ctx.batch_sys_job_id for ctx in my_ctx_list]
@@ -569,15 +623,18 @@ class BatchSysManager(object):
                 ctx.batch_sys_exit_polled = 0
             # Add information to "job.status"
             if ctx.batch_sys_exit_polled:
+                st_file_path = os.path.join(
+                    job_log_root, ctx.job_log_dir, JOB_LOG_STATUS)
+                text = "%s=%s\n" % (
+                    self.CYLC_BATCH_SYS_EXIT_POLLED, get_current_time_string())
                 try:
-                    handle = open(os.path.join(
-                        job_log_root, ctx.job_log_dir, JOB_LOG_STATUS), "a")
-                    handle.write("%s=%s\n" % (
-                        self.CYLC_BATCH_SYS_EXIT_POLLED,
-                        get_current_time_string()))
+                    handle = open(st_file_path, "a")
+                    handle.write(text)
                     handle.close()
                 except IOError as exc:
                     sys.stderr.write(str(exc) + "\n")
+                else:
+                    append_task_job_status_journal(st_file_path, text)
 
     def _job_submit_impl(
             self, job_file_path, batch_sys_name, submit_opts):
@@ -592,10 +649,11 @@ class BatchSysManager(object):
                 pass
 
         # Start new status file
+        text = "%s=%s\n" % (self.CYLC_BATCH_SYS_NAME, batch_sys_name)
         job_status_file = open(job_file_path + ".status", "w")
-        job_status_file.write(
-            "%s=%s\n" % (self.CYLC_BATCH_SYS_NAME, batch_sys_name))
+        job_status_file.write(text)
         job_status_file.close()
+        append_task_job_status_journal(job_file_path + ".status", text)
 
         # Submit job
         batch_sys = self._get_sys(batch_sys_name)
@@ -48,6 +48,8 @@ SPEC = {
     'enable run directory housekeeping': vdr(vtype='boolean', default=False),
     'run directory rolling archive length': vdr(
         vtype='integer', default=2),
+    'enable suite definition cache': vdr(vtype='boolean', default=False),
+    'suite config processes': vdr(vtype='integer', default=1),
     'task host select command timeout': vdr(
         vtype='interval', default=DurationFloat(10)),
     'task messaging': {
@@ -89,6 +91,7 @@ SPEC = {
         'roll over at start-up': vdr(vtype='boolean', default=True),
         'rolling archive length': vdr(vtype='integer', default=5),
         'maximum size in bytes': vdr(vtype='integer', default=1000000),
+        'queue size': vdr(vtype='integer', default=10000),
     },
 
     'documentation': {
@@ -168,6 +171,7 @@ SPEC = {
                 vtype='interval_list', default=[]),
             'tail command template': vdr(
                 vtype='string', default="tail -n +1 -F %(filename)s"),
+            'job status journal': vdr(vtype='boolean', default=False),
             'batch systems': {
                 '__MANY__': {
                     'err tailer': vdr(vtype='string'),
@@ -204,6 +208,7 @@ SPEC = {
             'task event handler retry delays': vdr(
                 vtype='interval_list'),
             'tail command template': vdr(vtype='string'),
+            'job status journal': vdr(vtype='boolean', default=None),
             'batch systems': {
                 '__MANY__': {
                     'err tailer': vdr(vtype='string'),
@@ -402,6 +407,15 @@ class GlobalConfig(config):
     OLD_SITE_CONF_BASE = os.path.join("siterc", "site.rc")
     OLD_USER_CONF_BASE = os.path.join("user.rc")
 
+    def __init__(self, *args, **kwargs):
+        config.__init__(self, *args, **kwargs)
+        # {(item, host, owner, replace_home, owner_home): value, ...}
+        self._host_item_cache = {}
+        # {host: host_key, ...}
+        self._host_key_cache = {}
+        # {host_key: compiled_pattern, ...}
+        self._host_patterns = {}
+
     @classmethod
     def get_inst(cls):
         """Return the singleton instance."""
@@ -444,6 +458,16 @@ class GlobalConfig(config):
                 if os.access(fname, os.F_OK | os.R_OK):
                     self.loadcfg(fname, "global config")
         self.transform()
+        self.clear_host_item_cache()
+
+    def clear_host_item_cache(self):
+        """Invalidate memoized host item look ups.
+
+        Call this after modifying any items under the [hosts] section.
+        """
+        self._host_item_cache.clear()
+        self._host_key_cache.clear()
+        self._host_patterns.clear()
 
     def get_derived_host_item(
             self, suite, item, host=None, owner=None, replace_home=False):
@@ -487,7 +511,16 @@ class GlobalConfig(config):
     def get_host_item(self, item, host=None, owner=None, replace_home=False,
                       owner_home=None):
         """This allows hosts with no matching entry in the config file
-        to default to appropriately modified localhost settings."""
+        to default to appropriately modified localhost settings.
+
+        Results are memoized against the arguments, as this is called
+        for every task job. The cache is cleared on (re)load.
+        """
+        key = (item, host, owner, replace_home, owner_home)
+        try:
+            return self._host_item_cache[key]
+        except KeyError:
+            pass
 
         cfg = self.get()
 
@@ -498,17 +531,7 @@ class GlobalConfig(config):
             host = 'localhost'
 
         # is there a matching host section?
-        host_key = None
-        if host:
-            if host in cfg['hosts']:
-                # there's an entry for this host
-                host_key = host
-            else:
-                # try for a pattern match
-                for cfg_host in cfg['hosts']:
-                    if re.match(cfg_host, host):
-                        host_key = cfg_host
-                        break
+        host_key = self._get_host_key(host)
         modify_dirs = False
         if host_key is not None:
             # entry exists, any unset items under it have already
@@ -531,8 +554,38 @@ class GlobalConfig(config):
         if item == "task communication method" and value == "default":
             # Translate "default" to client-server comms: "https" or "http".
             value = cfg['communication']['method']
+        self._host_item_cache[key] = value
         return value
 
+    def _get_host_key(self, host):
+        """Return the [hosts] section name matching host, or None.
+
+        Exact names take precedence, otherwise the first section name that
+        matches host as a regular expression is used.
+        """
+        try:
+            return self._host_key_cache[host]
+        except KeyError:
+            pass
+        cfg_hosts = self.get()['hosts']
+        host_key = None
+        if host in cfg_hosts:
+            # there's an entry for this host
+            host_key = host
+        else:
+            # try for a pattern match
+            for cfg_host in cfg_hosts:
+                try:
+                    pattern = self._host_patterns[cfg_host]
+                except KeyError:
+                    pattern = self._host_patterns[cfg_host] = re.compile(
+                        cfg_host)
+                if pattern.match(host):
+                    host_key = cfg_host
+                    break
+        self._host_key_cache[host] = host_key
+        return host_key
+
     def roll_directory(self, dir_, name, archlen=0):
         """Create a directory after rolling back any previous instances of it.
 
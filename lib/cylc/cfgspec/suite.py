@@ -219,8 +219,17 @@ SPEC = {
         'task event mail interval': vdr(vtype='interval', default=None),
         'log resolved dependencies': vdr(vtype='boolean', default=False),
         'disable automatic shutdown': vdr(vtype='boolean', default=False),
+        'automatic checkpoint retention': vdr(vtype='integer', default=100),
+        'job log housekeeping': {
+            'retention window': vdr(vtype='cycleinterval', default=None),
+            'action': vdr(
+                vtype='string', options=['archive', 'delete'],
+                default='archive'),
+            'maximum cycle points per run': vdr(vtype='integer', default=10),
+        },
         'simulation': {
             'disable suite event handlers': vdr(vtype='boolean', default=True),
+            'virtual clock': vdr(vtype='boolean', default=False),
         },
         'environment': {
             '__MANY__': vdr(vtype='string'),
@@ -563,7 +572,7 @@ def upg(cfg, descr):
 class RawSuiteConfig(config):
     """Raw suite configuration."""
 
-    def __init__(self, fpath, output_fname, tvars):
+    def __init__(self, fpath, output_fname, tvars, proc_cache=None):
         """Return the default instance."""
-        config.__init__(self, SPEC, upg, output_fname, tvars)
+        config.__init__(self, SPEC, upg, output_fname, tvars, proc_cache)
         self.loadcfg(fpath, "suite definition")
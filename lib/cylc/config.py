@@ -24,6 +24,7 @@ structures.
 
 from copy import copy
 from fnmatch import fnmatchcase
+from multiprocessing import cpu_count, Pool
 import os
 import re
 import traceback
@@ -31,8 +32,9 @@ import traceback
 from cylc.c3mro import C3
 from cylc.conditional_simplifier import ConditionalSimplifier
 from cylc.exceptions import CylcError
-from cylc.graph_parser import GraphParser
+from cylc.graph_parser import GraphParser, GraphParseError
 from cylc.param_expand import NameExpander
+from cylc.cfgspec.glbl_cfg import glbl_cfg
 from cylc.cfgspec.suite import RawSuiteConfig
 from cylc.cycling.loader import (
     get_point, get_point_relative, get_interval, get_interval_cls,
@@ -46,13 +48,16 @@ from cylc.print_tree import print_tree
 from cylc.taskdef import TaskDef, TaskDefError
 from cylc.task_id import TaskID
 from cylc.task_trigger import TaskTrigger, Dependency
+from cylc.version import CYLC_VERSION
 from cylc.wallclock import get_current_time_string
 from isodatetime.data import Calendar
 from isodatetime.parsers import DurationParser
+from parsec.cache import ProcFileCache
 from parsec.OrderedDict import OrderedDictWithDefaults
-from parsec.util import replicate
+from parsec.util import poverlay, replicate
 from cylc.suite_logging import OUT, ERR
-from cylc.suite_srv_files_mgr import SuiteSrvFilesManager
+from cylc.suite_srv_files_mgr import (
+    SuiteSrvFilesManager, SuiteServiceFileError)
 from cylc.task_outputs import TASK_OUTPUT_SUCCEEDED
 
 RE_CLOCK_OFFSET = re.compile(r'(' + TaskID.NAME_RE + r')(?:\(\s*(.+)\s*\))?')
@@ -66,6 +71,30 @@ NUM_RUNAHEAD_SEQ_POINTS = 5  # Number of cycle points to look at per sequence.
 BCOMPAT_MSG_RE_C6 = re.compile(r'^(.*)\[\s*(([+-])?\s*(.*))?\s*\](.*)$')
 
 
+# Arguments for GraphParser in _parse_graph_worker.
+_GRAPH_PARSER_ARGS = {}
+
+
+def _init_graph_parser_worker(family_map, parameters):
+    """Set GraphParser arguments for _parse_graph_worker.
+
+    (In a worker process, these are inherited rather than pickled.)
+    """
+    _GRAPH_PARSER_ARGS['family_map'] = family_map
+    _GRAPH_PARSER_ARGS['parameters'] = parameters
+
+
+def _parse_graph_worker(graph):
+    """Parse a graph string, see SuiteConfig._parse_graph_sections."""
+    parser = GraphParser(**_GRAPH_PARSER_ARGS)
+    try:
+        parser.parse_graph(graph)
+    except GraphParseError as exc:
+        return exc
+    return (
+        parser.triggers, parser.original, parser.suite_state_polling_tasks)
+
+
 class SuiteConfigError(Exception):
     """
     Attributes:
@@ -96,7 +125,7 @@ class SuiteConfig(object):
                  cli_start_point_string=None, cli_final_point_string=None,
                  is_reload=False, output_fname=None,
                  vis_start_string=None, vis_stop_string=None,
-                 mem_log_func=None):
+                 mem_log_func=None, use_proc_pool=False):
 
         self.mem_log = mem_log_func
         if mem_log_func is None:
@@ -104,6 +133,9 @@ class SuiteConfig(object):
         self.mem_log("config.py:config.py: start init config")
         self.suite = suite  # suite name
         self.fpath = fpath  # suite definition
+        # Parse graph sections with a pool of processes? Only safe for
+        # single-threaded callers, e.g. not suite server programs.
+        self.use_proc_pool = use_proc_pool
         self.fdir = os.path.dirname(fpath)
         self.owner = owner
         self.run_mode = run_mode
@@ -155,7 +187,8 @@ class SuiteConfig(object):
         # parse, upgrade, validate the suite, but don't expand with default
         # items
         self.mem_log("config.py: before RawSuiteConfig init")
-        self.pcfg = RawSuiteConfig(fpath, output_fname, template_vars)
+        self.pcfg = RawSuiteConfig(
+            fpath, output_fname, template_vars, self._get_proc_cache())
         self.mem_log("config.py: after RawSuiteConfig init")
         self.mem_log("config.py: before get(sparse=True")
         self.cfg = self.pcfg.get(sparse=True)
@@ -686,13 +719,17 @@ class SuiteConfig(object):
         self.cfg['meta']['URL'] = RE_SUITE_NAME_VAR.sub(
             self.suite, self.cfg['meta']['URL'])
         for name, cfg in self.cfg['runtime'].items():
-            cfg['meta']['URL'] = cfg['meta']['URL'] % {
+            url = cfg['meta']['URL'] % {
                 'suite_name': self.suite, 'task_name': name}
             # back-compat $CYLC_SUITE_NAME and $CYLC_TASK_NAME:
-            cfg['meta']['URL'] = RE_SUITE_NAME_VAR.sub(
-                self.suite, cfg['meta']['URL'])
-            cfg['meta']['URL'] = RE_TASK_NAME_VAR.sub(
-                name, cfg['meta']['URL'])
+            url = RE_SUITE_NAME_VAR.sub(self.suite, url)
+            url = RE_TASK_NAME_VAR.sub(name, url)
+            if url != cfg['meta']['URL']:
+                if cfg.get('meta') is not None:
+                    # Sections set in a namespace (not defaults) may be
+                    # shared with other namespaces, see m_override.
+                    cfg['meta'] = cfg['meta'].copy()
+                cfg['meta']['URL'] = url
 
         if is_validate:
             self.mem_log("config.py: before _check_circular()")
@@ -702,12 +739,24 @@ class SuiteConfig(object):
         self.mem_log("config.py: end init config")
 
     def _check_circular(self):
-        """Check for circular dependence in graph."""
+        """Check for circular dependence in graph.
+
+        Try the symbolic check first. Only expand the graph into concrete
+        edges if it cannot rule out circular dependence.
+        """
         start_point_string = (
             self.cfg['visualization']['initial cycle point'])
+        if self._is_graph_acyclic():
+            # Still walk the sequences, to check them for equal adjacent
+            # points (SequenceDegenerateError).
+            for _ in self.iter_graph_raw(
+                    start_point_string, stop_point_string=None,
+                    is_validate=True, points_only=True):
+                pass
+            return
         lhs2rhss = {}  # left hand side to right hand sides
         rhs2lhss = {}  # right hand side to left hand sides
-        for lhs, rhs in self.get_graph_raw(
+        for _, (lhs, rhs) in self.iter_graph_raw(
                 start_point_string, stop_point_string=None, is_validate=True):
             lhs2rhss.setdefault(lhs, set())
             lhs2rhss[lhs].add(rhs)
@@ -727,6 +776,135 @@ class SuiteConfig(object):
                 raise SuiteConfigError(
                     'ERROR: circular edges detected:' + err_msg)
 
+    def _is_graph_acyclic(self):
+        """Return True if the abstract graph cannot have circular edges.
+
+        Work with task names and the offsets of the abstract edges of each
+        sequence, instead of expanding the graph into concrete edges. Any
+        concrete cycle of edges must lie within a cycle of task names, i.e.
+        within a strongly connected component of the name graph. Within such
+        a component, if the regular offsets of all edges have the same sign
+        (e.g. all "foo[-P1D] => bar" or "foo => bar"), a concrete cycle can
+        only be made of edges with no offset, so the component is acyclic if
+        those edges are.
+
+        Return False if circular dependence is possible, or if this cannot
+        tell, e.g. for offsets from the initial cycle point, irregular
+        offsets, or edges with no offset from more than one sequence in a
+        component.
+        """
+        node_parser = GraphNodeParser.get_inst()
+        null_interval = get_interval_cls().get_null()
+        # {offset: sign, ...}
+        signs = {None: 0}
+        # {left-name: set([right-name, ...]), ...}
+        name2names = {}
+        # [(left-name, right-name, sequence, sign), ...]
+        name_edges = []
+        for sequence, edges in self.edges.items():
+            for left, right, suicide, _ in edges:
+                if not right or suicide:
+                    continue
+                name, offset_is_from_icp, offset_is_irregular, offset, _ = (
+                    node_parser.parse(left))
+                if not offset:
+                    offset = None
+                elif offset_is_from_icp or offset_is_irregular:
+                    offset = False
+                if offset not in signs:
+                    if offset is False:
+                        signs[offset] = None
+                    else:
+                        signs[offset] = cmp(
+                            get_interval(offset), null_interval)
+                name2names.setdefault(name, set()).add(right)
+                name_edges.append((name, right, sequence, signs[offset]))
+        node_parser.clear()
+
+        components = self._get_cyclic_components(name2names)
+        if not components:
+            return True
+        comp_of_name = {}
+        for i, component in enumerate(components):
+            for name in component:
+                comp_of_name[name] = i
+        comp_signs = [set() for _ in components]
+        # Edges with no offset, and their sequences, by component.
+        comp_lhs2rhss = [{} for _ in components]
+        comp_rhs2lhss = [{} for _ in components]
+        comp_sequences = [set() for _ in components]
+        for left, right, sequence, sign in name_edges:
+            i = comp_of_name.get(left)
+            if i is None or comp_of_name.get(right) != i:
+                continue
+            if sign is None:
+                return False
+            comp_signs[i].add(sign)
+            if sign == 0:
+                comp_lhs2rhss[i].setdefault(left, set()).add(right)
+                comp_rhs2lhss[i].setdefault(right, set()).add(left)
+                comp_sequences[i].add(sequence)
+        for i in range(len(components)):
+            if -1 in comp_signs[i] and 1 in comp_signs[i]:
+                return False
+            self._check_circular_helper(comp_lhs2rhss[i], comp_rhs2lhss[i])
+            if comp_rhs2lhss[i]:
+                # Cycle of edges with no offset, real if the sequences meet.
+                return False
+        return True
+
+    @staticmethod
+    def _get_cyclic_components(x2ys):
+        """Return the strongly connected components that contain cycles.
+
+        x2ys is a map of {x1: set([y1, y2, ...]), ...} for edges x1 => y1,
+        etc. Return a list of sets of nodes, for each component with more
+        than one node, or with a node that has an edge to itself. (This is an
+        iterative implementation of Tarjan's algorithm, see
+        https://en.wikipedia.org/wiki/Tarjan%27s_strongly_connected_components_algorithm)
+        """
+        index_of = {}
+        lowlink_of = {}
+        stack = []
+        on_stack = set()
+        components = []
+        for root in x2ys:
+            if root in index_of:
+                continue
+            index_of[root] = lowlink_of[root] = len(index_of)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(x2ys.get(root, ())))]
+            while work:
+                node, children = work[-1]
+                for child in children:
+                    if child not in index_of:
+                        index_of[child] = lowlink_of[child] = len(index_of)
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(x2ys.get(child, ()))))
+                        break
+                    elif child in on_stack:
+                        lowlink_of[node] = min(
+                            lowlink_of[node], index_of[child])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink_of[parent] = min(
+                            lowlink_of[parent], lowlink_of[node])
+                    if lowlink_of[node] == index_of[node]:
+                        component = set()
+                        while True:
+                            item = stack.pop()
+                            on_stack.discard(item)
+                            component.add(item)
+                            if item == node:
+                                break
+                        if len(component) > 1 or node in x2ys.get(node, ()):
+                            components.append(component)
+        return components
+
     @staticmethod
     def _check_circular_helper(x2ys, y2xs):
         """Topological elimination.
@@ -773,9 +951,8 @@ class SuiteConfig(object):
         OrderedDict - we can't just stick expanded names on the end because the
         order matters (for add-or-override by repeated namespaces).
 
-        TODO - this will have an impact on memory footprint for large suites
-        with a lot of runtime config. We should consider ditching OrderedDict
-        and instead using an ordinary dict with a separate list of keys.
+        (OrderedDictWithDefaults is a compact dict with a separate list of
+        keys, to limit the memory footprint of suites with many namespaces.)
         """
         if (not self.parameters[0] and
                 not any(',' in ns for ns in self.cfg['runtime'])):
@@ -924,6 +1101,27 @@ class SuiteConfig(object):
                     nenv[key] = val
             ns['environment'] = nenv
 
+    def _get_proc_cache(self):
+        """Return a cache for the processed suite definition, or None.
+
+        Only cache the suite definition of a registered suite, in its suite
+        service directory.
+        """
+        if not glbl_cfg().get(['enable suite definition cache']):
+            return None
+        srv_files_mgr = SuiteSrvFilesManager()
+        try:
+            source_dir = srv_files_mgr.get_suite_source_dir(self.suite)
+        except SuiteServiceFileError:
+            return None
+        if os.path.realpath(source_dir) != os.path.realpath(self.fdir):
+            return None
+        return ProcFileCache(
+            os.path.join(
+                srv_files_mgr.get_suite_srv_dir(self.suite),
+                srv_files_mgr.DIR_BASE_PROC_CACHE),
+            CYLC_VERSION)
+
     def compute_family_tree(self):
         first_parents = {}
         demoted = {}
@@ -978,27 +1176,42 @@ class SuiteConfig(object):
                         "ERROR: circular [runtime] inheritance?")
                 raise
 
+        # Sets of (ancestor, name) already added to the descendant lists, to
+        # avoid slow list membership tests for families with many members.
+        done = set()
+        first_done = set()
         for name in self.cfg['runtime']:
             ancestors = self.runtime['linearized ancestors'][name]
             for p in ancestors[1:]:
                 if p not in self.runtime['descendants']:
                     self.runtime['descendants'][p] = []
-                if name not in self.runtime['descendants'][p]:
+                if (p, name) not in done:
+                    done.add((p, name))
                     self.runtime['descendants'][p].append(name)
             first_ancestors = self.runtime['first-parent ancestors'][name]
             for p in first_ancestors[1:]:
                 if p not in self.runtime['first-parent descendants']:
                     self.runtime['first-parent descendants'][p] = []
-                if name not in self.runtime['first-parent descendants'][p]:
+                if (p, name) not in first_done:
+                    first_done.add((p, name))
                     self.runtime['first-parent descendants'][p].append(name)
 
-    def compute_inheritance(self, use_simple_method=True):
+    def compute_inheritance(self, use_simple_method=False):
+        """Replace each runtime namespace with its post-inheritance result.
+
+        By default, the result of each (full or partial) linearized MRO is
+        memoized and re-used for any namespace with the same MRO prefix, and
+        results share any sections they do not override with their prefix
+        result, rather than holding a full copy of every ancestor. The simple
+        method replicates every ancestor for every namespace; it is kept for
+        comparison and debugging.
+        """
         if cylc.flags.verbose:
             OUT.info("Parsing the runtime namespace hierarchy")
 
         results = OrderedDictWithDefaults()
-        # n_reps = 0
-        already_done = {}  # to store already computed namespaces by mro
+        # {(name, ...): result, ...} results by MRO prefix, from root down.
+        already_done = {}
 
         # Loop through runtime members, 'root' first.
         nses = self.cfg['runtime'].keys()
@@ -1009,50 +1222,31 @@ class SuiteConfig(object):
             hierarchy = copy(self.runtime['linearized ancestors'][ns])
             hierarchy.reverse()
 
-            result = OrderedDictWithDefaults()
-
             if use_simple_method:
                 # Go up the linearized MRO from root, replicating or
                 # overriding each namespace element as we go.
+                result = OrderedDictWithDefaults()
                 for name in hierarchy:
                     replicate(result, self.cfg['runtime'][name])
-                    # n_reps += 1
-
             else:
-                # As for the simple method, but store the result of each
-                # completed MRO (full or partial) as we go, and re-use
-                # these wherever possible. This ought to be a lot more
-                # efficient for big namespaces (e.g. lots of environment
-                # variables) in deep hiearchies, but results may vary...
-                prev_shortcut = False
-                mro = []
-                for name in hierarchy:
-                    mro.append(name)
-                    i_mro = '*'.join(mro)
-                    if i_mro in already_done:
-                        ad_result = already_done[i_mro]
-                        prev_shortcut = True
+                # Go up the linearized MRO from root, overlaying each
+                # namespace on the result of the MRO prefix so far. Results
+                # are never modified once stored, so they can be shared.
+                result = None
+                for i in range(len(hierarchy)):
+                    mro = tuple(hierarchy[0:i + 1])
+                    if mro in already_done:
+                        result = already_done[mro]
                     else:
-                        if prev_shortcut:
-                            prev_shortcut = False
-                            # copy ad_result (to avoid altering already_done)
-                            result = OrderedDictWithDefaults()
-                            replicate(result, ad_result)  # ...and use stored
-                            # n_reps += 1
-                        # override name content into tmp
-                        replicate(result, self.cfg['runtime'][name])
-                        # n_reps += 1
-                        # record this mro as already done
-                        already_done[i_mro] = result
+                        result = poverlay(
+                            result, self.cfg['runtime'][hierarchy[i]])
+                        already_done[mro] = result
 
             results[ns] = result
 
         # replace pre-inheritance namespaces with the post-inheritance result
         self.cfg['runtime'] = results
 
-        # uncomment this to compare the simple and efficient methods
-        # print '  Number of namespace replications:', n_reps
-
     # def print_inheritance(self):
     #     # (use for debugging)
     #     for foo in self.runtime:
@@ -1227,6 +1421,10 @@ class SuiteConfig(object):
         for tdef in self.taskdefs.values():
             # Compute simulated run time by scaling the execution limit.
             rtc = tdef.rtconfig
+            # Sections may be shared with other namespaces, so copy them
+            # before modifying them.
+            for key in ['job', 'remote', 'simulation']:
+                rtc[key] = rtc[key].copy()
             limit = rtc['job']['execution time limit']
             speedup = rtc['simulation']['speedup factor']
             if limit and speedup:
@@ -1741,36 +1939,138 @@ class SuiteConfig(object):
             return self._last_graph_raw_edges
 
         # Now define the concrete graph edges (pairs of nodes) for plotting.
+        # For the computed stop point, we store n_points of each sequence,
+        # and then cull later to the first n_points over all sequences.
+        gr_edges = {}
+        for point, edge in self.iter_graph_raw(
+                start_point_string, stop_point_string, is_validate,
+                n_points_per_sequence=True):
+            try:
+                gr_edges[point].append(edge)
+            except KeyError:
+                gr_edges[point] = [edge]
+
+        self._last_graph_raw_id = graph_raw_id
+        if stop_point_string is None:
+            # Prune to n_points points in total.
+            graph_raw_edges = []
+            for point in sorted(gr_edges)[:n_points]:
+                graph_raw_edges.extend(gr_edges[point])
+        else:
+            # Flatten nested list.
+            graph_raw_edges = (
+                [i for sublist in gr_edges.values() for i in sublist])
+        graph_raw_edges.sort()
+        self._last_graph_raw_edges = graph_raw_edges
+        return graph_raw_edges
+
+    def iter_graph_raw(self, start_point_string, stop_point_string,
+                       is_validate=False, n_points_per_sequence=False,
+                       points_only=False):
+        """Generate (point, edge) for the actual edges of the graph.
+
+        Edges are as returned by get_graph_raw, for the current closed
+        families, but are not sorted and are generated one sequence at a
+        time, so consumers that do not need the whole graph in memory (e.g.
+        the circular dependency check) can process them as they go.
+
+        If stop_point_string is None, generate edges of the first "number of
+        cycle points" points with edges over all sequences; or, if
+        n_points_per_sequence is True, generate edges of that many points of
+        each sequence (for get_graph_raw to cull later).
+
+        If points_only is True, only generate (point, None) for each point of
+        each sequence with edges, up to the stop point if given. This is much
+        quicker, but still walks (and so checks) all the sequences.
+        """
+        n_points = self.cfg['visualization']['number of cycle points']
         start_point = get_point(start_point_string)
         actual_first_point = self.get_actual_first_point(start_point)
 
         suite_final_point = get_point(
             self.cfg['scheduling']['final cycle point'])
 
-        # For the computed stop point, we store n_points of each sequence,
-        # and then cull later to the first n_points over all sequences.
         if stop_point_string is not None:
             stop_point = get_point(stop_point_string)
         else:
             stop_point = None
 
         # For nested families, only consider the outermost one
+        first_parent_descendants = self.runtime['first-parent descendants']
         clf_map = {}
         for name in self.closed_families:
             if all(name not in first_parent_descendants[i]
                    for i in self.closed_families):
                 clf_map[name] = first_parent_descendants[name]
 
-        gr_edges = {}
-        start_point_offset_cache = {}
-        point_offset_cache = None
+        # Pre-parse the edges of each sequence into templates.
+        node_parser = GraphNodeParser.get_inst()
+        seq_templates = []
         for sequence, edges in self.edges.items():
+            templates = []
+            for left, right, suicide, cond in edges:
+                if is_validate and (not right or suicide):
+                    continue
+                name, offset_is_from_icp, offset_is_irregular, offset, _ = (
+                    node_parser.parse(left))
+                templates.append((
+                    name, offset_is_from_icp, offset_is_irregular, offset,
+                    right, suicide, cond))
+            if templates:
+                seq_templates.append((sequence, templates))
+        node_parser.clear()
+
+        if points_only:
+            # Walk sequences without edges too.
+            seq_templates_map = dict(seq_templates)
+            seq_templates = [
+                (sequence, seq_templates_map.get(sequence, []))
+                for sequence in self.edges]
+            for item in self._iter_graph_raw_edges(
+                    seq_templates, start_point, actual_first_point,
+                    stop_point, suite_final_point, n_points, clf_map,
+                    is_validate, points_only=True):
+                yield item
+            return
+
+        max_point = None
+        if stop_point is None and not n_points_per_sequence:
+            # Find the last of the first n_points points with edges.
+            points = set()
+            for point, _ in self._iter_graph_raw_edges(
+                    seq_templates, start_point, actual_first_point,
+                    stop_point, suite_final_point, n_points, clf_map,
+                    is_validate, points_only=True):
+                points.add(point)
+            if not points:
+                return
+            max_point = sorted(points)[:n_points][-1]
+
+        for item in self._iter_graph_raw_edges(
+                seq_templates, start_point, actual_first_point, stop_point,
+                suite_final_point, n_points, clf_map, is_validate,
+                max_point=max_point):
+            yield item
+
+    def _iter_graph_raw_edges(
+            self, seq_templates, start_point, actual_first_point, stop_point,
+            suite_final_point, n_points, clf_map, is_validate, max_point=None,
+            points_only=False):
+        """Generate (point, edge) for iter_graph_raw.
+
+        If points_only is True, generate (point, None) once for each point of
+        each sequence that has edges.
+        """
+        # {offset: point, ...} for offsets from the initial cycle point.
+        start_point_offset_cache = {}
+        # {offset: interval, ...} for regular offsets.
+        interval_cache = {}
+        for sequence, templates in seq_templates:
             # Get initial cycle point for this sequence
             point = sequence.get_first_point(start_point)
-            new_points = []
+            new_points = set()
             while point is not None:
-                if point not in new_points:
-                    new_points.append(point)
+                new_points.add(point)
                 if stop_point is not None and point > stop_point:
                     # Beyond requested final cycle point.
                     break
@@ -1780,35 +2080,41 @@ class SuiteConfig(object):
                 if stop_point is None and len(new_points) > n_points:
                     # Take n_points cycles from each sequence.
                     break
+                if max_point is not None and point > max_point:
+                    # Beyond the last of the points to take.
+                    break
+                # {offset: point, ...} for irregular offsets from this point.
                 point_offset_cache = {}
-                for left, right, suicide, cond in edges:
-                    if is_validate and (not right or suicide):
-                        continue
+                for (name, offset_is_from_icp, offset_is_irregular, offset,
+                        right, suicide, cond) in templates:
                     if right:
                         r_id = (right, point)
                     else:
                         r_id = None
-                    name, offset_is_from_icp, _, offset, _ = (
-                        GraphNodeParser.get_inst().parse(left))
-                    if offset:
-                        if offset_is_from_icp:
-                            cache = start_point_offset_cache
-                            rel_point = start_point
-                        else:
-                            cache = point_offset_cache
-                            rel_point = point
+                    if not offset:
+                        l_point = point
+                    elif offset_is_from_icp:
                         try:
-                            l_point = cache[offset]
+                            l_point = start_point_offset_cache[offset]
                         except KeyError:
-                            l_point = get_point_relative(offset, rel_point)
-                            cache[offset] = l_point
+                            l_point = get_point_relative(offset, start_point)
+                            start_point_offset_cache[offset] = l_point
+                    elif offset_is_irregular:
+                        try:
+                            l_point = point_offset_cache[offset]
+                        except KeyError:
+                            l_point = get_point_relative(offset, point)
+                            point_offset_cache[offset] = l_point
                     else:
-                        l_point = point
+                        try:
+                            interval = interval_cache[offset]
+                        except KeyError:
+                            interval = get_interval(offset)
+                            interval_cache[offset] = interval
+                        l_point = point + interval
                     l_id = (name, l_point)
 
-                    if l_id is None and r_id is None:
-                        continue
-                    if l_id is not None and actual_first_point > l_id[1]:
+                    if actual_first_point > l_point:
                         # Check that l_id is not earlier than start time.
                         # NOTE BUG GITHUB #919
                         # sct = start_point
@@ -1819,35 +2125,17 @@ class SuiteConfig(object):
                         # keep right hand node.
                         l_id = r_id
                         r_id = None
-                    if point not in gr_edges:
-                        gr_edges[point] = []
+                    if points_only:
+                        yield point, None
+                        break
                     if is_validate:
-                        gr_edges[point].append((l_id, r_id))
+                        yield point, (l_id, r_id)
                     else:
                         lstr, rstr = self._close_families(l_id, r_id, clf_map)
-                        gr_edges[point].append(
-                            (lstr, rstr, None, suicide, cond))
+                        yield point, (lstr, rstr, None, suicide, cond)
                 # Increment the cycle point.
                 point = sequence.get_next_point_on_sequence(point)
 
-        del clf_map
-        del start_point_offset_cache
-        del point_offset_cache
-        GraphNodeParser.get_inst().clear()
-        self._last_graph_raw_id = graph_raw_id
-        if stop_point is None:
-            # Prune to n_points points in total.
-            graph_raw_edges = []
-            for point in sorted(gr_edges)[:n_points]:
-                graph_raw_edges.extend(gr_edges[point])
-        else:
-            # Flatten nested list.
-            graph_raw_edges = (
-                [i for sublist in gr_edges.values() for i in sublist])
-        graph_raw_edges.sort()
-        self._last_graph_raw_edges = graph_raw_edges
-        return graph_raw_edges
-
     def get_node_labels(self, start_point_string, stop_point_string=None):
         """Return dependency graph node labels."""
         stop_point = None
@@ -1960,9 +2248,13 @@ class SuiteConfig(object):
             else:
                 sections.append((section, sec_map['graph']))
 
-        # Parse and process each graph section.
+        # Parse the graph sections, in parallel if configured.
+        parser_results = self._parse_graph_sections(
+            family_map, [graph for _, graph in sections])
+
+        # Process each graph section, in order.
         task_triggers = {}
-        for section, graph in sections:
+        for (section, graph), result in zip(sections, parser_results):
             try:
                 seq = get_sequence(section, icp, fcp)
             except (AttributeError, TypeError, ValueError, CylcError) as exc:
@@ -1975,11 +2267,45 @@ class SuiteConfig(object):
                     msg += ' %s' % str(exc)
                 raise SuiteConfigError(msg)
             self.sequences.append(seq)
-            parser = GraphParser(family_map, self.parameters)
-            parser.parse_graph(graph)
-            self.suite_polling_tasks.update(parser.suite_state_polling_tasks)
-            self._proc_triggers(
-                parser.triggers, parser.original, seq, task_triggers)
+            if isinstance(result, GraphParseError):
+                raise result
+            triggers, original, suite_state_polling_tasks = result
+            self.suite_polling_tasks.update(suite_state_polling_tasks)
+            self._proc_triggers(triggers, original, seq, task_triggers)
+
+    def _parse_graph_sections(self, family_map, graphs):
+        """Parse graph strings, return a list of results in the same order.
+
+        Each result is (triggers, original, suite_state_polling_tasks) from
+        a GraphParser, or the GraphParseError raised by the parser, so that
+        errors are reported in section order by the caller.
+
+        Use a pool of worker processes if the caller allows it (see
+        use_proc_pool), the global config item "suite config processes"
+        allows it and there is more than one graph. Worker processes are
+        forked, which can deadlock on locks held by other threads, so
+        multi-threaded callers such as the suite server program must not
+        use the pool.
+        """
+        n_procs = 1
+        if self.use_proc_pool:
+            n_procs = glbl_cfg().get(['suite config processes'])
+            if n_procs < 1:
+                n_procs = cpu_count()
+        n_procs = min(n_procs, len(graphs))
+        if n_procs < 2:
+            _init_graph_parser_worker(family_map, self.parameters)
+            return [_parse_graph_worker(graph) for graph in graphs]
+        if cylc.flags.verbose:
+            OUT.info("Parsing %d graph sections with %d processes" % (
+                len(graphs), n_procs))
+        pool = Pool(
+            n_procs, _init_graph_parser_worker, (family_map, self.parameters))
+        try:
+            return pool.map(_parse_graph_worker, graphs, chunksize=1)
+        finally:
+            pool.terminate()
+            pool.join()
 
     def _proc_triggers(self, triggers, original, seq, task_triggers):
         """Define graph edges, taskdefs, and triggers, from graph sections."""
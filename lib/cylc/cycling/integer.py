@@ -269,8 +269,8 @@ class IntegerSequence(SequenceBase):
     TYPE = CYCLER_TYPE_INTEGER
     TYPE_SORT_KEY = CYCLER_TYPE_SORT_KEY_INTEGER
 
-    __slots__ = ('p_context_start', 'p_context_stop', 'p_start', 'p_stop',
-                 'i_step', 'i_offset', 'exclusions')
+    __slots__ = ('dep_section', 'p_context_start', 'p_context_stop',
+                 'p_start', 'p_stop', 'i_step', 'i_offset', 'exclusions')
 
     @classmethod
     def get_async_expr(cls, start_point=None):
@@ -288,6 +288,8 @@ class IntegerSequence(SequenceBase):
         SequenceBase.__init__(
             self, dep_section, p_context_start, p_context_stop)
 
+        self.dep_section = dep_section
+
         # start context always exists
         self.p_context_start = IntegerPoint(p_context_start)
         # stop context may exist
@@ -21,12 +21,13 @@
 import re
 import unittest
 
-from isodatetime.data import Calendar, Duration
+from isodatetime.data import Calendar, Duration, get_days_in_year_range
 from isodatetime.dumpers import TimePointDumper
 from isodatetime.parsers import TimePointParser, DurationParser
 from isodatetime.timezone import (
     get_local_time_zone, get_local_time_zone_format)
 from cylc.time_parser import CylcTimeParser
+from cylc.memoize import memoize, clear_all
 from cylc.cycling import (
     PointBase, IntervalBase, SequenceBase, ExclusionBase, PointParsingError,
     IntervalParsingError, SequenceDegenerateError)
@@ -35,8 +36,6 @@ from parsec.validate import IllegalValueError
 CYCLER_TYPE_ISO8601 = "iso8601"
 CYCLER_TYPE_SORT_KEY_ISO8601 = "b"
 
-MEMOIZE_LIMIT = 10000
-
 DATE_TIME_FORMAT = "CCYYMMDDThhmm"
 EXPANDED_DATE_TIME_FORMAT = "+XCCYYMMDDThhmm"
 NEW_DATE_TIME_REC = re.compile("T")
@@ -57,40 +56,18 @@ class SuiteSpecifics(object):
     iso8601_parsers = None
 
 
-def memoize(function):
-    """This stores results for a given set of inputs to a function.
-
-    The inputs and results of the function must be immutable.
-    Keyword arguments are not allowed.
+class ISO8601Point(PointBase):
 
-    To avoid memory leaks, only the first 10000 separate input
-    permutations are cached for a given function.
+    """A single point in an ISO8601 date time sequence.
 
+    Comparisons use an integer key (see _iso_point_key), computed once per
+    instance, so sorting and min/max of many points are quick.
     """
-    inputs_results = {}
-
-    def _wrapper(*args):
-        """Cache results for function(*args)."""
-        try:
-            return inputs_results[args]
-        except KeyError:
-            results = function(*args)
-            if len(inputs_results) > MEMOIZE_LIMIT:
-                # Full up, no more room.
-                inputs_results.popitem()
-            inputs_results[args] = results
-            return results
-    return _wrapper
-
-
-class ISO8601Point(PointBase):
-
-    """A single point in an ISO8601 date time sequence."""
 
     TYPE = CYCLER_TYPE_ISO8601
     TYPE_SORT_KEY = CYCLER_TYPE_SORT_KEY_ISO8601
 
-    __slots__ = ('value')
+    __slots__ = ('value', '_key')
 
     @classmethod
     def from_nonstandard_string(cls, point_string):
@@ -109,10 +86,29 @@ class ISO8601Point(PointBase):
             return cmp(self.TYPE_SORT_KEY, other.TYPE_SORT_KEY)
         if self.value == other.value:
             return 0
-        return self._iso_point_cmp(self.value, other.value)
+        my_key = self.get_key()
+        other_key = other.get_key()
+        if my_key is None or other_key is None:
+            return self._iso_point_cmp(self.value, other.value)
+        return cmp(my_key, other_key)
+
+    def get_key(self):
+        """Return a number that compares like this point, or None.
+
+        See _iso_point_key.
+        """
+        try:
+            return self._key
+        except AttributeError:
+            self._key = self._iso_point_key(self.value)
+            return self._key
 
     def standardise(self):
         """Reformat self.value into a standard representation."""
+        try:
+            del self._key
+        except AttributeError:
+            pass
         try:
             self.value = str(point_parse(self.value))
         except ValueError as exc:
@@ -136,7 +132,7 @@ class ISO8601Point(PointBase):
         return hash(self.value)
 
     @staticmethod
-    @memoize
+    @memoize()
     def _iso_point_add(point_string, interval_string):
         """Add the parsed point_string to the parsed interval_string."""
         point = point_parse(point_string)
@@ -144,7 +140,29 @@ class ISO8601Point(PointBase):
         return str(point + interval)
 
     @staticmethod
-    @memoize
+    @memoize()
+    def _iso_point_key(point_string):
+        """Return the point as seconds since the start of year 1 in UTC.
+
+        Days are counted in the suite calendar (e.g. 360 days per year in a
+        360day calendar), so the result compares like the point itself.
+        Return None for a truncated point.
+        """
+        point = point_parse(point_string)
+        if point.truncated:
+            return None
+        point.set_time_zone_to_utc()
+        year, day_of_year = point.get_ordinal_date()
+        if year > 1:
+            days = get_days_in_year_range(1, year - 1)
+        else:
+            days = -get_days_in_year_range(year, 0)
+        return (
+            (days + day_of_year - 1) * Calendar.default().SECONDS_IN_DAY +
+            point.get_second_of_day())
+
+    @staticmethod
+    @memoize()
     def _iso_point_cmp(point_string, other_point_string):
         """Compare the parsed point_string to the other one."""
         point = point_parse(point_string)
@@ -152,7 +170,7 @@ class ISO8601Point(PointBase):
         return cmp(point, other_point)
 
     @staticmethod
-    @memoize
+    @memoize()
     def _iso_point_sub_interval(point_string, interval_string):
         """Return the parsed point_string minus the parsed interval_string."""
         point = point_parse(point_string)
@@ -160,7 +178,7 @@ class ISO8601Point(PointBase):
         return str(point - interval)
 
     @staticmethod
-    @memoize
+    @memoize()
     def _iso_point_sub_point(point_string, other_point_string):
         """Return the difference between the two parsed point strings."""
         point = point_parse(point_string)
@@ -238,7 +256,7 @@ class ISO8601Interval(IntervalBase):
         return self._iso_interval_nonzero(self.value)
 
     @staticmethod
-    @memoize
+    @memoize()
     def _iso_interval_abs(interval_string, other_interval_string):
         """Return the absolute (non-negative) value of an interval_string."""
         interval = interval_parse(interval_string)
@@ -248,7 +266,7 @@ class ISO8601Interval(IntervalBase):
         return interval_string
 
     @staticmethod
-    @memoize
+    @memoize()
     def _iso_interval_add(interval_string, other_interval_string):
         """Return one parsed interval_string plus the other one."""
         interval = interval_parse(interval_string)
@@ -256,7 +274,7 @@ class ISO8601Interval(IntervalBase):
         return str(interval + other)
 
     @staticmethod
-    @memoize
+    @memoize()
     def _iso_interval_cmp(interval_string, other_interval_string):
         """Compare one parsed interval_string with the other one."""
         interval = interval_parse(interval_string)
@@ -264,7 +282,7 @@ class ISO8601Interval(IntervalBase):
         return cmp(interval, other)
 
     @staticmethod
-    @memoize
+    @memoize()
     def _iso_interval_sub(interval_string, other_interval_string):
         """Subtract one parsed interval_string from the other one."""
         interval = interval_parse(interval_string)
@@ -272,14 +290,14 @@ class ISO8601Interval(IntervalBase):
         return str(interval - other)
 
     @staticmethod
-    @memoize
+    @memoize()
     def _iso_interval_mul(interval_string, factor):
         """Multiply one parsed interval_string's values by factor."""
         interval = interval_parse(interval_string)
         return str(interval * factor)
 
     @staticmethod
-    @memoize
+    @memoize()
     def _iso_interval_nonzero(interval_string):
         """Return whether the parsed interval_string is a null interval."""
         interval = interval_parse(interval_string)
@@ -331,7 +349,9 @@ class ISO8601Sequence(SequenceBase):
                  'offset', '_cached_first_point_values',
                  '_cached_next_point_values', '_cached_valid_point_booleans',
                  '_cached_recent_valid_points', 'spec', 'abbrev_util',
-                 'recurrence', 'exclusions', 'step', 'value')
+                 'recurrence', 'exclusions', 'step', 'value',
+                 '_index_start', '_index_seconds', '_index_months',
+                 '_index_max')
 
     @classmethod
     def get_async_expr(cls, start_point=None):
@@ -408,6 +428,7 @@ class ISO8601Sequence(SequenceBase):
         # Concatenate the strings in exclusion list
         if self.exclusions:
             self.value += '!' + str(self.exclusions)
+        self._set_index()
 
     def get_interval(self):
         """Return the interval between points in this sequence."""
@@ -430,6 +451,110 @@ class ISO8601Sequence(SequenceBase):
         self.value = str(self.recurrence) + '!' + str(self.exclusions)
         if self.exclusions:
             self.value += '!' + str(self.exclusions)
+        self._set_index()
+
+    def _set_index(self):
+        """Set up arithmetic indexing of the recurrence, if possible.
+
+        The points of a recurrence with a start point are start + n * step,
+        for 0 <= n <= self._index_max (None if unbounded). For a step in
+        days, hours, minutes or seconds, n can be worked out from the
+        integer key of a point. For a step in years and months, from a day
+        of the month that all months have, n can be worked out from the
+        number of months since the start. Other recurrences are iterated.
+        """
+        self._index_start = None
+        self._index_seconds = None
+        self._index_months = None
+        self._index_max = None
+        recurrence = self.recurrence
+        if (recurrence.format_number == 1 or
+                recurrence.start_point is None or
+                recurrence.repetitions == 1 or
+                not recurrence.duration or
+                not recurrence.get_is_valid(recurrence.start_point)):
+            return
+        start = ISO8601Point(str(recurrence.start_point))
+        if start.get_key() is None:
+            return
+        duration = recurrence.duration.copy()
+        duration.to_days()
+        if not duration.years and not duration.months:
+            seconds = duration.get_seconds()
+            if seconds > 0 and seconds == int(seconds):
+                self._index_seconds = int(seconds)
+        elif (not duration.days and not duration.hours and
+                not duration.minutes and not duration.seconds and
+                recurrence.start_point.get_calendar_date()[2] <= 28):
+            months = (
+                (duration.years or 0) * Calendar.default().MONTHS_IN_YEAR +
+                (duration.months or 0))
+            if months > 0:
+                self._index_months = months
+        if self._index_seconds is None and self._index_months is None:
+            return
+        self._index_start = start
+        end_points = [recurrence.max_point]
+        if recurrence.repetitions is None:
+            end_points.append(recurrence.end_point)
+        else:
+            # (The end point may not even be dumpable, e.g. past year 9999.)
+            self._index_max = recurrence.repetitions - 1
+        for end_point in end_points:
+            if end_point is not None:
+                index = self._get_index(ISO8601Point(str(end_point)))[0]
+                if self._index_max is None or index < self._index_max:
+                    self._index_max = index
+
+    def _get_index(self, point):
+        """Return (n, is_on) for the last point start + n * step <= point.
+
+        is_on is True if point is start + n * step. Bounds and exclusions
+        are not considered. Return (None, False) if the recurrence cannot be
+        indexed, or for a truncated point.
+        """
+        if self._index_seconds is not None:
+            key = point.get_key()
+            if key is None:
+                return None, False
+            index, remainder = divmod(
+                key - self._index_start.get_key(), self._index_seconds)
+            return index, not remainder
+        if self._index_months is not None:
+            iso_point = point_parse(point.value)
+            if iso_point.truncated:
+                return None, False
+            start_iso_point = self.recurrence.start_point
+            iso_point.set_time_zone(start_iso_point.get_time_zone())
+            year, month = iso_point.get_calendar_date()[:2]
+            start_year, start_month = start_iso_point.get_calendar_date()[:2]
+            index = (
+                (year - start_year) * Calendar.default().MONTHS_IN_YEAR +
+                month - start_month) // self._index_months
+            index_point = self._get_index_point(index)
+            if index_point > point:
+                return index - 1, False
+            return index, index_point == point
+        return None, False
+
+    def _get_index_point(self, index):
+        """Return the point start + index * step."""
+        if index == 0:
+            return self._index_start
+        return self._index_start + self.step * index
+
+    def _get_index_next_point(self, index):
+        """Return the first point at index or later that is not excluded.
+
+        Return None if out of bounds.
+        """
+        index = max(index, 0)
+        if self._index_max is not None and index > self._index_max:
+            return None
+        point = self._get_index_point(index)
+        if self.exclusions and point in self.exclusions:
+            return self.get_next_point_on_sequence(point)
+        return point
 
     def is_on_sequence(self, point):
         """Return True if point is on-sequence."""
@@ -437,6 +562,11 @@ class ISO8601Sequence(SequenceBase):
         if self.exclusions and point in self.exclusions:
             return False
 
+        index, is_on = self._get_index(point)
+        if index is not None:
+            return is_on and 0 <= index and (
+                self._index_max is None or index <= self._index_max)
+
         for valid_point in reversed(self._cached_recent_valid_points):
             if valid_point == point:
                 return True
@@ -486,6 +616,19 @@ class ISO8601Sequence(SequenceBase):
         """Return the largest point < some arbitrary point."""
         if self.is_on_sequence(point):
             return self.get_prev_point(point)
+        index, is_on = self._get_index(point)
+        if index is not None:
+            if is_on:
+                # On the recurrence, but excluded or out of bounds.
+                index -= 1
+            if self._index_max is not None and index > self._index_max:
+                index = self._index_max
+            if index < 0:
+                return None
+            nearest_point = self._get_index_point(index)
+            if self.exclusions and nearest_point in self.exclusions:
+                return self.get_prev_point(nearest_point)
+            return nearest_point
         p_iso_point = point_parse(point.value)
         prev_iso_point = None
 
@@ -517,6 +660,12 @@ class ISO8601Sequence(SequenceBase):
             return ISO8601Point(self._cached_next_point_values[point.value])
         except KeyError:
             pass
+        index = self._get_index(point)[0]
+        if index is not None:
+            next_point = self._get_index_next_point(index + 1)
+            if next_point is not None:
+                self._check_and_cache_next_point(point, next_point)
+            return next_point
         # Iterate starting at recent valid points, for speed.
         for valid_point in reversed(self._cached_recent_valid_points):
             if valid_point >= point:
@@ -586,6 +735,11 @@ class ISO8601Sequence(SequenceBase):
             return ISO8601Point(self._cached_first_point_values[point.value])
         except KeyError:
             pass
+        index, is_on = self._get_index(point)
+        if index is not None:
+            if not is_on:
+                index += 1
+            return self._get_index_next_point(index)
         p_iso_point = point_parse(point.value)
         for recurrence_iso_point in self.recurrence:
             if recurrence_iso_point >= p_iso_point:
@@ -618,6 +772,11 @@ class ISO8601Sequence(SequenceBase):
                  self.recurrence.min_point is not None) and
                 (self.recurrence.end_point is not None or
                  self.recurrence.max_point is not None))):
+            if self._index_start is not None and self._index_max >= 0:
+                ret = self._get_index_point(self._index_max)
+                if self.exclusions and ret in self.exclusions:
+                    return self._get_index_point(self._index_max - 1)
+                return ret
             curr = None
             prev = None
             for recurrence_iso_point in self.recurrence:
@@ -673,6 +832,9 @@ def init(num_expanded_year_digits=0, custom_dump_format=None, time_zone=None,
          assume_utc=False, cycling_mode=None):
     """Initialise suite-setup-specific information."""
 
+    # Cached results depend on the calendar mode and parser settings.
+    clear_all()
+
     SuiteSpecifics.interval_parser = DurationParser()
 
     if cycling_mode in Calendar.default().MODES:
@@ -757,7 +919,7 @@ def is_offset_absolute(offset_string):
         return False
 
 
-@memoize
+@memoize()
 def _interval_parse(interval_string):
     """Parse an interval_string into a proper Duration object."""
     return SuiteSpecifics.interval_parser.parse(interval_string)
@@ -768,7 +930,7 @@ def point_parse(point_string):
     return _point_parse(point_string).copy()
 
 
-@memoize
+@memoize()
 def _point_parse(point_string):
     """Parse a point_string into a proper TimePoint object."""
     if "%" in SuiteSpecifics.DUMP_FORMAT:
@@ -1237,6 +1399,56 @@ class TestISO8601Sequence(unittest.TestCase):
         self.assertEqual(sequence.get_prev_point(point_3), point_1)
         self.assertEqual(sequence.get_prev_point(point_4), point_1)
 
+    def test_index(self):
+        """Indexed sequences should give the same points as iteration."""
+        init(time_zone='Z')
+        points = [ISO8601Point(value) for value in [
+            '19991231T2300Z', '20000101T0000Z', '20000101T0130Z',
+            '20000101T0300Z', '20000101T0600+01', '20000102T0000Z',
+            '20000102T0100Z', '20000115T0000Z', '20000115T0600Z']]
+        for spec, start, stop in [
+                ('PT1H', '20000101T00Z', None),
+                ('PT90M', '20000101T00Z', '20000102T01Z'),
+                ('R5/PT3H', '20000101T00Z', '20000102T00Z'),
+                ('+PT1H/PT2H', '20000101T00Z', '20000102T01Z'),
+                ('P1W', '20000101T00Z', '20000201T00Z'),
+                ('P1M', '20000115T00Z', None),
+                ('P1Y1M', '19981215T00Z', '20000401T00Z'),
+                ('P2M', '19991215T06+0530', '20000501T00Z'),
+                ('R/PT3H/20000102T00Z', '19991230T00Z', '20000102T01Z')]:
+            sequence = ISO8601Sequence(spec, start, stop)
+            iterated = ISO8601Sequence(spec, start, stop)
+            iterated._index_seconds = iterated._index_months = None
+            for point in points:
+                for method in ['is_on_sequence', 'get_nearest_prev_point',
+                               'get_next_point', 'get_first_point']:
+                    self.assertEqual(
+                        getattr(sequence, method)(point),
+                        getattr(iterated, method)(point),
+                        '%s: %s(%s)' % (spec, method, point))
+            self.assertEqual(
+                sequence.get_stop_point(), iterated.get_stop_point())
+        # With exclusions.
+        sequence = ISO8601Sequence('PT1H!(20000101T02Z,T03)', '20000101T00Z')
+        self.assertEqual(sequence._index_seconds, 3600)
+        for value, nearest_prev, next_ in [
+                ('20000101T0130Z', '20000101T0100Z', '20000101T0400Z'),
+                ('20000101T0200Z', '20000101T0100Z', '20000101T0400Z'),
+                ('20000101T0330Z', '20000101T0100Z', '20000101T0400Z'),
+                ('20100101T0330Z', '20100101T0200Z', '20100101T0400Z')]:
+            point = ISO8601Point(value)
+            self.assertEqual(
+                sequence.get_nearest_prev_point(point),
+                ISO8601Point(nearest_prev))
+            self.assertEqual(
+                sequence.get_next_point(point), ISO8601Point(next_))
+            self.assertEqual(
+                sequence.get_first_point(point), ISO8601Point(next_))
+        self.assertTrue(
+            sequence.is_on_sequence(ISO8601Point('20100101T0400Z')))
+        self.assertFalse(
+            sequence.is_on_sequence(ISO8601Point('20100101T0300Z')))
+
     def test_simple(self):
         """Run some simple tests for date-time cycling."""
         init(time_zone='Z')
@@ -1285,6 +1497,57 @@ class TestISO8601Sequence(unittest.TestCase):
         self.assertFalse(
             sequence.is_on_sequence(ISO8601Point('20100809T0005')))
 
+    def test_point_key(self):
+        """Point keys should compare like the points themselves."""
+        for mode, values in [
+                ('gregorian', [
+                    '20000101T0000Z', '19991231T2300-0200', '20000228T12Z',
+                    '20000229T00+01', '20000301T00Z', '20000229T2330-01',
+                    '19000301T00Z', '18991231T1200Z', '00010101T00Z',
+                    '21000101T0000+0530']),
+                ('360day', [
+                    '20100101T0000Z', '20091230T2300-0200', '20100230T12Z',
+                    '20100230T00+01', '20100301T00Z', '20100229T2330-01',
+                    '19000301T00Z', '18991230T1200Z', '00020101T00Z',
+                    '21000101T0000+0530'])]:
+            init(time_zone='Z', cycling_mode=mode)
+            try:
+                points = [ISO8601Point(value) for value in values]
+                for point in points:
+                    self.assertTrue(point.get_key() is not None)
+                    for other in points:
+                        self.assertEqual(
+                            cmp(point.get_key(), other.get_key()),
+                            ISO8601Point._iso_point_cmp(
+                                point.value, other.value))
+                self.assertEqual(
+                    [str(point) for point in sorted(points)],
+                    sorted(values, cmp=ISO8601Point._iso_point_cmp))
+            finally:
+                init(time_zone='Z', cycling_mode='gregorian')
+        # Standardise should reset the key.
+        point = ISO8601Point('20000101T00+01')
+        key = point.get_key()
+        point.value = '20000101T00Z'
+        point.standardise()
+        self.assertEqual(point.get_key(), key + 3600)
+
+    def test_calendar_mode_change(self):
+        """Cached results should not survive a change of calendar mode."""
+        try:
+            init(time_zone='Z', cycling_mode='gregorian')
+            key = ISO8601Point('20000301T00Z').get_key()
+            interval = (
+                ISO8601Point('20000301T00Z') - ISO8601Point('20000201T00Z'))
+            self.assertEqual(str(interval), 'P29D')
+            init(time_zone='Z', cycling_mode='360day')
+            self.assertNotEqual(ISO8601Point('20000301T00Z').get_key(), key)
+            interval = (
+                ISO8601Point('20000301T00Z') - ISO8601Point('20000201T00Z'))
+            self.assertEqual(str(interval), 'P30D')
+        finally:
+            init(time_zone='Z', cycling_mode='gregorian')
+
 
 if __name__ == '__main__':
     unittest.main()
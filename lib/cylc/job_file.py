@@ -17,6 +17,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Write task job files."""
 
+from cStringIO import StringIO
 import os
 import re
 import stat
@@ -29,19 +30,42 @@ import cylc.flags
 
 class JobFileWriter(object):
 
-    """Write task job files."""
+    """Write task job files.
+
+    The sections of a job file after the header and the directives are the
+    same for all jobs with the same "template_key" in their job_conf, apart
+    from the values of the TEMPLATE_KEYS items. They are written once to a
+    template, which is then filled in for each job, and checked for syntax
+    errors with the first job only. The header and directives are comments
+    in the job file, so they are written separately for each job.
+
+    """
+
+    # Items of job_conf that differ between jobs with the same template.
+    TEMPLATE_KEYS = ['job_d', 'job_file_path', 'submit_num', 'task_id',
+                     'try_num']
+    # Marks the TEMPLATE_KEYS items in a template.
+    TEMPLATE_MARK = '\0'
 
     def __init__(self):
         self.suite_env = {}
         self.batch_sys_mgr = BatchSysManager()
+        # {(template_key, debug): [template, is_syntax_checked], ...}
+        self.templates = {}
 
     def set_suite_env(self, suite_env):
         """Configure suite environment for all job files."""
         self.suite_env.clear()
         self.suite_env.update(suite_env)
+        self.templates.clear()
 
     def write(self, local_job_file_path, job_conf, check_syntax=True):
-        """Write each job script section in turn."""
+        """Write each job script section in turn.
+
+        If job_conf has a "template_key" that is not None, use (and keep)
+        the template of the sections after the directives for this key.
+
+        """
 
         # ########### !!!!!!!! WARNING !!!!!!!!!!! #####################
         # BE EXTREMELY WARY OF CHANGING THE ORDER OF JOB SCRIPT SECTIONS
@@ -54,20 +78,25 @@ class JobFileWriter(object):
         # that cylc commands can be used in defining user environment
         # variables: NEXT_CYCLE=$( cylc cycle-point --offset-hours=6 )
 
+        key = job_conf.get('template_key')
+        if key is not None:
+            key = (key, cylc.flags.debug)
+        try:
+            template_item = self.templates[key]
+        except KeyError:
+            template_item = [self._get_template(job_conf), False]
+        template = template_item[0]
+
         tmp_name = local_job_file_path + '.tmp'
         try:
             with open(tmp_name, 'wb') as handle:
                 self._write_header(handle, job_conf)
                 self._write_directives(handle, job_conf)
-                self._write_prelude(handle, job_conf)
-                self._write_environment_1(handle, job_conf)
-                self._write_global_init_script(handle, job_conf)
-                # suite bin access must be before runtime environment
-                # because suite bin commands may be used in variable
-                # assignment expressions: FOO=$(command args).
-                self._write_environment_2(handle, job_conf)
-                self._write_script(handle, job_conf)
-                self._write_epilogue(handle, job_conf)
+                for i, item in enumerate(template):
+                    if i % 2:
+                        handle.write(str(job_conf[item]))
+                    else:
+                        handle.write(item)
         except IOError as exc:
             # Remove temporary file
             try:
@@ -76,7 +105,7 @@ class JobFileWriter(object):
                 pass
             raise exc
         # check syntax
-        if check_syntax:
+        if check_syntax and not template_item[1]:
             try:
                 proc = Popen(
                     [job_conf['shell'], '-n', tmp_name],
@@ -97,6 +126,9 @@ class JobFileWriter(object):
                     # This will leave behind the temporary file,
                     # which is useful for debugging syntax errors, etc.
                     raise RuntimeError(proc.communicate()[1])
+            template_item[1] = True
+        if key is not None:
+            self.templates[key] = template_item
         # Make job file executable
         mode = (
             os.stat(tmp_name).st_mode |
@@ -104,6 +136,27 @@ class JobFileWriter(object):
         os.chmod(tmp_name, mode)
         os.rename(tmp_name, local_job_file_path)
 
+    def _get_template(self, job_conf):
+        """Return the template of the job script after the directives.
+
+        Return a list of alternate strings and TEMPLATE_KEYS items.
+
+        """
+        template_conf = dict(job_conf)
+        for key in self.TEMPLATE_KEYS:
+            template_conf[key] = self.TEMPLATE_MARK + key + self.TEMPLATE_MARK
+        handle = StringIO()
+        self._write_prelude(handle, template_conf)
+        self._write_environment_1(handle, template_conf)
+        self._write_global_init_script(handle, template_conf)
+        # suite bin access must be before runtime environment
+        # because suite bin commands may be used in variable
+        # assignment expressions: FOO=$(command args).
+        self._write_environment_2(handle, template_conf)
+        self._write_script(handle, template_conf)
+        self._write_epilogue(handle, template_conf)
+        return handle.getvalue().split(self.TEMPLATE_MARK)
+
     @staticmethod
     def _check_script_value(value):
         """Return True if script has any executable statements."""
@@ -309,3 +362,135 @@ class JobFileWriter(object):
         handle.write('\n\n. "${CYLC_DIR}/lib/cylc/job.sh"\ncylc__job__main')
         handle.write("\n\n%s%s\n" % (
             BatchSysManager.LINE_PREFIX_EOF, job_conf['job_d']))
+
+
+if __name__ == "__main__":
+    import unittest
+    from shutil import rmtree
+    from tempfile import mkdtemp
+
+    class TestJobFileWriter(unittest.TestCase):
+        """Unit tests for JobFileWriter job file templates."""
+
+        def setUp(self):
+            self.tmpdir = mkdtemp()
+            os.environ.setdefault('CYLC_SUITE_DEF_PATH', self.tmpdir)
+            self.suite_env = {
+                'CYLC_UTC': 'True',
+                'CYLC_SUITE_NAME': 'test-suite',
+                'CYLC_SUITE_INITIAL_CYCLE_POINT': '20200101T0000Z'}
+
+        def tearDown(self):
+            rmtree(self.tmpdir)
+
+        def _get_job_conf(self, point, submit_num, try_num, **kwargs):
+            """Return a job_conf for a job of task "foo"."""
+            task_id = 'foo.%s' % point
+            job_d = '%s/foo/%02d' % (point, submit_num)
+            job_conf = {
+                'batch_system_name': 'background',
+                'batch_submit_command_template': None,
+                'batch_system_conf': {},
+                'directives': {},
+                'environment': {'GREETING': 'hello', 'HOME_D': '~/foo'},
+                'execution_time_limit': None,
+                'env-script': '',
+                'err-script': 'echo "${1}"',
+                'host': 'localhost',
+                'init-script': '',
+                'job_file_path': os.path.join(self.tmpdir, job_d, 'job'),
+                'job_d': job_d,
+                'namespace_hierarchy': ['root', 'foo'],
+                'owner': None,
+                'param_env_tmpl': {},
+                'param_var': {},
+                'post-script': '',
+                'pre-script': 'echo pre',
+                'remote_suite_d': None,
+                'script': 'echo "${CYLC_TASK_ID}"',
+                'shell': '/bin/bash',
+                'submit_num': submit_num,
+                'suite_name': 'test-suite',
+                'task_id': task_id,
+                'template_key': ('foo', 'localhost', None),
+                'try_num': try_num,
+                'uuid_str': 'abc-123',
+                'work_d': None,
+            }
+            job_conf.update(kwargs)
+            return job_conf
+
+        def _write(self, writer, job_conf):
+            """Write a job file with writer, and return its content."""
+            path = os.path.join(self.tmpdir, 'job')
+            writer.write(path, job_conf)
+            with open(path) as handle:
+                return handle.read()
+
+        def _write_full(self, job_conf):
+            """Return the content of a job file written section by section,
+            without a template."""
+            writer = JobFileWriter()
+            writer.set_suite_env(self.suite_env)
+            handle = StringIO()
+            writer._write_header(handle, job_conf)
+            writer._write_directives(handle, job_conf)
+            writer._write_prelude(handle, job_conf)
+            writer._write_environment_1(handle, job_conf)
+            writer._write_global_init_script(handle, job_conf)
+            writer._write_environment_2(handle, job_conf)
+            writer._write_script(handle, job_conf)
+            writer._write_epilogue(handle, job_conf)
+            return handle.getvalue()
+
+        def test_template(self):
+            """Jobs of the same task filled in from a template should match
+            full writes of the same jobs."""
+            writer = JobFileWriter()
+            writer.set_suite_env(self.suite_env)
+            job_confs = [
+                self._get_job_conf('20200101T0000Z', 1, 1),
+                self._get_job_conf('20200102T0000Z', 3, 2),
+                self._get_job_conf('20200101T0000Z', 2, 2)]
+            for job_conf in job_confs:
+                self.assertEqual(
+                    self._write_full(job_conf), self._write(writer, job_conf))
+            self.assertEqual(1, len(writer.templates))
+            self.assertTrue(writer.templates.values()[0][1])
+
+        def test_no_template(self):
+            """Jobs without a template key (e.g. with broadcast settings or
+            cycle point specific scripts) should not use or change the
+            template of the task."""
+            writer = JobFileWriter()
+            writer.set_suite_env(self.suite_env)
+            job_conf = self._get_job_conf('20200101T0000Z', 1, 1)
+            self._write(writer, job_conf)
+            templates = dict(writer.templates)
+            for job_conf in [
+                    # Broadcast environment setting
+                    self._get_job_conf(
+                        '20200102T0000Z', 1, 1, template_key=None,
+                        environment={'GREETING': 'hi', 'HOME_D': '~/foo'}),
+                    # Suite state polling script for the cycle point
+                    self._get_job_conf(
+                        '20200103T0000Z', 1, 1, template_key=None,
+                        script='cylc suite-state --point=20200103T0000Z x')]:
+                self.assertEqual(
+                    self._write_full(job_conf), self._write(writer, job_conf))
+                self.assertEqual(templates, writer.templates)
+            job_conf = self._get_job_conf('20200104T0000Z', 1, 1)
+            self.assertEqual(
+                self._write_full(job_conf), self._write(writer, job_conf))
+
+        def test_bad_syntax(self):
+            """A template with bad syntax should be checked again for the
+            next job."""
+            writer = JobFileWriter()
+            writer.set_suite_env(self.suite_env)
+            job_conf = self._get_job_conf('20200101T0000Z', 1, 1, script='(')
+            for _ in range(2):
+                self.assertRaises(RuntimeError, self._write, writer, job_conf)
+            self.assertEqual({}, writer.templates)
+
+    unittest.main()
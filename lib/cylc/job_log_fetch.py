@@ -0,0 +1,366 @@
+#!/usr/bin/env python
+
+# THIS FILE IS PART OF THE CYLC SUITE ENGINE.
+# Copyright (C) 2008-2018 NIWA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Fetch and follow job logs on a job host over a single connection.
+
+A JobLogServer runs on the job host (as "cylc cat-log --remote-serve"). It
+reads requests from STDIN and writes framed responses to STDOUT:
+
+    request: "ID ACTION OFFSET LENGTH PATH\n"
+        ACTION is one of "fetch", "follow" or "unfollow". LENGTH is -1 for
+        up to end of file. OFFSET and LENGTH are ignored by "unfollow".
+    response: "ID KIND OFFSET NBYTES\n" followed by NBYTES bytes.
+        KIND is "data" for content of the file from OFFSET, "end" at the end
+        of a fetch, or "error" for an error message.
+
+A JobLogClient on the suite host multiplexes any number of fetches and follows
+of logs on a user@host over one such connection. Use "get_client" to share a
+client per user@host in a process.
+"""
+
+import os
+from select import select
+from subprocess import PIPE
+import sys
+from threading import Event, Lock, Thread
+
+from cylc.remote import remote_cylc_cmd
+
+
+FETCH = "fetch"
+FOLLOW = "follow"
+UNFOLLOW = "unfollow"
+DATA = "data"
+END = "end"
+ERROR = "error"
+
+
+class JobLogServer(object):
+    """Serve requests to fetch and follow job logs, on the job host.
+
+    Args:
+        handle_in (file): Read requests from this file.
+        handle_out (file): Write responses to this file.
+        interval (float): Seconds between checks of followed logs for growth.
+
+    """
+
+    BUFSIZE = 1024 * 1024
+
+    def __init__(self, handle_in, handle_out, interval=1.0):
+        self.handle_in = handle_in
+        self.handle_out = handle_out
+        self.interval = interval
+        self.follows = {}  # {req_id: [path, offset]}
+
+    def run(self):
+        """Serve requests until the input is closed."""
+        buf = ""
+        while True:
+            if self.follows:
+                timeout = self.interval
+            else:
+                timeout = None
+            if select([self.handle_in], [], [], timeout)[0]:
+                data = os.read(self.handle_in.fileno(), self.BUFSIZE)
+                if not data:
+                    return
+                buf += data
+                while "\n" in buf:
+                    line, buf = buf.split("\n", 1)
+                    self.handle_request(line)
+            for req_id, follow in self.follows.items():
+                follow[1] = self._send_data(req_id, follow[0], follow[1])
+            self.handle_out.flush()
+
+    def handle_request(self, line):
+        """Handle a request line."""
+        try:
+            req_id, action, offset, length, path = line.split(" ", 4)
+            offset, length = int(offset), int(length)
+        except ValueError:
+            self._send(ERROR, "-", 0, "bad request: %s" % line)
+            return
+        path = os.path.expanduser(os.path.expandvars(path))
+        if action == FETCH:
+            try:
+                self._send_data(req_id, path, offset, length, fail=True)
+            except (IOError, OSError) as exc:
+                self._send(ERROR, req_id, offset, str(exc))
+            else:
+                self._send(END, req_id, offset, "")
+        elif action == FOLLOW:
+            self.follows[req_id] = [path, offset]
+        elif action == UNFOLLOW:
+            self.follows.pop(req_id, None)
+        else:
+            self._send(ERROR, req_id, offset, "bad action: %s" % action)
+
+    def _send(self, kind, req_id, offset, data):
+        """Write a response frame."""
+        self.handle_out.write(
+            "%s %s %d %d\n%s" % (req_id, kind, offset, len(data), data))
+
+    def _send_data(self, req_id, path, offset, length=-1, fail=False):
+        """Send content of path from offset, return the offset after it.
+
+        If fail is False, a missing file is like an empty one, and offset is
+        reset to 0 if the file has shrunk, e.g. has been rewritten.
+        """
+        try:
+            size = os.stat(path).st_size
+        except (IOError, OSError):
+            if fail:
+                raise
+            return offset
+        if size < offset and not fail:
+            offset = 0
+        if length >= 0:
+            size = min(size, offset + length)
+        if size <= offset:
+            return offset
+        with open(path, "rb") as handle:
+            handle.seek(offset)
+            while offset < size:
+                data = handle.read(min(self.BUFSIZE, size - offset))
+                if not data:
+                    break
+                self._send(DATA, req_id, offset, data)
+                offset += len(data)
+        return offset
+
+
+class JobLogClient(object):
+    """Fetch and follow job logs on a user@host over one connection.
+
+    Args:
+        user (str): User ID of the job host account.
+        host (str): Job host name.
+        proc (subprocess.Popen): Use this (pipe connected) JobLogServer process
+            instead of starting one on user@host with "remote_cylc_cmd".
+
+    """
+
+    def __init__(self, user=None, host=None, proc=None):
+        if proc is None:
+            proc = remote_cylc_cmd(
+                ["cat-log", "--remote-serve", "-"], user, host,
+                capture=True, stdin=PIPE)
+        self.proc = proc
+        self.lock = Lock()
+        self.callbacks = {}  # {req_id: callback(kind, offset, data)}
+        self.req_num = 0
+        self.reader = Thread(target=self._read)
+        self.reader.daemon = True
+        self.reader.start()
+
+    def is_alive(self):
+        """Return True if the connection is still open."""
+        return self.proc.poll() is None and self.reader.is_alive()
+
+    def fetch(self, path, offset=0, length=-1, handle=None):
+        """Return content of path on the job host, from offset.
+
+        If handle is specified, write the content to it instead of returning
+        it. Raise IOError on failure to read path.
+        """
+        done = Event()
+        chunks = []
+        errors = []
+
+        def _callback(kind, _, data):
+            """Collect chunks of the file."""
+            if kind == DATA:
+                if handle is None:
+                    chunks.append(data)
+                else:
+                    handle.write(data)
+            else:
+                if kind == ERROR:
+                    errors.append(data)
+                done.set()
+
+        self._request(FETCH, path, offset, length, _callback)
+        # Note: wait with a timeout, so it can be interrupted.
+        while not done.wait(1):
+            pass
+        if errors:
+            raise IOError(errors[0])
+        if handle is None:
+            return "".join(chunks)
+
+    def follow(self, path, callback, offset=0):
+        """Call callback(data) with content of path as it is appended to.
+
+        Return an ID for "unfollow".
+        """
+
+        def _callback(kind, _, data):
+            """Pass data to callback."""
+            if kind == DATA:
+                callback(data)
+
+        return self._request(FOLLOW, path, offset, -1, _callback)
+
+    def unfollow(self, req_id):
+        """Stop following the log of a previous "follow"."""
+        with self.lock:
+            self.callbacks.pop(req_id, None)
+            self._write(req_id, UNFOLLOW, 0, -1, "-")
+
+    def close(self):
+        """Close the connection."""
+        try:
+            self.proc.stdin.close()
+        except IOError:
+            pass
+        self.proc.wait()
+        self.reader.join()
+
+    def _request(self, action, path, offset, length, callback):
+        """Send a request, return its ID."""
+        with self.lock:
+            self.req_num += 1
+            req_id = str(self.req_num)
+            self.callbacks[req_id] = callback
+            self._write(req_id, action, offset, length, path)
+        return req_id
+
+    def _write(self, req_id, action, offset, length, path):
+        """Write a request line to the server."""
+        self.proc.stdin.write(
+            "%s %s %d %d %s\n" % (req_id, action, offset, length, path))
+        self.proc.stdin.flush()
+
+    def _read(self):
+        """Read response frames, pass them to the callbacks of requests."""
+        while True:
+            header = self.proc.stdout.readline()
+            if not header:
+                break
+            try:
+                req_id, kind, offset, nbytes = header.split()
+                offset, nbytes = int(offset), int(nbytes)
+            except ValueError:
+                sys.stderr.write("ERROR: bad job log response: %s" % header)
+                break
+            data = self.proc.stdout.read(nbytes)
+            with self.lock:
+                if kind == DATA:
+                    callback = self.callbacks.get(req_id)
+                else:
+                    callback = self.callbacks.pop(req_id, None)
+            if callback is not None:
+                callback(kind, offset, data)
+        # Connection closed, fail outstanding requests.
+        with self.lock:
+            callbacks = self.callbacks.values()
+            self.callbacks.clear()
+        for callback in callbacks:
+            callback(ERROR, 0, "connection closed")
+
+
+_CLIENTS = {}
+_CLIENTS_LOCK = Lock()
+
+
+def get_client(user=None, host=None):
+    """Return the shared JobLogClient for user@host, start it if needed."""
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get((user, host))
+        if client is None or not client.is_alive():
+            client = JobLogClient(user, host)
+            _CLIENTS[(user, host)] = client
+        return client
+
+
+if __name__ == "__main__":
+    import unittest
+    from shutil import rmtree
+    from subprocess import Popen
+    from tempfile import mkdtemp
+    from time import sleep
+
+    class TestJobLogFetch(unittest.TestCase):
+        """Unit tests for JobLogServer and JobLogClient."""
+
+        def setUp(self):
+            self.tmpdir = mkdtemp()
+            self.path = os.path.join(self.tmpdir, "job.out")
+            with open(self.path, "wb") as handle:
+                handle.write("hello\nworld\n")
+            lib_dir = os.path.dirname(os.path.dirname(
+                os.path.abspath(__file__)))
+            proc = Popen(
+                [sys.executable, "-c",
+                 "import sys\n" +
+                 "from cylc.job_log_fetch import JobLogServer\n" +
+                 "JobLogServer(sys.stdin, sys.stdout, 0.1).run()\n"],
+                stdin=PIPE, stdout=PIPE,
+                env=dict(os.environ, PYTHONPATH=lib_dir))
+            self.client = JobLogClient(proc=proc)
+
+        def tearDown(self):
+            self.client.close()
+            rmtree(self.tmpdir)
+
+        def test_fetch(self):
+            """Test fetch of whole file and byte ranges."""
+            self.assertEqual("hello\nworld\n", self.client.fetch(self.path))
+            self.assertEqual("world\n", self.client.fetch(self.path, 6))
+            self.assertEqual("ell", self.client.fetch(self.path, 1, 3))
+            self.assertEqual("", self.client.fetch(self.path, 100))
+            self.assertRaises(
+                IOError, self.client.fetch, self.path + ".nosuch")
+            self.assertTrue(self.client.is_alive())
+
+        def test_follow(self):
+            """Test follow of multiple files over one connection."""
+            path2 = os.path.join(self.tmpdir, "job.err")
+            chunks = []
+            chunks2 = []
+            req_id = self.client.follow(self.path, chunks.append)
+            self.client.follow(path2, chunks2.append)
+            for _ in range(50):
+                if chunks:
+                    break
+                sleep(0.1)
+            with open(self.path, "ab") as handle:
+                handle.write("more\n")
+            with open(path2, "wb") as handle:
+                handle.write("err\n")
+            for _ in range(50):
+                if "".join(chunks).endswith("more\n") and chunks2:
+                    break
+                sleep(0.1)
+            self.assertEqual("hello\nworld\nmore\n", "".join(chunks))
+            self.assertEqual("err\n", "".join(chunks2))
+            self.client.unfollow(req_id)
+            # Fetch is served in between follows.
+            self.assertEqual("err\n", self.client.fetch(path2))
+            with open(self.path, "ab") as handle:
+                handle.write("ignored\n")
+            with open(path2, "ab") as handle:
+                handle.write("err2\n")
+            for _ in range(50):
+                if "".join(chunks2).endswith("err2\n"):
+                    break
+                sleep(0.1)
+            self.assertEqual("err\nerr2\n", "".join(chunks2))
+            self.assertEqual("hello\nworld\nmore\n", "".join(chunks))
+
+    unittest.main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+
+# THIS FILE IS PART OF THE CYLC SUITE ENGINE.
+# Copyright (C) 2008-2018 NIWA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Bounded least-recently-used memoization, with hit/miss counters.
+
+Used for e.g. cycle point parsing and arithmetic, where a running suite
+keeps using a moving window of recent cycle points. Each memoized function
+has its own cache, of a size set on decoration, which can be changed later.
+The statistics of all the caches can be obtained with get_stats, e.g. for
+the profiler.
+"""
+
+from threading import Lock
+import unittest
+
+MAXSIZE = 10000
+
+# Fields of a link in the circular doubly linked list of a cache.
+_PREV, _NEXT, _KEY, _RESULT = range(4)
+
+# All memoized functions, in order of decoration.
+_MEMOIZED = []
+
+
+def memoize(maxsize=MAXSIZE):
+    """Return a decorator to memoize a function in a LRU cache.
+
+    The arguments and results of the function must be immutable, and the
+    arguments hashable. Keyword arguments are not allowed.
+
+    At most maxsize results are kept, the least recently used result is
+    discarded to make room for a new one. The decorated function has the
+    attributes:
+    cache_info() -- return (name, hits, misses, size, maxsize)
+    cache_clear() -- discard all results and reset the counters
+    cache_resize(maxsize) -- change the maximum size
+
+    """
+
+    def _decorator(function):
+        """Return function wrapped in a LRU cache."""
+        # {args: link, ...}
+        cache = {}
+        cache_get = cache.get
+        # Links are [prev, next, args, result], root[_NEXT] is the least
+        # recently used, root[_PREV] is the most recently used.
+        root = []
+        root[:] = [root, root, None, None]
+        # [hits, misses, maxsize]
+        state = [0, 0, maxsize]
+        lock = Lock()
+
+        def _wrapper(*args):
+            """Return function(*args), cached."""
+            with lock:
+                link = cache_get(args)
+                if link is not None:
+                    # Move the link to the most recently used end.
+                    link_prev, link_next, _, result = link
+                    link_prev[_NEXT] = link_next
+                    link_next[_PREV] = link_prev
+                    last = root[_PREV]
+                    last[_NEXT] = root[_PREV] = link
+                    link[_PREV] = last
+                    link[_NEXT] = root
+                    state[0] += 1
+                    return result
+                state[1] += 1
+            result = function(*args)
+            with lock:
+                if args in cache or state[2] <= 0:
+                    # Added by another thread, or caching disabled.
+                    return result
+                if len(cache) >= state[2]:
+                    _pop_oldest()
+                last = root[_PREV]
+                link = [last, root, args, result]
+                last[_NEXT] = root[_PREV] = cache[args] = link
+            return result
+
+        def _pop_oldest():
+            """Discard the least recently used result."""
+            oldest = root[_NEXT]
+            root[_NEXT] = oldest[_NEXT]
+            oldest[_NEXT][_PREV] = root
+            del cache[oldest[_KEY]]
+
+        def cache_info():
+            """Return (name, hits, misses, size, maxsize)."""
+            return (_get_name(function), state[0], state[1], len(cache),
+                    state[2])
+
+        def cache_clear():
+            """Discard all results and reset the counters."""
+            with lock:
+                cache.clear()
+                root[:] = [root, root, None, None]
+                state[0] = state[1] = 0
+
+        def cache_resize(new_maxsize):
+            """Change the maximum size, discarding results if necessary."""
+            with lock:
+                state[2] = new_maxsize
+                while cache and len(cache) > new_maxsize:
+                    _pop_oldest()
+
+        _wrapper.__name__ = function.__name__
+        _wrapper.__doc__ = function.__doc__
+        _wrapper.cache_info = cache_info
+        _wrapper.cache_clear = cache_clear
+        _wrapper.cache_resize = cache_resize
+        _MEMOIZED.append(_wrapper)
+        return _wrapper
+
+    return _decorator
+
+
+def _get_name(function):
+    """Return "module.name" for a function."""
+    return '%s.%s' % (function.__module__, function.__name__)
+
+
+def get_stats():
+    """Return a list of cache_info() for all memoized functions."""
+    return [function.cache_info() for function in _MEMOIZED]
+
+
+def clear_all():
+    """Clear the caches of all memoized functions."""
+    for function in _MEMOIZED:
+        function.cache_clear()
+
+
+class TestMemoize(unittest.TestCase):
+    """Unit tests for the LRU memoize decorator."""
+
+    def setUp(self):
+        self.calls = []
+
+        @memoize(maxsize=3)
+        def double(value):
+            """Double a value."""
+            self.calls.append(value)
+            return value * 2
+
+        self.double = double
+
+    def tearDown(self):
+        _MEMOIZED.remove(self.double)
+
+    def test_hits_misses(self):
+        """Results should be cached, and hits and misses counted."""
+        self.assertEqual(self.double(1), 2)
+        self.assertEqual(self.double(1), 2)
+        self.assertEqual(self.double(2), 4)
+        self.assertEqual(self.calls, [1, 2])
+        self.assertEqual(
+            self.double.cache_info(), (__name__ + '.double', 1, 2, 2, 3))
+        self.assertTrue(self.double.cache_info() in get_stats())
+        self.double.cache_clear()
+        self.assertEqual(
+            self.double.cache_info(), (__name__ + '.double', 0, 0, 0, 3))
+        self.assertEqual(self.double(1), 2)
+        self.assertEqual(self.calls, [1, 2, 1])
+
+    def test_lru(self):
+        """The least recently used result should be discarded."""
+        for value in [1, 2, 3, 1, 4]:
+            self.double(value)
+        # 2 was the least recently used when 4 was added.
+        self.assertEqual(self.calls, [1, 2, 3, 4])
+        for value in [1, 3, 4]:
+            self.double(value)
+        self.assertEqual(self.calls, [1, 2, 3, 4])
+        self.double(2)
+        self.assertEqual(self.calls, [1, 2, 3, 4, 2])
+        self.assertEqual(self.double.cache_info()[3], 3)
+
+    def test_resize(self):
+        """Resizing should discard the least recently used results."""
+        for value in [1, 2, 3]:
+            self.double(value)
+        self.double.cache_resize(1)
+        self.assertEqual(self.double.cache_info()[3:], (1, 1))
+        self.double(3)
+        self.assertEqual(self.calls, [1, 2, 3])
+        self.double(2)
+        self.assertEqual(self.calls, [1, 2, 3, 2])
+        self.double.cache_resize(0)
+        self.assertEqual(self.double.cache_info()[3:], (0, 0))
+        self.double(2)
+        self.double(2)
+        self.assertEqual(self.calls, [1, 2, 3, 2, 2, 2])
+
+    def test_exception(self):
+        """Exceptions should not be cached."""
+
+        @memoize()
+        def fail(value):
+            """Raise ValueError."""
+            self.calls.append(value)
+            raise ValueError(value)
+
+        try:
+            self.assertRaises(ValueError, fail, 1)
+            self.assertRaises(ValueError, fail, 1)
+            self.assertEqual(self.calls, [1, 1])
+            self.assertEqual(fail.cache_info()[1:4], (0, 2, 0))
+        finally:
+            _MEMOIZED.remove(fail)
+
+
+if __name__ == '__main__':
+    unittest.main()
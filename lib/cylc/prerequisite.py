@@ -156,6 +156,19 @@ class Prerequisite(object):
                                     self.SATISFIED_TEMPLATE % message)
             self.conditional_expression = expr
 
+    def set_condition_template(self, template, messages):
+        """Set the conditional expression from a template.
+
+        Each integer in the template list is the index of a message in
+        messages. Unlike set_condition, no pre-initial messages are dropped.
+
+        """
+        self._all_satisfied = None
+        self.conditional_expression = ''.join(
+            self.SATISFIED_TEMPLATE % messages[item]
+            if isinstance(item, int) else item
+            for item in template)
+
     def is_satisfied(self):
         """Return True if prerequisite is satisfied.
 
@@ -255,12 +268,9 @@ class Prerequisite(object):
         """
         for message in self.satisfied:
             self.satisfied[message] = self.DEP_STATE_UNSATISFIED
-        if not self.satisfied:
-            self._all_satisfied = True
-        elif self.conditional_expression is None:
-            self._all_satisfied = False
-        else:
-            self._all_satisfied = self._conditional_is_satisfied()
+        # A conditional expression only combines messages with "&" and "|",
+        # so it cannot be satisfied with none of its messages satisfied.
+        self._all_satisfied = not self.satisfied
 
     def get_target_points(self):
         """Return a list of cycle points target by each prerequisite,
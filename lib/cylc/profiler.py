@@ -23,6 +23,8 @@ import StringIO
 import pstats
 from subprocess import Popen, PIPE
 
+from cylc.memoize import get_stats as get_memoize_stats
+
 
 class Profiler(object):
     """Wrap cProfile, pstats, and memory logging, for performance profiling."""
@@ -51,6 +53,7 @@ class Profiler(object):
         stats.sort_stats('cumulative')
         stats.print_stats()
         print string_stream.getvalue()
+        self.log_memoize_stats()
 
     def log_memory(self, message):
         """Print a message to standard out with the current memory usage."""
@@ -61,3 +64,14 @@ class Profiler(object):
             stdin=open(os.devnull), stdout=PIPE)
         memory = int(proc.communicate()[0])
         print "PROFILE: Memory: %d KiB: %s" % (memory, message)
+
+    def log_memoize_stats(self):
+        """Print hit/miss counters of the memoized function caches."""
+        if not self.enabled:
+            return
+        for name, hits, misses, size, maxsize in get_memoize_stats():
+            if not hits and not misses:
+                continue
+            print "PROFILE: Memoize: %s: hits %d (%.1f%%), misses %d," % (
+                name, hits, 100.0 * hits / (hits + misses), misses),
+            print "size %d/%d" % (size, maxsize)
@@ -176,6 +176,8 @@ class CylcSuiteDAO(object):
     MAX_TRIES = 100
     CHECKPOINT_LATEST_ID = 0
     CHECKPOINT_LATEST_EVENT = "latest"
+    # Events of checkpoints taken automatically by the suite server program
+    CHECKPOINT_AUTO_EVENTS = ("restart", "reload-init", "reload-done")
     TABLE_BROADCAST_EVENTS = "broadcast_events"
     TABLE_BROADCAST_STATES = "broadcast_states"
     TABLE_BROADCAST_STATES_CHECKPOINTS = "broadcast_states_checkpoints"
@@ -193,6 +195,9 @@ class CylcSuiteDAO(object):
     TABLE_TASK_POOL_CHECKPOINTS = "task_pool_checkpoints"
     TABLE_TASK_STATES = "task_states"
     TABLE_TASK_TIMEOUT_TIMERS = "task_timeout_timers"
+    # Tables with *_checkpoints counterparts
+    CHECKPOINT_TABLE_NAMES = (
+        TABLE_SUITE_PARAMS, TABLE_BROADCAST_STATES, TABLE_TASK_POOL)
 
     TABLES_ATTRS = {
         TABLE_BROADCAST_EVENTS: [
@@ -595,6 +600,19 @@ class CylcSuiteDAO(object):
         except sqlite3.DatabaseError:
             return None
 
+    def select_task_job_hosts(self, cycles):
+        """Select distinct user_at_host of task_jobs at cycles.
+
+        Return a set of user_at_host strings.
+        """
+        stmt = (r"SELECT DISTINCT user_at_host FROM %(table)s"
+                r" WHERE cycle IN (%(qmarks)s)") % {
+            "table": self.TABLE_TASK_JOBS,
+            "qmarks": ",".join(["?"] * len(cycles))}
+        return set(
+            row[0] for row in self.connect().execute(stmt, list(cycles))
+            if row[0])
+
     def select_task_job_run_times(self, callback):
         """Select run times of succeeded task jobs grouped by task names.
 
@@ -734,11 +752,23 @@ class CylcSuiteDAO(object):
         for row_idx, row in enumerate(self.connect().execute(stmt, stmt_args)):
             callback(row_idx, list(row))
 
-    def select_task_times(self):
+    def select_task_times(self, callback=None, start_point=None,
+                          stop_point=None, names=None):
         """Select submit/start/stop times to compute job timings.
 
         To make data interpretation easier, choose the most recent succeeded
         task to sample timings from.
+
+        If callback is specified, invoke callback(row_idx, row) on each row,
+        where each row contains:
+            [name, cycle, host, batch_system,
+             submit_time, start_time, succeed_time]
+        and return the column names. Otherwise, return the column names and
+        a list of all the rows.
+
+        Restrict rows to cycle points between start_point and stop_point
+        (inclusive) and to task names matching the globs in names, if
+        specified.
         """
         q = """
             SELECT
@@ -761,19 +791,95 @@ class CylcSuiteDAO(object):
             'name', 'cycle', 'host', 'batch_system',
             'submit_time', 'start_time', 'succeed_time'
         )
-        return columns, [r for r in self.connect().execute(q)]
+        where_str, stmt_args = self._get_task_times_where(
+            start_point, stop_point, names)
+        q += where_str
+        if callback is None:
+            return columns, [r for r in self.connect().execute(q, stmt_args)]
+        for row_idx, row in enumerate(self.connect().execute(q, stmt_args)):
+            callback(row_idx, list(row))
+        return columns
 
-    def take_checkpoints(self, event, other_daos=None):
-        """Add insert items to *_checkpoints tables.
+    def select_task_durations(self, callback, start_point=None,
+                              stop_point=None, names=None):
+        """Select queue/run/total durations of succeeded task jobs.
 
-        Select items in suite_params, broadcast_states and task_pool and
-        prepare them for insert into the relevant *_checkpoints tables, and
-        prepare an insert into the checkpoint_id table the event and the
-        current time.
+        Invoke callback(row_idx, row) on each row, where each row contains:
+            [name, cycle, host, batch_system,
+             queue_time, run_time, total_time]
+
+        where the durations are in seconds, computed by the database from
+        the submit, start and succeed times, so callers can aggregate them
+        incrementally without holding all the rows in memory. Arguments
+        start_point, stop_point and names restrict the rows as for
+        select_task_times.
+        """
+        stmt = (
+            r"SELECT"
+            r" name,"
+            r" cycle,"
+            r" user_at_host,"
+            r" batch_sys_name,"
+            r" CAST(strftime('%%s', time_run) AS NUMERIC) -"
+            r" CAST(strftime('%%s', time_submit) AS NUMERIC),"
+            r" CAST(strftime('%%s', time_run_exit) AS NUMERIC) -"
+            r" CAST(strftime('%%s', time_run) AS NUMERIC),"
+            r" CAST(strftime('%%s', time_run_exit) AS NUMERIC) -"
+            r" CAST(strftime('%%s', time_submit) AS NUMERIC)"
+            r" FROM %(task_jobs)s"
+            r" WHERE run_status==0") % {'task_jobs': self.TABLE_TASK_JOBS}
+        where_str, stmt_args = self._get_task_times_where(
+            start_point, stop_point, names)
+        stmt += where_str
+        for row_idx, row in enumerate(self.connect().execute(stmt, stmt_args)):
+            callback(row_idx, list(row))
+
+    @staticmethod
+    def _get_task_times_where(start_point=None, stop_point=None, names=None):
+        """Return (where_str, stmt_args) to filter task_jobs rows.
+
+        The returned where_str should be appended to an existing WHERE clause.
+        Integer cycle points are compared numerically, others (ISO8601 points
+        dumped in a consistent format) are compared as strings.
+        """
+        where_str = ""
+        stmt_args = []
+        bounds = [point for point in (start_point, stop_point) if point]
+        if all(point.lstrip("+-").isdigit() for point in bounds):
+            cycle_expr = "CAST(cycle AS INTEGER)"
+            bounds_args = [int(point) for point in bounds]
+        else:
+            cycle_expr = "cycle"
+            bounds_args = bounds
+        if start_point:
+            where_str += " AND %s >= ?" % cycle_expr
+        if stop_point:
+            where_str += " AND %s <= ?" % cycle_expr
+        stmt_args.extend(bounds_args)
+        if names:
+            where_str += (
+                " AND (" + " OR ".join(["name GLOB ?"] * len(names)) + ")")
+            stmt_args.extend(names)
+        return where_str, stmt_args
+
+    def take_checkpoints(self, event, other_daos=None, max_auto=None):
+        """Insert items into *_checkpoints tables.
+
+        Copy items in suite_params, broadcast_states and task_pool into the
+        relevant *_checkpoints tables with set-based "INSERT ... SELECT"
+        statements, and insert the event and the current time into the
+        checkpoint_id table. The statements are executed and committed
+        immediately in a single transaction, so the rows are never read into
+        Python.
 
         If other_daos is a specified, it should be a list of CylcSuiteDAO
-        objects.  The logic will prepare insertion of the same items into the
-        *_checkpoints tables of these DAOs as well.
+        objects.  The logic will insert the same items (selected from this
+        database) into the *_checkpoints tables of these DAOs as well.
+
+        If max_auto is specified, delete all but the max_auto most recent
+        automatic checkpoints (see CHECKPOINT_AUTO_EVENTS) after inserting.
+
+        Return the new checkpoint ID.
         """
         id_ = 1
         for max_id, in self.connect().execute(
@@ -781,20 +887,83 @@ class CylcSuiteDAO(object):
                 {"table": self.TABLE_CHECKPOINT_ID}):
             if max_id >= id_:
                 id_ = max_id + 1
-        daos = [self]
-        if other_daos:
-            daos.extend(other_daos)
-        for dao in daos:
-            dao.tables[self.TABLE_CHECKPOINT_ID].add_insert_item([
-                id_, get_current_time_string(), event])
+        time_str = get_current_time_string()
+        self._insert_checkpoint(id_, time_str, event, max_auto)
+        for dao in other_daos or []:
+            dao._insert_checkpoint(
+                id_, time_str, event, max_auto, self.db_file_name)
+        return id_
+
+    def _insert_checkpoint(self, id_, time_str, event, max_auto=None,
+                           src_db_file_name=None):
+        """Helper for "self.take_checkpoints".
+
+        Insert a checkpoint with items selected from this database, or from
+        the database at src_db_file_name if specified. Prune old automatic
+        checkpoints if max_auto is specified.
+        """
+        src = ""
+        try:
+            conn = self.connect()
+            if src_db_file_name:
+                conn.execute("ATTACH DATABASE ? AS src", [src_db_file_name])
+                src = "src."
+            conn.execute(
+                self.tables[self.TABLE_CHECKPOINT_ID].get_insert_stmt(),
+                [id_, time_str, event])
+            for table_name in self.CHECKPOINT_TABLE_NAMES:
+                names = ",".join(
+                    column.name for column in self.tables[table_name].columns)
+                conn.execute(
+                    r"INSERT INTO %(ckp_table)s(id,%(names)s)"
+                    r" SELECT ?,%(names)s FROM %(src)s%(table)s" % {
+                        "ckp_table": table_name + "_checkpoints",
+                        "names": names,
+                        "src": src,
+                        "table": table_name},
+                    [id_])
+            if max_auto:
+                self._prune_checkpoints(max_auto)
+            conn.commit()
+        except sqlite3.Error:
+            if self.conn is not None:
+                try:
+                    self.conn.rollback()
+                except sqlite3.Error:
+                    pass
+            if not self.is_public:
+                raise
+            if cylc.flags.debug:
+                traceback.print_exc()
+            LOG.warning(
+                "%(file)s: cannot insert checkpoint %(id)d" % {
+                    "file": self.db_file_name, "id": id_})
+        finally:
+            if src and self.conn is not None:
+                try:
+                    self.conn.execute("DETACH DATABASE src")
+                except sqlite3.Error:
+                    pass
+
+    def _prune_checkpoints(self, max_auto):
+        """Delete all but the max_auto most recent automatic checkpoints.
+
+        Helper for "self._insert_checkpoint", which commits the deletes.
+        """
+        stmt_args = list(self.CHECKPOINT_AUTO_EVENTS) + [max_auto]
+        ids_stmt = (
+            r"SELECT id FROM %(table)s WHERE event IN (%(events)s)"
+            r" ORDER BY id DESC LIMIT -1 OFFSET ?") % {
+            "table": self.TABLE_CHECKPOINT_ID,
+            "events": ",".join("?" * len(self.CHECKPOINT_AUTO_EVENTS))}
         for table_name in [
-                self.TABLE_SUITE_PARAMS,
-                self.TABLE_BROADCAST_STATES,
-                self.TABLE_TASK_POOL]:
-            for row in self.connect().execute("SELECT * FROM %s" % table_name):
-                for dao in daos:
-                    dao.tables[table_name + "_checkpoints"].add_insert_item(
-                        [id_] + list(row))
+                self.TABLE_BROADCAST_STATES_CHECKPOINTS,
+                self.TABLE_SUITE_PARAMS_CHECKPOINTS,
+                self.TABLE_TASK_POOL_CHECKPOINTS,
+                self.TABLE_CHECKPOINT_ID]:
+            self.conn.execute(
+                r"DELETE FROM %s WHERE id IN (%s)" % (table_name, ids_stmt),
+                stmt_args)
 
     def upgrade_from_611(self):
         """Upgrade database on restart with a 6.11.X private database."""
@@ -34,7 +34,8 @@ from parsec.util import printcfg
 from cylc.cfgspec.glbl_cfg import glbl_cfg
 from cylc.config import SuiteConfig
 from cylc.cycling import PointParsingError
-from cylc.cycling.loader import get_point, standardise_point_string
+from cylc.cycling.loader import (
+    get_interval, get_point, standardise_point_string)
 from cylc.daemonize import daemonize
 from cylc.exceptions import CylcError
 import cylc.flags
@@ -64,8 +65,8 @@ from cylc.task_state import (
 from cylc.templatevars import load_template_vars
 from cylc.version import CYLC_VERSION
 from cylc.wallclock import (
-    get_current_time_string, get_seconds_as_interval_string,
-    get_time_string_from_unix_time as time2str)
+    advance_clock, get_current_time_string, get_seconds_as_interval_string,
+    get_time_string_from_unix_time as time2str, get_unix_time)
 from cylc.profiler import Profiler
 
 
@@ -93,6 +94,7 @@ class Scheduler(object):
     INTERVAL_MAIN_LOOP_QUICK = 0.5
     INTERVAL_STOP_KILL = 10.0
     INTERVAL_STOP_PROCESS_POOL_EMPTY = 0.5
+    INTERVAL_JOB_LOGS_HOUSEKEEP = 60.0
 
     START_MESSAGE_PREFIX = 'Suite starting: '
     START_MESSAGE_TMPL = (
@@ -148,6 +150,7 @@ class Scheduler(object):
             self.options.templatevars, self.options.templatevars_file)
 
         self.run_mode = self.options.run_mode
+        self.is_virtual_clock = False
 
         self.owner = get_user()
         self.host = get_host()
@@ -207,6 +210,7 @@ class Scheduler(object):
         self.previous_profile_point = 0
         self.count = 0
         self.time_next_fs_check = None
+        self.time_next_job_logs_housekeep = None
 
     def start(self):
         """Start the server."""
@@ -321,10 +325,6 @@ conditions; see `cylc conditions`.
             # Configure contact data only after loading UUID string
             self.configure_contact()
             pri_dao.select_suite_template_vars(self._load_template_vars)
-            # Take checkpoint and commit immediately so that checkpoint can be
-            # copied to the public database.
-            pri_dao.take_checkpoints("restart")
-            pri_dao.execute_queued_items()
         else:
             self.configure_contact()
 
@@ -380,6 +380,13 @@ conditions; see `cylc conditions`.
         self.profiler.log_memory("scheduler.py: before load_tasks")
         if self.is_restart:
             self.load_tasks_for_restart()
+            # Take checkpoint (committed immediately to both databases) only
+            # after the task pool is loaded, because the automatic checkpoint
+            # retention may delete the checkpoint we have restarted from.
+            self.suite_db_mgr.checkpoint(
+                "restart",
+                max_auto=(
+                    self.config.cfg['cylc']['automatic checkpoint retention']))
         else:
             self.load_tasks_for_run()
         self.profiler.log_memory("scheduler.py: after load_tasks")
@@ -436,7 +443,19 @@ conditions; see `cylc conditions`.
                 continue
 
     def load_tasks_for_restart(self):
-        """Load tasks for restart."""
+        """Load tasks for restart.
+
+        Log the time taken by each phase of the load.
+        """
+        phase_timings = []
+        phase_start = [time()]
+
+        def _end_phase(name):
+            """Record the elapsed time of a phase of the load."""
+            now = time()
+            phase_timings.append((name, now - phase_start[0]))
+            phase_start[0] = now
+
         self.suite_db_mgr.pri_dao.select_suite_params(
             self._load_suite_params_2, self.options.checkpoint)
         if self.cli_start_point_string:
@@ -446,10 +465,13 @@ conditions; see `cylc conditions`.
             self.options.checkpoint)
         self.suite_db_mgr.pri_dao.select_task_job_run_times(
             self._load_task_run_times)
+        _end_phase("suite params, broadcasts and run times")
         self.suite_db_mgr.pri_dao.select_task_pool_for_restart(
             self.pool.load_db_task_pool_for_restart, self.options.checkpoint)
+        _end_phase("task pool")
         self.suite_db_mgr.pri_dao.select_task_action_timers(
             self.pool.load_db_task_action_timers)
+        _end_phase("task action timers")
         # Re-initialise run directory for user@host for each submitted and
         # running tasks.
         # Note: tasks should all be in the runahead pool at this point.
@@ -466,7 +488,13 @@ conditions; see `cylc conditions`.
                 sleep(1.0)
                 # Remote init is done via process pool
                 self.proc_pool.process()
+        _end_phase("remote init")
+        # Poll commands are batched by user@host, and are run in the
+        # background by the process pool.
         self.command_poll_tasks()
+        _end_phase("poll commands queued")
+        LOG.info("Restart load timings (seconds): %s" % ", ".join(
+            "%s: %.3f" % (name, elapsed) for name, elapsed in phase_timings))
 
     def _load_suite_params_2(self, row_idx, row):
         """Load previous initial/final cycle point."""
@@ -871,7 +899,9 @@ conditions; see `cylc conditions`.
         """Reload suite configuration."""
         LOG.info("Reloading the suite definition.")
         old_tasks = set(self.config.get_task_name_list())
-        self.suite_db_mgr.checkpoint("reload-init")
+        self.suite_db_mgr.checkpoint(
+            "reload-init",
+            self.config.cfg['cylc']['automatic checkpoint retention'])
         self.load_suiterc(is_reload=True)
         self.task_events_mgr.broadcast_mgr.linearized_ancestors = (
             self.config.get_linearized_ancestors())
@@ -902,7 +932,7 @@ conditions; see `cylc conditions`.
         timeout = self._get_events_conf(self.EVENT_TIMEOUT)
         if timeout is None:
             return
-        self.suite_timer_timeout = time() + timeout
+        self.suite_timer_timeout = get_unix_time() + timeout
         if cylc.flags.verbose:
             LOG.info("%s suite timer starts NOW: %s" % (
                 get_seconds_as_interval_string(timeout),
@@ -911,7 +941,7 @@ conditions; see `cylc conditions`.
 
     def set_suite_inactivity_timer(self):
         """Set suite's inactivity timer."""
-        self.suite_inactivity_timeout = time() + (
+        self.suite_inactivity_timeout = get_unix_time() + (
             self._get_events_conf(self.EVENT_INACTIVITY_TIMEOUT)
         )
         if cylc.flags.verbose:
@@ -1027,6 +1057,9 @@ conditions; see `cylc conditions`.
 
         if self.run_mode != self.config.run_mode:
             self.run_mode = self.config.run_mode
+        self.is_virtual_clock = (
+            self.run_mode == 'simulation' and
+            self.config.cfg['cylc']['simulation']['virtual clock'])
 
     def _load_suite_params_1(self, _, row):
         """Load previous initial cycle point or (warm) start cycle point.
@@ -1233,7 +1266,7 @@ conditions; see `cylc conditions`.
 
     def late_tasks_check(self):
         """Report tasks that are never active and are late."""
-        now = time()
+        now = get_unix_time()
         for itask in self.pool.get_tasks():
             if (not itask.is_late and itask.get_late_time() and
                     itask.state.status in TASK_STATUSES_NEVER_ACTIVE and
@@ -1256,6 +1289,26 @@ conditions; see `cylc conditions`.
         if self.run_mode != 'simulation':
             self.task_job_mgr.check_task_jobs(self.suite, self.pool)
 
+    def job_logs_housekeep_check(self):
+        """Housekeep job logs of cycle points outside the retention window."""
+        hk_conf = self.config.cfg['cylc']['job log housekeeping']
+        if hk_conf['retention window'] is None:
+            return
+        now = time()
+        if (self.time_next_job_logs_housekeep is not None and
+                now < self.time_next_job_logs_housekeep):
+            return
+        self.time_next_job_logs_housekeep = (
+            now + self.INTERVAL_JOB_LOGS_HOUSEKEEP)
+        min_point = self.pool.get_min_point()
+        if min_point is None:
+            return
+        self.task_job_mgr.housekeep_job_logs(
+            self.suite,
+            min_point - get_interval(hk_conf['retention window']),
+            hk_conf['action'] == 'archive',
+            hk_conf['maximum cycle points per run'])
+
     def suite_shutdown(self):
         """Determines if the suite can be shutdown yet."""
         if (self.config.cfg['cylc']['abort if any task fails'] and
@@ -1353,6 +1406,7 @@ conditions; see `cylc conditions`.
             self.previous_profile_point = now
             self.profiler.log_memory("scheduler.py: loop #%d: %s" % (
                 self.count, get_current_time_string()))
+            self.profiler.log_memoize_stats()
         self.count += 1
 
     def run(self):
@@ -1364,7 +1418,9 @@ conditions; see `cylc conditions`.
 
             if self.pool.do_reload:
                 self.pool.reload_taskdefs()
-                self.suite_db_mgr.checkpoint("reload-done")
+                self.suite_db_mgr.checkpoint(
+                    "reload-done",
+                    self.config.cfg['cylc']['automatic checkpoint retention'])
                 cylc.flags.iflag = True
 
             self.process_command_queue()
@@ -1398,6 +1454,9 @@ conditions; see `cylc conditions`.
             # Shutdown suite if timeouts have occurred
             self.timeout_check()
 
+            # Archive or delete job logs of old cycle points
+            self.job_logs_housekeep_check()
+
             # Does the suite need to shutdown on task failure?
             self.suite_shutdown()
 
@@ -1412,7 +1471,11 @@ conditions; see `cylc conditions`.
             # (Should probably use quick sleep logic for other queues?)
             elapsed = time() - tinit
             quick_mode = self.proc_pool.is_not_done()
-            if (elapsed >= self.INTERVAL_MAIN_LOOP or
+            if (self.is_virtual_clock and not quick_mode and
+                    self.advance_virtual_clock(has_changes)):
+                # No need to wait in real time for the next event
+                sleep(0.0)
+            elif (elapsed >= self.INTERVAL_MAIN_LOOP or
                     quick_mode and elapsed >= self.INTERVAL_MAIN_LOOP_QUICK):
                 # Main loop has taken quite a bit to get through
                 # Still yield control to other threads by sleep(0.0)
@@ -1425,6 +1488,38 @@ conditions; see `cylc conditions`.
             self.main_loop_intervals.append(time() - tinit)
             # END MAIN LOOP
 
+    def advance_virtual_clock(self, has_changes):
+        """Skip the virtual clock ahead to the time of the next event.
+
+        Simulation mode with a virtual clock only. If nothing has happened in
+        this iteration of the main loop, and nothing is waiting to be
+        processed, nothing else can happen until the next timed event, e.g.
+        simulated job completion, clock trigger or retry delay, so advance the
+        clock to that time.
+
+        Return True if the main loop should carry on without sleeping.
+
+        """
+        if (has_changes or self.task_events_mgr.pflag or
+                not self.message_queue.empty() or
+                not self.command_queue.empty()):
+            return True
+        now = get_unix_time()
+        event_times = [
+            self.pool.get_next_event_time(now), self.stop_clock_time]
+        if self.suite_timer_active:
+            event_times.append(self.suite_timer_timeout)
+        if (self._get_events_conf(self.EVENT_INACTIVITY_TIMEOUT) and
+                not self.already_inactive):
+            event_times.append(self.suite_inactivity_timeout)
+        event_times = [
+            event_time for event_time in event_times
+            if event_time is not None and event_time > now]
+        if not event_times:
+            return False
+        advance_clock(min(event_times) - now)
+        return True
+
     def update_state_summary(self):
         """Update state summary, e.g. for GUI."""
         self.state_summary_mgr.update(self)
@@ -1443,7 +1538,7 @@ conditions; see `cylc conditions`.
         if (self._get_events_conf(self.EVENT_TIMEOUT) is None or
                 self.already_timed_out or not self.is_stalled):
             return
-        if time() > self.suite_timer_timeout:
+        if get_unix_time() > self.suite_timer_timeout:
             self.already_timed_out = True
             message = 'suite timed out after %s' % (
                 get_seconds_as_interval_string(
@@ -1458,7 +1553,7 @@ conditions; see `cylc conditions`.
         """Check if suite is inactive or not."""
         if self.already_inactive:
             return
-        if time() > self.suite_inactivity_timeout:
+        if get_unix_time() > self.suite_inactivity_timeout:
             self.already_inactive = True
             message = 'suite timed out after inactivity for %s' % (
                 get_seconds_as_interval_string(
@@ -1501,7 +1596,7 @@ conditions; see `cylc conditions`.
 
         broadcast_mgr = self.task_events_mgr.broadcast_mgr
         broadcast_mgr.add_ext_triggers(self.ext_trigger_queue)
-        now = time()
+        now = get_unix_time()
         for itask in self.pool.get_tasks():
             # External trigger matching and task expiry must be done
             # regardless, so they need to be in separate "if ..." blocks.
@@ -1697,7 +1792,8 @@ conditions; see `cylc conditions`.
 
     def stop_clock_done(self):
         """Return True if wall clock stop time reached."""
-        if self.stop_clock_time is not None and time() > self.stop_clock_time:
+        if (self.stop_clock_time is not None and
+                get_unix_time() > self.stop_clock_time):
             time_point = (
                 isodatetime.data.get_timepoint_from_seconds_since_unix_epoch(
                     self.stop_clock_time
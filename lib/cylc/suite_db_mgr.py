@@ -84,9 +84,14 @@ class SuiteDatabaseManager(object):
             self.TABLE_TASK_TIMEOUT_TIMERS: []}
         self.db_updates_map = {}
 
-    def checkpoint(self, name):
-        """Checkpoint the task pool, etc."""
-        return self.pri_dao.take_checkpoints(name, other_daos=[self.pub_dao])
+    def checkpoint(self, name, max_auto=None):
+        """Checkpoint the task pool, etc.
+
+        If max_auto is specified, only keep this number of the most recent
+        automatic checkpoints.
+        """
+        return self.pri_dao.take_checkpoints(
+            name, other_daos=[self.pub_dao], max_auto=max_auto)
 
     def copy_pri_to_pub(self):
         """Copy content of primary database file to public database file.
@@ -25,7 +25,9 @@ import sys
 import glob
 import logging
 import logging.handlers
-from time import time
+from Queue import Queue, Empty, Full
+from threading import RLock, Thread
+from time import sleep, time
 import cylc.flags
 from cylc.cfgspec.glbl_cfg import glbl_cfg
 from cylc.wallclock import (get_time_string_from_unix_time,
@@ -43,6 +45,14 @@ SUITE_LOG_OPTS = {
 }
 
 LOG_DELIMITER = '.'
+# Size of blocks read backwards by SuiteLog.get_lines.
+TAIL_BLOCK_SIZE = 4096
+# Maximum number of queued log records written between flushes.
+QUEUE_BATCH_SIZE = 1000
+# Seconds to wait for more queued log records before writing a batch.
+QUEUE_BATCH_DELAY = 0.01
+# Types of log record arguments that are safe to format in the writer thread.
+QUEUE_LAZY_ARG_TYPES = (basestring, int, long, float, bool, type(None))
 
 
 def get_logs(directory, basename, absolute_path=True):
@@ -100,6 +110,7 @@ class RollingFileHandler(logging.handlers.BaseRotatingHandler):
         self.archive_length = archive_length
         self.syncronised_group = None
         self.file_stamp_fcn = file_stamp_fcn
+        self.defer_flush = False
 
     def _gen_file_stamp(self):
         """Use time or self.file_stamp_fcn to generate file name."""
@@ -108,10 +119,29 @@ class RollingFileHandler(logging.handlers.BaseRotatingHandler):
         else:
             return ('%f' % time()).replace('.', '')
 
+    def start_batch(self):
+        """Defer flushes of the stream until end_batch is called."""
+        if self.stream is not None:
+            # Other writers may have appended to the file.
+            self.stream.seek(0, 2)
+        self.defer_flush = True
+
+    def end_batch(self):
+        """Flush the stream, and stop deferring flushes."""
+        self.defer_flush = False
+        self.flush()
+
+    def flush(self):
+        """Flush the stream, unless flushes are deferred."""
+        if not self.defer_flush:
+            logging.handlers.BaseRotatingHandler.flush(self)
+
     def notifyRollover(self):
         """Notify this RollingFilehandler that its log file has been rolled.
         To be called on all other RollingFilehandlers if multiple
         RollingFilehandlers are working with the same file and one rolls."""
+        if self.stream is not None:
+            self.stream.flush()  # in case flushes are deferred
         self.stream = self._open()
 
     def doRollover(self, trigger=True, stamp=None):
@@ -162,7 +192,9 @@ class RollingFileHandler(logging.handlers.BaseRotatingHandler):
             self.stream = self._open()
         if self.maxBytes > 0:  # are we rolling over?
             msg = "%s\n" % self.format(record)
-            self.stream.seek(0, 2)  # due to non-posix-compliant Windows
+            if not self.defer_flush:
+                # Seek flushes, position is at end in a batch anyway.
+                self.stream.seek(0, 2)  # due to non-posix-compliant Windows
             if self.stream.tell() + len(msg) >= self.maxBytes:
                 return 1
         return 0
@@ -241,6 +273,155 @@ class RollingFileHandlerGroup(object):
         return True
 
 
+class LogQueueWriter(Thread):
+    """Write log records in the background for QueueHandler instances.
+
+    Records are written in batches of up to QUEUE_BATCH_SIZE, with a single
+    flush per log file per batch (or per switch between handlers writing to
+    the same file, to keep records in order). All handlers are driven by this
+    thread, so synchronised rollovers are never concurrent with writes.
+
+    Args:
+        maxsize (int): Maximum number of records in the queue.
+
+    """
+
+    def __init__(self, maxsize):
+        Thread.__init__(self, name="LogQueueWriter")
+        self.daemon = True
+        self.queue = Queue(maxsize)
+        self.lock = RLock()
+        self.closed = False
+
+    def run(self):
+        """Write queued records until a None item is queued by close."""
+        while True:
+            items = [self.queue.get()]
+            # Let more records arrive, rather than compete with the producers.
+            sleep(QUEUE_BATCH_DELAY)
+            try:
+                while len(items) < QUEUE_BATCH_SIZE:
+                    items.append(self.queue.get_nowait())
+            except Empty:
+                pass
+            with self.lock:
+                batch_handlers = {}
+                for item in items:
+                    if item is not None:
+                        item[0].write(item[1], batch_handlers)
+                for handler in batch_handlers.values():
+                    handler.end_batch()
+                # Records are only visible to readers of the files now.
+                now = time()
+                for item in items:
+                    if item is not None:
+                        item[0].update_time = now
+            for _ in items:
+                self.queue.task_done()
+            if None in items:
+                return
+
+    def drain(self):
+        """Wait for queued records to be written."""
+        if self.is_alive():
+            self.queue.join()
+
+    def close(self):
+        """Write remaining queued records and stop the thread."""
+        if self.closed:
+            return
+        self.closed = True
+        if self.is_alive():
+            self.queue.put(None)
+            self.join()
+
+
+class QueueHandler(logging.Handler):
+    """Queue log records for the handlers of a logger to a LogQueueWriter.
+
+    Formatting of simple record arguments is left to the writer thread. Other
+    arguments, which may change before the record is written, and exception
+    information are formatted on the caller's side.
+
+    If the queue is full, records below WARNING are dropped and counted,
+    other records wait for space in the queue.
+
+    The update_time attribute is set by the writer thread, once a batch with
+    records of this handler has been written and flushed.
+
+    Args:
+        writer (LogQueueWriter): The writer to queue records to.
+        handlers (list): The handlers to write records to.
+
+    """
+
+    def __init__(self, writer, handlers):
+        logging.Handler.__init__(self)
+        self.writer = writer
+        self.handlers = handlers
+        self.n_dropped = 0
+        self.update_time = time()
+
+    def emit(self, record):
+        """Queue record, dropping or waiting if the queue is full."""
+        if record.args and (
+                isinstance(record.args, dict) or
+                not all(isinstance(arg, QUEUE_LAZY_ARG_TYPES)
+                        for arg in record.args)):
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(
+                record.exc_info)
+            record.exc_info = None
+        if record.levelno >= logging.WARNING:
+            self.writer.queue.put((self, record))
+            return
+        try:
+            self.writer.queue.put_nowait((self, record))
+        except Full:
+            self.n_dropped += 1
+
+    def write(self, record, batch_handlers):
+        """Write record to handlers, in the writer thread.
+
+        Keep the RollingFileHandler currently deferring flushes to each file
+        in batch_handlers {path: handler}, so the writer can flush them at the
+        end of the batch.
+        """
+        if self.n_dropped:
+            n_dropped = self.n_dropped
+            self.n_dropped -= n_dropped
+            self.write(
+                logging.makeLogRecord({
+                    'name': record.name,
+                    'levelno': logging.WARNING,
+                    'levelname': logging.getLevelName(logging.WARNING),
+                    'msg': '%d log message(s) dropped, log queue full',
+                    'args': (n_dropped,)}),
+                batch_handlers)
+        for handler in self.handlers:
+            if record.levelno < handler.level:
+                continue
+            if isinstance(handler, RollingFileHandler):
+                batch_handler = batch_handlers.get(handler.baseFilename)
+                if batch_handler is not handler:
+                    if batch_handler is not None:
+                        batch_handler.end_batch()
+                    handler.start_batch()
+                    batch_handlers[handler.baseFilename] = handler
+            handler.handle(record)
+
+    def flush(self):
+        """Wait for queued records to be written."""
+        self.writer.drain()
+
+    def close(self):
+        """Write remaining queued records and stop the writer."""
+        self.writer.close()
+        logging.Handler.close(self)
+
+
 class SuiteLog(object):
     """Provides logging functionality for a cylc suite."""
     ALL_LOGS = [SUITE_LOG, SUITE_OUT, SUITE_ERR]
@@ -260,11 +441,14 @@ class SuiteLog(object):
                 ['suite logging', 'roll over at start-up'])
             self.archive_length = glbl_cfg().get(
                 ['suite logging', 'rolling archive length'])
+            self.queue_size = glbl_cfg().get(
+                ['suite logging', 'queue size'])
         else:
             self.is_test = True
             self.max_bytes = test_params['max_bytes']
             self.roll_at_startup = test_params['roll_at_startup']
             self.archive_length = 4
+            self.queue_size = test_params.get('queue_size', 0)
 
         # Log paths.
         if test_params:
@@ -286,6 +470,12 @@ class SuiteLog(object):
         # File streams
         self.streams = []
 
+        # Background writer of the logs, if queue_size > 0.
+        self.writer = None
+
+        # Cache for get_lines: {path: ((size, mtime, inode), {key: content})}
+        self.tail_cache = {}
+
         SuiteLog.__INSTANCE = self
 
     @classmethod
@@ -306,27 +496,76 @@ class SuiteLog(object):
         return glbl_cfg().get_derived_host_item(suite, 'suite log directory')
 
     def get_lines(self, log, prev_size, max_lines=10):
-        """Read content from log file up to max_lines from prev_size."""
+        """Read content from log file up to max_lines from prev_size.
+
+        Only the tail of the file is read, backwards in blocks of
+        TAIL_BLOCK_SIZE bytes. Results are cached against the size, mtime and
+        inode of the file, so that clients polling with the same prev_size
+        share a single read.
+        """
         if prev_size is None:
             prev_size = 0
         else:
             prev_size = int(prev_size)
+        max_lines = int(max_lines)
         path = self.get_log_path(log)
         try:
-            size = os.path.getsize(path)
+            stat = os.stat(path)
         except (IOError, OSError):
-            size = 0
+            return "", prev_size
+        size = stat.st_size
         if size == prev_size:
             return "", prev_size
+        if size < prev_size:
+            # Log rolled or truncated, nothing new beyond prev_size.
+            return "", size
+        stat_key = (size, stat.st_mtime, stat.st_ino)
+        cache_stat_key, results = self.tail_cache.get(path, (None, None))
+        if cache_stat_key != stat_key:
+            results = {}
+            self.tail_cache[path] = (stat_key, results)
         try:
-            handle = open(path, "r")
-            handle.seek(prev_size)
-            new_content = handle.read()
-            handle.close()
+            return results[(prev_size, max_lines)], size
+        except KeyError:
+            pass
+        try:
+            content = self._read_tail(path, prev_size, size, max_lines)
         except (IOError, OSError):
             return "", prev_size
-        new_content_lines = new_content.splitlines()[-int(max_lines):]
-        return "\n".join(new_content_lines), size
+        results[(prev_size, max_lines)] = content
+        return content, size
+
+    @staticmethod
+    def _read_tail(path, prev_size, size, max_lines):
+        """Return last max_lines lines of path between prev_size and size.
+
+        Read backwards from size in blocks until more than max_lines lines
+        have been found, or until prev_size is reached.
+        """
+        if max_lines <= 0:
+            # Compatible with "splitlines()[-0:]", i.e. all lines.
+            max_lines = size
+        blocks = []
+        n_breaks = 0
+        pos = size
+        handle = open(path, "r")
+        try:
+            while pos > prev_size:
+                block_size = min(TAIL_BLOCK_SIZE, pos - prev_size)
+                pos -= block_size
+                handle.seek(pos)
+                block = handle.read(block_size)
+                blocks.insert(0, block)
+                # Over-estimates for "\r\n", confirmed by splitlines below.
+                n_breaks += block.count("\n") + block.count("\r")
+                if n_breaks > max_lines:
+                    lines = "".join(blocks).splitlines()
+                    if len(lines) > max_lines:
+                        # The first (possibly partial) line is discarded.
+                        return "\n".join(lines[-max_lines:])
+        finally:
+            handle.close()
+        return "\n".join("".join(blocks).splitlines()[-max_lines:])
 
     def get_log(self, log):
         """Return the requested logger."""
@@ -360,8 +599,15 @@ class SuiteLog(object):
             self._create_logs(detach, log_logger_level=log_logger_level)
             self._register_syncronised_logs()
             self._group.roll_all()
+            if self.queue_size > 0:
+                self._queue_logs()
         elif self.roll_at_startup:
-            self._group.roll_all()
+            if self.writer is None:
+                self._group.roll_all()
+            else:
+                self.writer.drain()
+                with self.writer.lock:
+                    self._group.roll_all()
 
     def _create_logs(self, detach, log_logger_level=None):
         """Sets up the log files and their file handlers."""
@@ -479,6 +725,16 @@ class SuiteLog(object):
         for stream in self.streams:
             self._group.add_stream(stream)
 
+    def _queue_logs(self):
+        """Move writes of the logs to a background LogQueueWriter."""
+        self.writer = LogQueueWriter(self.queue_size)
+        for log in (self.loggers[log_name] for log_name in self.ALL_LOGS):
+            handlers = list(log.handlers)
+            for handler in handlers:
+                log.removeHandler(handler)
+            log.addHandler(QueueHandler(self.writer, handlers))
+        self.writer.start()
+
 
 class ISO8601DateTimeFormatter(logging.Formatter):
     """Format date/times with the correct time zone."""
@@ -514,9 +770,23 @@ class STDLogger(object):
             raise Exception('Unknown logger provided "{0}"'.format(log))
         self.log_ = log
         self.logger = logging.getLogger(log)
-        self.update_time = time()
+        self._update_time = time()
+
+    @property
+    def update_time(self):
+        """Return the time the log was last updated.
+
+        If records are queued to a LogQueueWriter, return the time the last
+        of them were written, rather than the time they were logged.
+        """
+        for handler in self.logger.handlers:
+            if isinstance(handler, QueueHandler):
+                return handler.update_time
+        return self._update_time
 
     def log(self, level, *args, **kwargs):
+        if self.logger.handlers and not self.logger.isEnabledFor(level):
+            return
         try:
             itask = kwargs.pop("itask")
         except KeyError:
@@ -527,19 +797,21 @@ class STDLogger(object):
             except AttributeError:
                 args = ("[%s] -%s" % (itask, args[0]),) + args[1:]
             args = tuple(args)
-        self.update_time = time()
+        self._update_time = time()
         if self.logger.handlers:
             # If this logger has file handlers write out to it.
             self.logger.log(level, *args, **kwargs)
         else:
             # No file handlers, write out to stdout/stderr.
+            msg = str(args[0])
+            if args[1:]:
+                msg %= args[1:]
             msg = (get_current_time_string() + ' ' +
-                   logging._levelNames[level] + ' - ' +
-                   str(args[0]),) + tuple(*args[1:])
+                   logging._levelNames[level] + ' - ' + msg)
             if self.log_ in [SUITE_OUT, SUITE_LOG]:
-                print(*msg)
+                print(msg)
             else:
-                print(*msg, file=sys.stderr)
+                print(msg, file=sys.stderr)
 
     def debug(self, msg, *args, **kwargs):
         self.log(logging.DEBUG, msg, *args, **kwargs)
@@ -572,12 +844,13 @@ ERR = STDLogger(SUITE_ERR)  # Log to suite if defined || print err.
 LOG = STDLogger(SUITE_LOG)  # Log to suite if defined || print out.
 
 
-def test_log_rolling(ldir):
+def test_log_rolling(ldir, queue_size=0):
     """Generates a collection of log files in the provided directory to test
     rolling functionality."""
     # Setup test logging.
     suite_log = SuiteLog.get_inst(None, {'ldir': ldir, 'max_bytes': 500,
-                                         'roll_at_startup': True})
+                                         'roll_at_startup': True,
+                                         'queue_size': queue_size})
 
     # Populate logs.
     suite_log.pimp()
@@ -636,10 +909,97 @@ def test_housekeeping(ldir):
         log.info('log-%02d' % num)
 
 
+def test_get_lines(ldir):
+    """Check SuiteLog.get_lines against splitlines of the whole log."""
+    suite_log = SuiteLog.get_inst(None, {'ldir': ldir, 'max_bytes': 0,
+                                         'roll_at_startup': True})
+    suite_log.pimp()
+    path = suite_log.get_log_path(SUITE_LOG)
+
+    def write_log(content):
+        """Replace the content of the log file."""
+        with open(path, 'wb') as handle:
+            handle.write(content)
+        suite_log.tail_cache.clear()
+
+    def check(content, prev_size, max_lines):
+        """Compare get_lines with the expected result."""
+        expected = "\n".join(
+            content[prev_size:].splitlines()[-max_lines:])
+        actual = suite_log.get_lines(SUITE_LOG, prev_size, max_lines)
+        if actual != (expected, len(content)):
+            raise AssertionError('prev_size=%d, max_lines=%d: %r != %r' % (
+                prev_size, max_lines, actual, (expected, len(content))))
+
+    # "\r\n" split across a block boundary, with the "\n" at the start of
+    # the last block.
+    lines = "".join("line-%04d\r\n" % i for i in range(372))
+    last_block = "\n" + "x" * (TAIL_BLOCK_SIZE - 3 - len(lines)) + "\r\n"
+    last_block += lines
+    content = "head-1\r\nhead-2\r" + last_block
+    write_log(content)
+    # prev_size at the start of the log, mid-line, mid "\r\n" and at the
+    # block boundary; max_lines=0 for all lines.
+    for prev_size in [0, 3, len("head-1\r"), len(content) - TAIL_BLOCK_SIZE]:
+        for max_lines in [0, 1, 2, 10, 372, 373, 374, 1000]:
+            check(content, prev_size, max_lines)
+
+    # Unterminated last line, and lines over several blocks.
+    content = "".join("%05d\n" % i for i in range(3 * TAIL_BLOCK_SIZE)) + "ab"
+    write_log(content)
+    for prev_size in [0, 10, len(content) - 1]:
+        for max_lines in [0, 1, 5, TAIL_BLOCK_SIZE, 4 * TAIL_BLOCK_SIZE]:
+            check(content, prev_size, max_lines)
+
+    # No change since prev_size.
+    if suite_log.get_lines(SUITE_LOG, len(content)) != ("", len(content)):
+        raise AssertionError('no change')
+
+    # Rolled or truncated log: nothing new, size is reset.
+    write_log("new\n")
+    if suite_log.get_lines(SUITE_LOG, len(content)) != ("", 4):
+        raise AssertionError('truncated')
+    check("new\n", 0, 10)
+
+    # Missing log: nothing new, prev_size is kept.
+    os.unlink(path)
+    if suite_log.get_lines(SUITE_LOG, 4) != ("", 4):
+        raise AssertionError('missing')
+
+
+def test_update_time(ldir):
+    """Check that queued records only update the log when written."""
+    suite_log = SuiteLog.get_inst(None, {'ldir': ldir, 'max_bytes': 0,
+                                         'roll_at_startup': True,
+                                         'queue_size': 1000})
+    suite_log.pimp()
+    err = STDLogger(SUITE_ERR)
+    start_time = time()
+    # Hold the writer, so the record stays in the queue.
+    with suite_log.writer.lock:
+        err.error('err-queued')
+        sleep(2 * QUEUE_BATCH_DELAY)
+        if err.update_time >= start_time:
+            raise AssertionError('updated before the record is written')
+    suite_log.writer.drain()
+    if err.update_time < start_time:
+        raise AssertionError('not updated after the record is written')
+    content = suite_log.get_lines(SUITE_ERR, 0)[0]
+    if 'err-queued' not in content:
+        raise AssertionError('record not in log: %r' % content)
+
+
 if __name__ == '__main__':
     if sys.argv[2] == 'test-roll':
         test_log_rolling(os.path.join(sys.argv[1], 'test_roll'))
+    elif sys.argv[2] == 'test-roll-queued':
+        test_log_rolling(os.path.join(sys.argv[1], 'test_roll_queued'),
+                         queue_size=1000)
     elif sys.argv[2] == 'test-back-compat':
         test_back_compat(os.path.join(sys.argv[1], 'test_back_compat'))
     elif sys.argv[2] == 'test-housekeep':
         test_housekeeping(os.path.join(sys.argv[1], 'test_housekeep'))
+    elif sys.argv[2] == 'test-get-lines':
+        test_get_lines(os.path.join(sys.argv[1], 'test_get_lines'))
+    elif sys.argv[2] == 'test-update-time':
+        test_update_time(os.path.join(sys.argv[1], 'test_update_time'))
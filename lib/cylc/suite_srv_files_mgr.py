@@ -41,6 +41,7 @@ class SuiteSrvFilesManager(object):
 
     DELIM = "/"
     DIR_BASE_AUTH = "auth"
+    DIR_BASE_PROC_CACHE = "proc-cache"
     DIR_BASE_SRV = ".service"
     FILE_BASE_CONTACT = "contact"
     FILE_BASE_CONTACT2 = "contact2"
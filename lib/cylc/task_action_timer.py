@@ -18,10 +18,9 @@
 
 """Timer for task actions."""
 
-from time import time
-
 from cylc.wallclock import (
-    get_seconds_as_interval_string, get_time_string_from_unix_time)
+    get_seconds_as_interval_string, get_time_string_from_unix_time,
+    get_unix_time)
 
 
 class TaskActionTimer(object):
@@ -52,7 +51,7 @@ class TaskActionTimer(object):
         if self.timeout is None:
             return False
         if now is None:
-            now = time()
+            now = get_unix_time()
         return now > self.timeout
 
     def is_timeout_set(self):
@@ -72,7 +71,7 @@ class TaskActionTimer(object):
             if not no_exhaust:
                 self.delay = None
         if self.delay is not None:
-            self.timeout = time() + self.delay
+            self.timeout = get_unix_time() + self.delay
             self.num += 1
         return self.delay
 
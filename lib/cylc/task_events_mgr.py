@@ -32,7 +32,6 @@ from logging import getLevelName, CRITICAL, ERROR, WARNING, INFO, DEBUG
 import os
 from pipes import quote
 import shlex
-from time import time
 import traceback
 
 from parsec.config import ItemNotFoundError
@@ -55,7 +54,7 @@ from cylc.task_state import (
 from cylc.task_outputs import (
     TASK_OUTPUT_SUBMITTED, TASK_OUTPUT_STARTED, TASK_OUTPUT_SUCCEEDED,
     TASK_OUTPUT_FAILED, TASK_OUTPUT_SUBMIT_FAILED, TASK_OUTPUT_EXPIRED)
-from cylc.wallclock import get_current_time_string
+from cylc.wallclock import get_current_time_string, get_unix_time
 
 
 CustomTaskEventHandlerContext = namedtuple(
@@ -170,7 +169,7 @@ class TaskEventsManager(object):
         schd_ctx is an instance of "Schduler" in "cylc.scheduler".
         """
         ctx_groups = {}
-        now = time()
+        now = get_unix_time()
         for id_key, timer in self.event_timers.copy().items():
             key1, point, name, submit_num = id_key
             if timer.is_waiting:
@@ -189,10 +188,9 @@ class TaskEventsManager(object):
                 elif timer.delay:
                     tmpl = "%s/%s/%02d %s will run after %s (after %s)"
                 if tmpl:
-                    LOG.debug(tmpl % (
-                        point, name, submit_num, key1,
-                        timer.delay_as_seconds(),
-                        timer.timeout_as_str()))
+                    LOG.debug(
+                        tmpl, point, name, submit_num, key1,
+                        timer.delay_as_seconds(), timer.timeout_as_str())
             # Ready to run?
             if not timer.is_delay_done() or (
                 # Avoid flooding user's mail box with mail notification.
@@ -360,7 +358,7 @@ class TaskEventsManager(object):
             # Note that all messages are logged already at the top.
             # No state change.
             LOG.debug(
-                '(current:%s) unhandled: %s' % (itask.state.status, message),
+                '(current:%s) unhandled: %s', itask.state.status, message,
                 itask=itask)
             if severity in [CRITICAL, ERROR, WARNING, INFO, DEBUG]:
                 severity = getLevelName(severity)
@@ -868,7 +866,7 @@ class TaskEventsManager(object):
                 # Nothing substituted, assume classic interface
                 cmd = "%s '%s' '%s' '%s' '%s'" % (
                     handler, event, self.suite, itask.identity, message)
-            LOG.debug("Queueing %s handler: %s" % (event, cmd), itask=itask)
+            LOG.debug("Queueing %s handler: %s", event, cmd, itask=itask)
             self.event_timers[id_key] = (
                 TaskActionTimer(
                     CustomTaskEventHandlerContext(
@@ -18,6 +18,9 @@
 """Define task job log filenames and option names."""
 
 import os
+from shutil import rmtree
+import sys
+import tarfile
 from cylc.cfgspec.glbl_cfg import glbl_cfg
 
 # Task job log filenames.
@@ -26,8 +29,11 @@ JOB_LOG_OUT = "job.out"
 JOB_LOG_ERR = "job.err"
 JOB_LOG_ACTIVITY = "job-activity.log"
 JOB_LOG_STATUS = "job.status"
+JOB_LOG_STATUS_JOURNAL = "job.status.journal"  # In the cycle point directory.
 JOB_LOG_XTRACE = "job.xtrace"  # Note this is also defined in job.sh.
 JOB_LOG_DIFF = "job-edit.diff"
+# Extension of archives of the job logs of cycle points.
+JOB_LOG_ARCHIVE_EXT = ".tar.gz"
 
 JOB_LOG_OPTS = {
     'j': JOB_LOG_JOB,
@@ -71,3 +77,82 @@ def get_task_job_activity_log(suite, point, name, submit_num=None):
 def get_task_job_job_log(suite, point, name, submit_num=None):
     """Shorthand for get_task_job_log(..., suffix="job")."""
     return get_task_job_log(suite, point, name, submit_num, JOB_LOG_JOB)
+
+
+def get_task_job_status_journal(job_log_root, point):
+    """Return the path of the job status journal of a cycle point."""
+    return os.path.join(job_log_root, str(point), JOB_LOG_STATUS_JOURNAL)
+
+
+def append_task_job_status_journal(st_file_path, text):
+    """Append text written to a job status file to the job status journal.
+
+    st_file_path -- SUITE_RUN_DIR/log/job/CYCLE/TASK/SUBMIT/job.status
+    text -- "KEY=VALUE" lines appended to the job status file.
+
+    The job status journal of a cycle point has the lines written to the job
+    status files of its jobs, each prefixed with "CYCLE/TASK/SUBMIT|", so
+    that the status of many jobs can be read at once. It is only written if
+    the "job status journal" setting of the host is True. The journal is
+    removed on a write error, so that it is not trusted with missing lines.
+
+    """
+    if not text or not glbl_cfg().get_host_item('job status journal'):
+        return
+    job_log_root, point, name, submit_num = os.path.dirname(
+        st_file_path).rsplit(os.sep, 3)
+    if submit_num == NN:
+        return
+    prefix = os.path.join(point, name, submit_num) + "|"
+    journal_path = get_task_job_status_journal(job_log_root, point)
+    try:
+        handle = open(journal_path, "ab")
+        handle.write("".join(
+            prefix + line + "\n" for line in text.splitlines()))
+        handle.close()
+    except IOError:
+        try:
+            os.unlink(journal_path)
+        except OSError:
+            pass
+
+
+def housekeep_task_job_logs(job_log_root, points, is_archive=False):
+    """Archive or delete the job logs of cycle points.
+
+    job_log_root -- SUITE_RUN_DIR/log/job
+    points -- names of cycle point directories under job_log_root.
+    is_archive -- if True, archive each CYCLE directory to
+        "CYCLE.tar.gz" (or "CYCLE.N.tar.gz" if it exists already, e.g. if
+        a task of an old cycle point has been re-run) before deleting it.
+
+    Missing directories are ignored, so it is safe to run again. Return the
+    number of cycle points that could not be housekept (with errors written
+    to STDERR).
+
+    """
+    n_bad = 0
+    for point in points:
+        point_dir = os.path.join(job_log_root, point)
+        if not os.path.isdir(point_dir):
+            continue
+        try:
+            if is_archive:
+                archive_path = point_dir + JOB_LOG_ARCHIVE_EXT
+                num = 0
+                while os.path.exists(archive_path):
+                    num += 1
+                    archive_path = "%s.%d%s" % (
+                        point_dir, num, JOB_LOG_ARCHIVE_EXT)
+                # Write to a temporary name, so that an interrupted archive
+                # is never mistaken for a complete one.
+                tmp_path = archive_path + ".tmp"
+                archive = tarfile.open(tmp_path, "w:gz")
+                archive.add(point_dir, point)
+                archive.close()
+                os.rename(tmp_path, archive_path)
+            rmtree(point_dir)
+        except (IOError, OSError, tarfile.TarError) as exc:
+            sys.stderr.write("%s: %s\n" % (point_dir, exc))
+            n_bad += 1
+    return n_bad
@@ -29,13 +29,13 @@ This module provides logic to:
 from logging import CRITICAL, INFO, WARNING
 import os
 from shutil import rmtree
-from time import time
 import traceback
 
 from parsec.util import pdeepcopy, poverride
 
 from cylc.batch_sys_manager import BatchSysManager
 from cylc.cfgspec.glbl_cfg import glbl_cfg
+from cylc.cycling.loader import get_point
 from cylc.envvar import expandvars
 import cylc.flags
 from cylc.hostuserutil import is_remote_host, is_remote_user
@@ -59,7 +59,7 @@ from cylc.task_state import (
     TASK_STATUS_RUNNING, TASK_STATUS_SUCCEEDED, TASK_STATUS_FAILED,
     TASK_STATUS_SUBMIT_RETRYING, TASK_STATUS_RETRYING)
 from cylc.wallclock import (
-    get_current_time_string, get_seconds_as_interval_string)
+    get_current_time_string, get_seconds_as_interval_string, get_unix_time)
 
 
 class TaskJobManager(object):
@@ -69,14 +69,17 @@ class TaskJobManager(object):
     * Submit task jobs.
     * Poll task jobs.
     * Kill task jobs.
+    * Housekeep the job logs of old cycle points.
     * Set up the directory structure on job hosts.
     * Install suite communicate client files on job hosts.
     * Remove suite contact files on job hosts.
     """
 
+    JOBS_HOUSEKEEP = 'jobs-housekeep'
     JOBS_KILL = 'jobs-kill'
     JOBS_POLL = 'jobs-poll'
     JOBS_SUBMIT = SuiteProcPool.JOBS_SUBMIT
+    JOB_CMD_BATCH_SIZE = 100
     REMOTE_SELECT_MSG = 'waiting for remote host selection'
     REMOTE_INIT_MSG = 'remote host initialising'
     KEY_EXECUTE_TIME_LIMIT = 'execution_time_limit'
@@ -91,13 +94,18 @@ class TaskJobManager(object):
         self.suite_srv_files_mgr = suite_srv_files_mgr
         self.task_remote_mgr = TaskRemoteMgr(
             suite, proc_pool, suite_srv_files_mgr)
+        # Number of job log housekeeping commands still running
+        self.n_housekeep_cmds = 0
+        # Local job log housekeeping commands waiting for the remote ones
+        self.housekeep_local_cmds = []
+        self.is_housekeep_remote_ok = True
 
     def check_task_jobs(self, suite, task_pool):
         """Check submission and execution timeout and polling timers.
 
         Poll tasks that have timed out and/or have reached next polling time.
         """
-        now = time()
+        now = get_unix_time()
         poll_tasks = set()
         for itask in task_pool.get_tasks():
             if (self._check_timeout(itask, now) or
@@ -106,6 +114,77 @@ class TaskJobManager(object):
         if poll_tasks:
             self.poll_task_jobs(suite, poll_tasks)
 
+    def housekeep_job_logs(self, suite, point_limit, is_archive=False,
+                           max_points=None):
+        """Archive or delete job logs of cycle points before point_limit.
+
+        Housekeep at most max_points of the oldest cycle points at a time, and
+        do nothing if the commands of the previous call are still running, so
+        that a large backlog is cleared incrementally in the background.
+
+        For each remote user@host that ran jobs of these cycle points
+        (according to the suite DB), put a single command for all the cycle
+        points to the process pool. Remote user@hosts are found via the local
+        cycle point directories, so only when all the remote commands succeed,
+        put a command for each cycle point on the suite host, so that they can
+        run in parallel. If a remote command fails, keep the local directories
+        so that the next call retries it.
+
+        """
+        if self.n_housekeep_cmds:
+            return
+        job_log_root = glbl_cfg().get_derived_host_item(
+            suite, "suite job log directory")
+        try:
+            names = os.listdir(job_log_root)
+        except OSError:
+            return
+        points = []
+        for name in names:
+            if not os.path.isdir(os.path.join(job_log_root, name)):
+                continue
+            try:
+                point = get_point(name).standardise()
+            except ValueError:
+                continue
+            if point < point_limit:
+                points.append((point, name))
+        if not points:
+            return
+        names = [name for _, name in sorted(points)[:max_points]]
+        cmd = ["cylc", self.JOBS_HOUSEKEEP]
+        if cylc.flags.debug:
+            cmd.append("--debug")
+        if is_archive:
+            cmd.append("--archive")
+        local_cmds = [cmd + ["--", job_log_root, name] for name in names]
+        self.housekeep_local_cmds = []
+        self.is_housekeep_remote_ok = True
+        for user_at_host in sorted(
+                self.suite_db_mgr.pri_dao.select_task_job_hosts(names)):
+            if "@" in user_at_host:
+                owner, host = user_at_host.split("@", 1)
+            else:
+                owner, host = None, user_at_host
+            if not is_remote_host(host) and not is_remote_user(owner):
+                continue
+            remote_cmd = list(cmd)
+            if is_remote_host(host):
+                remote_cmd.append("--host=%s" % (host))
+            if is_remote_user(owner):
+                remote_cmd.append("--user=%s" % (owner))
+            remote_cmd.append("--")
+            remote_cmd.append(glbl_cfg().get_derived_host_item(
+                suite, "suite job log directory", host, owner))
+            self.n_housekeep_cmds += 1
+            self.proc_pool.put_command(
+                SuiteProcContext(self.JOBS_HOUSEKEEP, remote_cmd + names),
+                self._housekeep_job_logs_remote_callback)
+        if self.n_housekeep_cmds:
+            self.housekeep_local_cmds = local_cmds
+        else:
+            self._put_housekeep_local_cmds(local_cmds)
+
     def kill_task_jobs(self, suite, itasks):
         """Kill jobs of active tasks, and hold the tasks.
 
@@ -144,7 +223,7 @@ class TaskJobManager(object):
                 poll_me.append(itask)
             else:
                 LOG.debug("skipping %s: not pollable, "
-                          "or skipping 'succeeded' tasks" % itask.identity)
+                          "or skipping 'succeeded' tasks", itask.identity)
         if poll_me:
             if msg is not None:
                 LOG.info(msg)
@@ -433,6 +512,41 @@ class TaskJobManager(object):
             LOG.warning("%s: write failed\n%s" % (job_activity_log, exc))
             LOG.warning(owner_at_host + line, itask=itask)
 
+    def _housekeep_job_logs_callback(self, ctx):
+        """Callback when a job log housekeeping command exits."""
+        self.n_housekeep_cmds -= 1
+        if ctx.ret_code:
+            LOG.warning(ctx)
+        else:
+            LOG.debug(ctx)
+
+    def _housekeep_job_logs_remote_callback(self, ctx):
+        """Callback when a remote job log housekeeping command exits.
+
+        When all the remote commands have exited, put the local commands if
+        all of them succeeded.
+        """
+        if ctx.ret_code:
+            self.is_housekeep_remote_ok = False
+        self._housekeep_job_logs_callback(ctx)
+        if self.n_housekeep_cmds:
+            return
+        local_cmds = self.housekeep_local_cmds
+        self.housekeep_local_cmds = []
+        if self.is_housekeep_remote_ok:
+            self._put_housekeep_local_cmds(local_cmds)
+        else:
+            LOG.warning(
+                "job log housekeeping: remote command(s) failed, will retry")
+
+    def _put_housekeep_local_cmds(self, local_cmds):
+        """Put local job log housekeeping commands to the process pool."""
+        for cmd in local_cmds:
+            self.n_housekeep_cmds += 1
+            self.proc_pool.put_command(
+                SuiteProcContext(self.JOBS_HOUSEKEEP, cmd),
+                self._housekeep_job_logs_callback)
+
     def _kill_task_jobs_callback(self, ctx, suite, itasks):
         """Callback when kill tasks command exits."""
         self._manip_task_jobs_callback(
@@ -622,7 +736,10 @@ class TaskJobManager(object):
         """Run job commands, e.g. poll, kill, etc.
 
         Group itasks with their user@host.
-        Put a job command for each user@host to the multiprocess pool.
+        Put a job command for each user@host to the multiprocess pool. Split
+        the job command for a user@host into batches of at most
+        JOB_CMD_BATCH_SIZE jobs, to keep command lines to a sane length when
+        there are many jobs, e.g. when polling on restart.
 
         """
         if not itasks:
@@ -643,13 +760,16 @@ class TaskJobManager(object):
             cmd.append("--")
             cmd.append(glbl_cfg().get_derived_host_item(
                 suite, "suite job log directory", host, owner))
-            job_log_dirs = []
-            for itask in sorted(itasks, key=lambda itask: itask.identity):
-                job_log_dirs.append(get_task_job_id(
-                    itask.point, itask.tdef.name, itask.submit_num))
-            cmd += job_log_dirs
-            self.proc_pool.put_command(
-                SuiteProcContext(cmd_key, cmd), callback, [suite, itasks])
+            itasks = sorted(itasks, key=lambda itask: itask.identity)
+            for i in range(0, len(itasks), self.JOB_CMD_BATCH_SIZE):
+                batch = itasks[i:i + self.JOB_CMD_BATCH_SIZE]
+                job_log_dirs = []
+                for itask in batch:
+                    job_log_dirs.append(get_task_job_id(
+                        itask.point, itask.tdef.name, itask.submit_num))
+                self.proc_pool.put_command(
+                    SuiteProcContext(cmd_key, cmd + job_log_dirs),
+                    callback, [suite, batch])
 
     @staticmethod
     def _set_retry_timers(itask, rtconfig=None):
@@ -856,6 +976,14 @@ class TaskJobManager(object):
 
         scripts = self._get_job_scripts(itask, rtconfig)
 
+        # Jobs of a task definition on a host share a job file template,
+        # unless their settings are broadcast or their script is specific
+        # to the cycle point.
+        template_key = None
+        if (rtconfig is itask.tdef.rtconfig and
+                not itask.tdef.suite_polling_cfg):
+            template_key = (itask.tdef, itask.task_host, itask.task_owner)
+
         # Location of job file, etc
         self._create_job_log_path(suite, itask)
         job_d = get_task_job_id(
@@ -891,6 +1019,7 @@ class TaskJobManager(object):
             'submit_num': itask.submit_num,
             'suite_name': suite,
             'task_id': itask.identity,
+            'template_key': template_key,
             'try_num': itask.get_try_num(),
             'uuid_str': self.task_remote_mgr.uuid_str,
             'work_d': rtconfig['work sub-directory'],
@@ -30,6 +30,7 @@ import sys
 from cylc.cfgspec.glbl_cfg import glbl_cfg
 import cylc.flags
 from cylc.network.httpclient import SuiteRuntimeServiceClient, ClientInfoError
+from cylc.task_job_logs import append_task_job_status_journal
 from cylc.task_outputs import TASK_OUTPUT_STARTED, TASK_OUTPUT_SUCCEEDED
 from cylc.wallclock import get_current_time_string
 
@@ -87,9 +88,10 @@ def record_messages(suite, task_job, messages):
 
 
 def _append_job_status_file(suite, task_job, event_time, messages):
-    """Write messages to job status file."""
+    """Write messages to job status file, and to the job status journal."""
     job_log_name = os.getenv('CYLC_TASK_LOG_ROOT')
-    if not job_log_name:
+    is_job = bool(job_log_name)
+    if not is_job:
         job_log_name = os.path.join(
             glbl_cfg().get_derived_host_item(suite, 'suite job log directory'),
             'job')
@@ -100,26 +102,28 @@ def _append_job_status_file(suite, task_job, event_time, messages):
             import traceback
             traceback.print_exc()
         return
+    journal_text = ''
     for severity, message in messages:
+        text = ''
         if message == TASK_OUTPUT_STARTED:
             job_id = os.getppid()
             if job_id > 1:
                 # If os.getppid() returns 1, the original job process
                 # is likely killed already
-                job_status_file.write('%s=%s\n' % (CYLC_JOB_PID, job_id))
-            job_status_file.write('%s=%s\n' % (CYLC_JOB_INIT_TIME, event_time))
+                text += '%s=%s\n' % (CYLC_JOB_PID, job_id)
+            text += '%s=%s\n' % (CYLC_JOB_INIT_TIME, event_time)
         elif message == TASK_OUTPUT_SUCCEEDED:
-            job_status_file.write(
+            text = (
                 ('%s=%s\n' % (CYLC_JOB_EXIT, TASK_OUTPUT_SUCCEEDED.upper())) +
                 ('%s=%s\n' % (CYLC_JOB_EXIT_TIME, event_time)))
         elif message.startswith(FAIL_MESSAGE_PREFIX):
-            job_status_file.write(
+            text = (
                 ('%s=%s\n' % (
                     CYLC_JOB_EXIT,
                     message[len(FAIL_MESSAGE_PREFIX):])) +
                 ('%s=%s\n' % (CYLC_JOB_EXIT_TIME, event_time)))
         elif message.startswith(ABORT_MESSAGE_PREFIX):
-            job_status_file.write(
+            text = (
                 ('%s=%s\n' % (
                     CYLC_JOB_EXIT,
                     message[len(ABORT_MESSAGE_PREFIX):])) +
@@ -135,14 +139,20 @@ def _append_job_status_file(suite, task_job, event_time, messages):
             job_status_file = open(job_status_file_name, 'wb')
             for line in lines:
                 job_status_file.write(line)
-            job_status_file.write('%s=%s|%s|%s\n' % (
-                CYLC_MESSAGE, event_time, severity, message))
+            # Readers of the journal forget the entries on this message
+            text = '%s=%s|%s|%s\n' % (
+                CYLC_MESSAGE, event_time, severity, message)
         else:
-            job_status_file.write('%s=%s|%s|%s\n' % (
-                CYLC_MESSAGE, event_time, severity, message))
+            text = '%s=%s|%s|%s\n' % (
+                CYLC_MESSAGE, event_time, severity, message)
+        job_status_file.write(text)
+        journal_text += text
     try:
         job_status_file.close()
     except IOError:
         if cylc.flags.debug:
             import traceback
             traceback.print_exc()
+    else:
+        if is_job:
+            append_task_job_status_journal(job_status_file.name, journal_text)
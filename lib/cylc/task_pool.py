@@ -33,7 +33,6 @@ tasks against the new stop cycle.
 
 from fnmatch import fnmatchcase
 import json
-from time import time
 
 from cylc.config import SuiteConfigError
 from cylc.cycling.loader import get_point, standardise_point_string
@@ -53,7 +52,7 @@ from cylc.task_state import (
     TASK_STATUS_RUNNING, TASK_STATUS_SUCCEEDED, TASK_STATUS_FAILED,
     TASK_STATUS_RETRYING)
 from cylc.wallclock import (
-    get_current_time_string, get_time_string_from_unix_time)
+    get_current_time_string, get_time_string_from_unix_time, get_unix_time)
 from parsec.OrderedDict import OrderedDict
 
 
@@ -546,10 +545,11 @@ class TaskPool(object):
         Return None if task does not exist.
         """
         for itask_ids in self.queues.values() + self.runahead_pool.values():
-            try:
-                return itask_ids[id_]
-            except KeyError:
-                pass
+            # Avoid raising KeyError on each miss - this is called for each
+            # task loaded on restart, so can be expensive in a large pool.
+            itask = itask_ids.get(id_)
+            if itask is not None:
+                return itask
 
     def get_ready_tasks(self):
         """
@@ -572,7 +572,7 @@ class TaskPool(object):
         Return the tasks that are dequeued.
         """
 
-        now = time()
+        now = get_unix_time()
         ready_tasks = []
         qconfig = self.config.cfg['scheduling']['queues']
 
@@ -620,7 +620,7 @@ class TaskPool(object):
                     # (Set to 'ready' is done just before job submission).
                 # else leaved queued
 
-        LOG.debug('%d task(s) de-queued' % len(ready_tasks))
+        LOG.debug('%d task(s) de-queued', len(ready_tasks))
 
         return ready_tasks
 
@@ -705,6 +705,8 @@ class TaskPool(object):
     def reload_taskdefs(self):
         """Reload task definitions."""
         LOG.info("Reloading task definitions.")
+        # {name: True if task definition is unchanged, ...}
+        unchanged = {}
         # Log tasks orphaned by a reload that were not in the task pool.
         for task in self.orphans:
             if task not in (tsk.tdef.name for tsk in self.get_all_tasks()):
@@ -723,6 +725,10 @@ class TaskPool(object):
                     itask.has_spawned = True
                     LOG.warning(
                         "last instance (orphaned by reload)", itask=itask)
+            elif self._is_tdef_unchanged(itask.tdef, unchanged):
+                # Keep the task proxy and its state, with the new taskdef.
+                itask.tdef = self.config.get_taskdef(itask.tdef.name)
+                LOG.info('reloaded task definition', itask=itask)
             else:
                 self.remove(itask, '(suite definition reload)')
                 new_task = self.add_to_runahead_pool(TaskProxy(
@@ -736,9 +742,31 @@ class TaskPool(object):
                         "job(%0d2) active with pre-reload settings" %
                         itask.submit_num,
                         itask=itask)
+        changed = sorted(
+            name for name, is_unchanged in unchanged.items()
+            if not is_unchanged)
+        if changed:
+            LOG.info("Changed task definitions: %s" % ", ".join(changed))
         LOG.info("Reload completed.")
         self.do_reload = False
 
+    def _is_tdef_unchanged(self, old_tdef, unchanged):
+        """Return True if the reloaded definition of a task is unchanged.
+
+        Cache results in the unchanged dict. The elapsed times of unchanged
+        tasks are carried over to the new definition.
+        """
+        try:
+            return unchanged[old_tdef.name]
+        except KeyError:
+            pass
+        new_tdef = self.config.get_taskdef(old_tdef.name)
+        is_unchanged = old_tdef.is_same_as(new_tdef)
+        if is_unchanged:
+            new_tdef.elapsed_times = old_tdef.elapsed_times
+        unchanged[old_tdef.name] = is_unchanged
+        return is_unchanged
+
     def set_stop_point(self, stop_point):
         """Set the global suite stop point."""
         self.stop_point = stop_point
@@ -1144,7 +1172,7 @@ class TaskPool(object):
     def sim_time_check(self, message_queue):
         """Simulation mode: simulate task run times and set states."""
         sim_task_state_changed = False
-        now = time()
+        now = get_unix_time()
         for itask in self.get_tasks():
             if itask.state.status != TASK_STATUS_RUNNING:
                 continue
@@ -1169,6 +1197,34 @@ class TaskPool(object):
                 sim_task_state_changed = True
         return sim_task_state_changed
 
+    def get_next_event_time(self, now):
+        """Return the time of the next timed event of tasks in the pool.
+
+        Consider simulated job completion, clock triggers, expiry and retry
+        delays. Return None if there is no such event after now.
+        """
+        next_time = None
+        for itask in self.get_tasks():
+            event_times = []
+            if itask.state.status == TASK_STATUS_RUNNING:
+                if itask.summary['started_time'] is not None:
+                    event_times.append(
+                        itask.summary['started_time'] +
+                        itask.tdef.rtconfig['job']['simulated run length'])
+            elif itask.state.status == TASK_STATUS_WAITING:
+                if itask.is_waiting_clock(now):
+                    event_times.append(itask.clock_trigger_time)
+                if itask.expire_time is not None:
+                    event_times.append(itask.expire_time)
+            elif itask.state.status in itask.try_timers:
+                event_times.append(
+                    itask.try_timers[itask.state.status].timeout)
+            for event_time in event_times:
+                if (event_time is not None and event_time > now and
+                        (next_time is None or event_time < next_time)):
+                    next_time = event_time
+        return next_time
+
     def set_expired_task(self, itask, now):
         """Check if task has expired. Set state and event handler if so.
 
@@ -1232,7 +1288,7 @@ class TaskPool(object):
         """
         itasks, bad_items = self.filter_task_proxies(items)
         results = {}
-        now = time()
+        now = get_unix_time()
         for itask in itasks:
             if list_prereqs:
                 results[itask.identity] = {
@@ -16,7 +16,8 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from cylc.cycling.loader import get_point_relative
+from cylc.cycling.loader import (
+    get_interval, get_point_relative, is_offset_absolute)
 from cylc.prerequisite import Prerequisite
 from cylc.task_outputs import (
     TASK_OUTPUT_EXPIRED, TASK_OUTPUT_SUBMITTED, TASK_OUTPUT_SUBMIT_FAILED,
@@ -126,12 +127,14 @@ class Dependency(object):
 
     """
 
-    __slots__ = ['_exp', 'task_triggers', 'suicide']
+    __slots__ = ['_exp', 'task_triggers', 'suicide', '_template']
 
     def __init__(self, exp, task_triggers, suicide):
         self._exp = exp
         self.task_triggers = tuple(task_triggers)  # More memory efficient.
         self.suicide = suicide
+        # Point independent parts of the prerequisites, see _get_template.
+        self._template = None
 
     def get_prerequisite(self, point, tdef):
         """Generate a Prerequisite object from this dependency.
@@ -147,50 +150,170 @@ class Dependency(object):
         """
         # Create Prerequisite.
         cpre = Prerequisite(point, tdef.start_point)
-
-        # Loop over TaskTrigger instances.
-        for task_trigger in self.task_triggers:
-            if task_trigger.cycle_point_offset is not None:
-                # Inter-cycle trigger - compute the trigger's cycle point from
-                # its offset.
-                prereq_offset_point = get_point_relative(
-                    task_trigger.cycle_point_offset, point)
-                if prereq_offset_point > point:
-                    # Update tdef.max_future_prereq_offset.
-                    prereq_offset = prereq_offset_point - point
-                    if (tdef.max_future_prereq_offset is None or
-                            (prereq_offset >
-                             tdef.max_future_prereq_offset)):
-                        tdef.max_future_prereq_offset = (
-                            prereq_offset)
-                pre_initial = ((prereq_offset_point < tdef.start_point) &
-                               (point >= tdef.start_point))
+        intervals, condition_template = self._get_template()
+
+        # Compute the point of each trigger once, for re-use in the
+        # expression.
+        trigger_points = []
+        for task_trigger, interval in zip(self.task_triggers, intervals):
+            if interval is None:
+                prereq_point = task_trigger.get_point(point)
+            else:
+                prereq_point = point + interval
+            trigger_points.append(prereq_point)
+            if (task_trigger.cycle_point_offset is not None and
+                    prereq_point > point):
+                # Update tdef.max_future_prereq_offset.
+                prereq_offset = prereq_point - point
+                if (tdef.max_future_prereq_offset is None or
+                        prereq_offset > tdef.max_future_prereq_offset):
+                    tdef.max_future_prereq_offset = prereq_offset
+
+        if tdef.start_point and any(
+                prereq_point < tdef.start_point
+                for prereq_point in trigger_points):
+            # Pre-initial triggers are dropped, which may need the
+            # conditional expression to be simplified.
+            for task_trigger, prereq_point in zip(
+                    self.task_triggers, trigger_points):
+                pre_initial = (
+                    task_trigger.cycle_point_offset is not None and
+                    (prereq_point < tdef.start_point) &
+                    (point >= tdef.start_point))
                 cpre.add(task_trigger.task_name,
-                         task_trigger.get_point(point),
+                         prereq_point,
                          task_trigger.output,
                          pre_initial)
-            else:
-                # Trigger is within the same cycle point.
-                # Register task message with Prerequisite object.
-                cpre.add(task_trigger.task_name,
-                         task_trigger.get_point(point),
-                         task_trigger.output)
-        cpre.set_condition(self.get_expression(point))
+            cpre.set_condition(self.get_expression(
+                point, dict(zip(self.task_triggers, trigger_points))))
+            return cpre
+
+        # Fill in the template at this point.
+        messages = []
+        for task_trigger, prereq_point in zip(
+                self.task_triggers, trigger_points):
+            message = (
+                task_trigger.task_name, str(prereq_point), task_trigger.output)
+            cpre.add(*message)
+            messages.append(message)
+        if condition_template is not None:
+            cpre.set_condition_template(condition_template, messages)
         return cpre
 
-    def get_expression(self, point):
+    def _get_template(self):
+        """Return the point independent parts of the prerequisites.
+
+        Return (intervals, condition_template), where intervals contains the
+        parsed offset interval of each item in self.task_triggers, or None if
+        its point cannot be computed by adding an interval, and
+        condition_template is a list of expression tokens and indices of
+        self.task_triggers, or None if the expression is not a conditional.
+
+        The template is computed once, then filled in for each prerequisite
+        generated from this dependency.
+
+        """
+        if self._template is None:
+            intervals = []
+            for task_trigger in self.task_triggers:
+                offset = task_trigger.cycle_point_offset
+                if (task_trigger.abs_cycle_point or not offset or
+                        is_offset_absolute(offset)):
+                    intervals.append(None)
+                else:
+                    intervals.append(get_interval(offset))
+            condition_template = self._get_template_list(self._exp)
+            if '|' not in ''.join(
+                    item for item in condition_template
+                    if not isinstance(item, int)):
+                condition_template = None
+            self._template = (intervals, condition_template)
+        return self._template
+
+    def _get_template_list(self, nested_expr):
+        """Return a list of tokens and indices of TaskTriggers."""
+        ret = []
+        for item in nested_expr:
+            if isinstance(item, TaskTrigger):
+                ret.append(self.task_triggers.index(item))
+            elif isinstance(item, list):
+                ret.extend(['('] + self._get_template_list(item) + [')'])
+            else:
+                ret.append(item)
+        return ret
+
+    def get_expression(self, point, trigger_points=None):
         """Return the expression as a string.
 
         Args:
             point (cylc.cycling.PointBase): The cycle point at which to
                 generate the expression string for.
+            trigger_points (dict): Pre-computed cycle points of (some of) the
+                TaskTrigger objects in the expression at point (optional).
 
         Return:
             string: The expression as a parsable string in the cylc graph
             format.
 
         """
-        return ''.join(self._stringify_list(self._exp, point))
+        return ''.join(
+            self._stringify_list(self._exp, point, trigger_points))
+
+    def get_key(self):
+        """Return a hashable representation of this dependency.
+
+        Dependencies with equal keys are the same.
+        """
+        return (self.suicide, self._get_key_tuple(self._exp))
+
+    @classmethod
+    def _get_key_tuple(cls, nested_expr):
+        """Return a nested tuple representing a nested list of triggers."""
+        ret = []
+        for item in nested_expr:
+            if isinstance(item, TaskTrigger):
+                ret.append((
+                    item.task_name, str(item.abs_cycle_point),
+                    str(item.cycle_point_offset), item.output))
+            elif isinstance(item, list):
+                ret.append(cls._get_key_tuple(item))
+            else:
+                ret.append(item)
+        return tuple(ret)
+
+    def get_signature(self):
+        """Return a string representing the structure of this dependency.
+
+        Dependencies with the same signature differ only in the names of
+        their upstream tasks, so their expressions are equally valid at any
+        cycle point.
+
+        """
+        return ''.join(self._get_signature_list(self._exp, {}))
+
+    @classmethod
+    def _get_signature_list(cls, nested_expr, indices):
+        """Return the signature tokens of a nested list of TaskTriggers.
+
+        Each distinct task name and output is replaced by an index, in
+        order of appearance, so that repeated triggers remain recognisable.
+
+        """
+        ret = []
+        for item in nested_expr:
+            if isinstance(item, TaskTrigger):
+                key = (item.task_name, item.output)
+                if key not in indices:
+                    indices[key] = len(indices)
+                ret.append('%d[%s|%s]' % (
+                    indices[key], item.abs_cycle_point or '',
+                    item.cycle_point_offset or ''))
+            elif isinstance(item, list):
+                ret.extend(
+                    ['('] + cls._get_signature_list(item, indices) + [')'])
+            else:
+                ret.append(item)
+        return ret
 
     def __str__(self):
         ret = []
@@ -204,15 +327,22 @@ class Dependency(object):
         return ' '.join(ret)
 
     @classmethod
-    def _stringify_list(cls, nested_expr, point):
+    def _stringify_list(cls, nested_expr, point, trigger_points=None):
         """Stringify a nested list of TaskTrigger objects."""
         ret = []
         for item in nested_expr:
             if isinstance(item, TaskTrigger):
+                try:
+                    item_point = trigger_points[item]
+                except (KeyError, TypeError):
+                    item_point = item.get_point(point)
                 ret.append(Prerequisite.MESSAGE_TEMPLATE % (
-                    item.task_name, item.get_point(point), item.output))
+                    item.task_name, item_point, item.output))
             elif isinstance(item, list):
-                ret.extend(['('] + cls._stringify_list(item, point) + [')'])
+                ret.extend(
+                    ['('] +
+                    cls._stringify_list(item, point, trigger_points) +
+                    [')'])
             else:
                 ret.append(item)
         return ret
@@ -23,6 +23,7 @@ from collections import deque
 from cylc.cycling.loader import (
     get_point_relative, get_interval, is_offset_absolute)
 from cylc.task_id import TaskID
+from parsec.util import pequal
 
 
 class TaskDefError(Exception):
@@ -99,6 +100,67 @@ class TaskDef(object):
         if sequence not in self.sequences:
             self.sequences.append(sequence)
 
+    def is_same_as(self, other):
+        """Return True if other defines this task in the same way.
+
+        On suite reload, task proxies of tasks with unchanged definitions can
+        be kept as they are, with their prerequisites and other states.
+        """
+        for attr in [
+                "name", "run_mode", "spawn_ahead", "used_in_offset_trigger",
+                "sequential", "suite_polling_cfg", "namespace_hierarchy",
+                "outputs", "param_var", "external_triggers"]:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
+        for attr in [
+                "start_point", "max_future_prereq_offset",
+                "clocktrigger_offset", "expiration_offset"]:
+            if str(getattr(self, attr)) != str(getattr(other, attr)):
+                return False
+        if getattr(self, "is_coldstart", None) != getattr(
+                other, "is_coldstart", None):
+            return False
+        if (self._get_sequences_key(self.sequences) !=
+                self._get_sequences_key(other.sequences)):
+            return False
+        if (self._get_intercycle_offsets_key() !=
+                other._get_intercycle_offsets_key()):
+            return False
+        if (self._get_dependencies_key() != other._get_dependencies_key()):
+            return False
+        return pequal(self.rtconfig, other.rtconfig)
+
+    @staticmethod
+    def _get_sequences_key(sequences):
+        """Return a comparable representation of a list of sequences.
+
+        Sequence objects do not all stringify by value, so build the key from
+        the graph section string and the resolved bounds and offset instead.
+        """
+        return [
+            (sequence.TYPE, sequence.dep_section,
+             str(sequence.get_offset()), str(sequence.get_start_point()),
+             str(sequence.get_stop_point()))
+            for sequence in sequences]
+
+    def _get_intercycle_offsets_key(self):
+        """Return a comparable representation of intercycle_offsets."""
+        ret = set()
+        for offset, sequence in self.intercycle_offsets:
+            if sequence is not None:
+                sequence = self._get_sequences_key([sequence])[0]
+            ret.add((offset, sequence))
+        return ret
+
+    def _get_dependencies_key(self):
+        """Return a comparable representation of the dependencies."""
+        ret = set()
+        for sequence, dependencies in self.dependencies.items():
+            ret.add((
+                self._get_sequences_key([sequence])[0],
+                tuple(dependency.get_key() for dependency in dependencies)))
+        return ret
+
     def describe(self):
         """Return title and description of the current task."""
         return self.rtconfig['meta']
@@ -0,0 +1,277 @@
+#!/usr/bin/env python
+
+# THIS FILE IS PART OF THE CYLC SUITE ENGINE.
+# Copyright (C) 2008-2018 NIWA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Incremental (streaming) statistics for task job timings.
+
+Used by "cylc report-timings" to summarise job timings of suites with long
+histories without loading all the rows into memory at once.
+"""
+
+from collections import OrderedDict
+import math
+import unittest
+
+
+class QuantileSketch(object):
+    """Approximate quantiles of a stream of values in bounded memory.
+
+    Values are counted in logarithmically sized buckets (c.f. DDSketch), so
+    a quantile estimate is within a relative error of rel_acc of a value in
+    the stream with the requested rank. Memory depends on the range of the
+    values, not on their number.
+    """
+
+    REL_ACC = 0.01
+
+    __slots__ = ('gamma', 'log_gamma', 'pos_buckets', 'neg_buckets',
+                 'n_zero', 'count')
+
+    def __init__(self, rel_acc=REL_ACC):
+        self.gamma = (1.0 + rel_acc) / (1.0 - rel_acc)
+        self.log_gamma = math.log(self.gamma)
+        # {bucket_index: count, ...}
+        self.pos_buckets = {}
+        self.neg_buckets = {}
+        self.n_zero = 0
+        self.count = 0
+
+    def add(self, value):
+        """Add a value to the sketch."""
+        self.count += 1
+        if value > 0:
+            buckets = self.pos_buckets
+        elif value < 0:
+            buckets = self.neg_buckets
+            value = -value
+        else:
+            self.n_zero += 1
+            return
+        index = int(math.ceil(math.log(value) / self.log_gamma))
+        buckets[index] = buckets.get(index, 0) + 1
+
+    def merge(self, other):
+        """Add the values counted in another sketch to this sketch."""
+        for buckets, other_buckets in [
+                (self.pos_buckets, other.pos_buckets),
+                (self.neg_buckets, other.neg_buckets)]:
+            for index, count in other_buckets.items():
+                buckets[index] = buckets.get(index, 0) + count
+        self.n_zero += other.n_zero
+        self.count += other.count
+
+    def quantile(self, quantile):
+        """Return the value at quantile (0.0 to 1.0), or None if empty."""
+        if not self.count:
+            return None
+        rank = quantile * (self.count - 1)
+        total = 0
+        for index in sorted(self.neg_buckets, reverse=True):
+            total += self.neg_buckets[index]
+            if total > rank:
+                return -self._get_bucket_value(index)
+        total += self.n_zero
+        if total > rank:
+            return 0.0
+        for index in sorted(self.pos_buckets):
+            total += self.pos_buckets[index]
+            if total > rank:
+                return self._get_bucket_value(index)
+        return self._get_bucket_value(max(self.pos_buckets))
+
+    def _get_bucket_value(self, index):
+        """Return the representative value of a bucket."""
+        return 2.0 * self.gamma ** index / (self.gamma + 1.0)
+
+
+class TimingStats(object):
+    """Streaming count, mean, standard deviation, extrema and quantiles.
+
+    The mean and variance are computed with Welford's algorithm, quantiles
+    are estimated with a QuantileSketch.
+    """
+
+    QUANTILES = (0.25, 0.5, 0.75)
+    KEYS = ('count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max')
+
+    __slots__ = ('count', 'mean', 'm_2', 'min', 'max', 'sketch')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m_2 = 0.0
+        self.min = None
+        self.max = None
+        self.sketch = QuantileSketch()
+
+    def add(self, value):
+        """Add a value. Ignore None (e.g. a missing time in the DB)."""
+        if value is None:
+            return
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / float(self.count)
+        self.m_2 += delta * (value - self.mean)
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        self.sketch.add(value)
+
+    def get_std(self):
+        """Return the sample standard deviation, or None if count < 2."""
+        if self.count < 2:
+            return None
+        return math.sqrt(self.m_2 / (self.count - 1))
+
+    def describe(self):
+        """Return an OrderedDict of summary statistics.
+
+        Keys are as in KEYS, similar to the output of pandas "describe".
+        Quantiles are clamped to the exact minimum and maximum.
+        """
+        ret = OrderedDict()
+        ret['count'] = self.count
+        if not self.count:
+            for key in self.KEYS[1:]:
+                ret[key] = None
+            return ret
+        ret['mean'] = self.mean
+        ret['std'] = self.get_std()
+        ret['min'] = self.min
+        for quantile in self.QUANTILES:
+            value = self.sketch.quantile(quantile)
+            ret['%d%%' % (quantile * 100)] = min(
+                max(value, self.min), self.max)
+        ret['max'] = self.max
+        return ret
+
+
+class TimingStatsAggregator(object):
+    """Aggregate timing stats by (host, batch_system), task name, category.
+
+    Feed it rows as returned by CylcSuiteDAO.select_task_durations, i.e.
+    with the add_row method as the callback.
+    """
+
+    CATEGORIES = ('queue_time', 'run_time', 'total_time')
+
+    def __init__(self):
+        # {(host, batch_system): {name: {category: TimingStats}}}
+        self.groups = {}
+
+    def add_row(self, _, row):
+        """Add a row [name, cycle, host, batch_system, durations...]."""
+        name, _, host, batch_system = row[0:4]
+        try:
+            by_name = self.groups[(host, batch_system)]
+        except KeyError:
+            by_name = self.groups[(host, batch_system)] = {}
+        try:
+            by_category = by_name[name]
+        except KeyError:
+            by_category = by_name[name] = dict(
+                (category, TimingStats()) for category in self.CATEGORIES)
+        for category, value in zip(self.CATEGORIES, row[4:]):
+            by_category[category].add(value)
+
+    def get_summary(self):
+        """Return the stats as a sorted list of nested tuples.
+
+        [((host, batch_system), [(category, [(name, describe_dict)])])]
+        """
+        ret = []
+        for group, by_name in sorted(self.groups.items()):
+            categories = []
+            for category in self.CATEGORIES:
+                categories.append((category, [
+                    (name, by_name[name][category].describe())
+                    for name in sorted(by_name)]))
+            ret.append((group, categories))
+        return ret
+
+
+class TestTimingStats(unittest.TestCase):
+    """Unit tests for the streaming timing statistics."""
+
+    def test_sketch_quantiles(self):
+        """Sketch quantiles should be within the relative accuracy."""
+        sketch = QuantileSketch()
+        values = range(1, 10001)
+        for value in values:
+            sketch.add(value)
+        for quantile in [0.0, 0.25, 0.5, 0.75, 0.99, 1.0]:
+            exact = values[int(quantile * (len(values) - 1))]
+            self.assertAlmostEqual(
+                sketch.quantile(quantile) / exact, 1.0,
+                delta=QuantileSketch.REL_ACC)
+        # Bounded memory: far fewer buckets than values.
+        self.assertTrue(len(sketch.pos_buckets) < 1000)
+
+    def test_sketch_zero_negative_merge(self):
+        """Sketch should handle zero and negative values, and merge."""
+        sketch = QuantileSketch()
+        for value in [-10, 0, 0, 10]:
+            sketch.add(value)
+        self.assertAlmostEqual(sketch.quantile(0.0), -10, delta=0.1)
+        self.assertEqual(sketch.quantile(0.5), 0.0)
+        other = QuantileSketch()
+        for value in [20, 30, 40, 50]:
+            other.add(value)
+        sketch.merge(other)
+        self.assertEqual(sketch.count, 8)
+        self.assertAlmostEqual(sketch.quantile(1.0), 50, delta=0.5)
+        self.assertEqual(QuantileSketch().quantile(0.5), None)
+
+    def test_stats_describe(self):
+        """Describe should match exact statistics for a small sample."""
+        stats = TimingStats()
+        for value in [2, 4, 4, 4, 5, 5, 7, 9, None]:
+            stats.add(value)
+        summary = stats.describe()
+        self.assertEqual(list(summary.keys()), list(TimingStats.KEYS))
+        self.assertEqual(summary['count'], 8)
+        self.assertAlmostEqual(summary['mean'], 5.0)
+        self.assertAlmostEqual(summary['std'], math.sqrt(32.0 / 7))
+        self.assertEqual(summary['min'], 2)
+        self.assertEqual(summary['max'], 9)
+        self.assertAlmostEqual(summary['50%'], 4, delta=0.05)
+        self.assertEqual(TimingStats().describe()['mean'], None)
+
+    def test_aggregator(self):
+        """Aggregator should group by host/batch system, category, name."""
+        aggr = TimingStatsAggregator()
+        rows = [
+            ['foo', '1', 'localhost', 'background', 1, 10, 11],
+            ['foo', '2', 'localhost', 'background', 3, 20, 23],
+            ['bar', '1', 'localhost', 'background', 0, 5, 5],
+            ['foo', '1', 'hpc', 'pbs', 100, 60, 160],
+        ]
+        for row_idx, row in enumerate(rows):
+            aggr.add_row(row_idx, row)
+        summary = aggr.get_summary()
+        self.assertEqual(
+            [group for group, _ in summary],
+            [('hpc', 'pbs'), ('localhost', 'background')])
+        categories = dict(summary[1][1])
+        self.assertEqual(
+            [name for name, _ in categories['run_time']], ['bar', 'foo'])
+        self.assertAlmostEqual(categories['run_time'][1][1]['mean'], 15.0)
+        self.assertEqual(categories['queue_time'][0][1]['max'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -19,6 +19,7 @@
 
 from calendar import timegm
 from datetime import datetime, timedelta
+from time import time
 
 from isodatetime.timezone import (
     get_local_time_zone_format, get_local_time_zone)
@@ -64,6 +65,26 @@ TIME_ZONE_UTC_INFO = {
 
 PARSER = None
 
+# Seconds to add to the system clock to get the time of the suite server
+# program. This is only ever non-zero in simulation mode with a virtual clock,
+# where the suite skips ahead to the time of its next event.
+CLOCK_OFFSET = 0.0
+
+
+def advance_clock(seconds):
+    """Advance the (virtual) clock by a number of seconds."""
+    global CLOCK_OFFSET
+    CLOCK_OFFSET += seconds
+
+
+def get_unix_time():
+    """Return the current time as seconds since the Unix epoch.
+
+    This is time.time() plus any offset set by advance_clock.
+
+    """
+    return time() + CLOCK_OFFSET
+
 
 def now(override_use_utc=None):
     """Return a current-time datetime.datetime and a UTC timezone flag.
@@ -76,9 +97,12 @@ def now(override_use_utc=None):
 
     """
     if override_use_utc or (override_use_utc is None and cylc.flags.utc):
-        return datetime.utcnow(), False
+        date_time, date_time_is_local = datetime.utcnow(), False
     else:
-        return datetime.now(), True
+        date_time, date_time_is_local = datetime.now(), True
+    if CLOCK_OFFSET:
+        date_time += timedelta(seconds=CLOCK_OFFSET)
+    return date_time, date_time_is_local
 
 
 def get_current_time_string(display_sub_seconds=False, override_use_utc=None,
@@ -1001,6 +1001,31 @@ class TestSuite(unittest.TestCase):
         time_point = data.TimePoint(year=2000) + data.Duration(seconds=1.0)
         self.assertEqual(type(time_point.day_of_month), int)
 
+    def test_timepoint_ordinal_key(self):
+        """Test the ordinal key follows changes to a time point."""
+        point1 = data.TimePoint(year=2000, month_of_year=2, day_of_month=28,
+                                hour_of_day=23, time_zone_hour=-1)
+        point2 = data.TimePoint(year=2000, day_of_year=60, hour_of_day=1,
+                                time_zone_hour=1)
+        self.assertEqual(point1.get_ordinal_key(), (730178, 0))
+        self.assertEqual(point1, point2)
+        point2.hour_of_day = 2
+        self.assertTrue(point1 < point2)
+        point1.time_zone.hours = -3
+        self.assertTrue(point1 > point2)
+        point1.truncated = True
+        self.assertEqual(point1.get_ordinal_key(), None)
+
+    def test_timepoint_add_whole_seconds(self):
+        """Test adding days and hours across the end of February."""
+        for mode, day_of_month in [("360day", 30), ("gregorian", 29)]:
+            data.CALENDAR.set_mode(mode)
+            point = data.TimePoint(year=2000, month_of_year=3, day_of_month=1)
+            point += data.Duration(days=-1, hours=1.0)
+            self.assertEqual(
+                (point.month_of_year, point.day_of_month, point.hour_of_day),
+                (2, day_of_month, 1))
+
     def test_timepoint_subtract(self):
         """Test subtracting one time point from another."""
         for test_props1, test_props2, ctrl_string in (
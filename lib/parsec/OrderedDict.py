@@ -18,6 +18,10 @@
 
 """Ordered Dictionary data structure used extensively in cylc."""
 
+import cPickle
+from copy import deepcopy
+import unittest
+
 try:
     # Python 2.7+ native.
     from collections import OrderedDict
@@ -26,41 +30,102 @@ except ImportError:
     from OrderedDictCompat import OrderedDict
 
 
-class OrderedDictWithDefaults(OrderedDict):
+class OrderedDictWithDefaults(dict):
+
+    """Ordered dict with defaults fetching capability.
+
+    Used for every section of parsec configs, so it is made compact: a plain
+    dict plus a list of keys in insertion order, with no per-instance
+    __dict__ and no linked list of entries (c.f. collections.OrderedDict).
+    String keys are interned, so configs with many similar sections (e.g.
+    many runtime namespaces) share a single copy of each key.
 
-    """Subclass to provide defaults fetching capability.
+    The optional "defaults_" attribute is a dict of default values, shared
+    between sections where possible, fetched for keys that are not set.
 
     Note that defining a '__missing__' method would work for foo[key],
     but doesn't for foo.get(key).
 
     """
 
+    __slots__ = ('_keys', 'defaults_')
+
     def __init__(self, *args, **kwargs):
-        """Allow a defaults argument."""
-        self._allow_contains_default = True
-        super(OrderedDictWithDefaults, self).__init__(*args, **kwargs)
+        dict.__init__(self)
+        self._keys = []
+        self.update(*args, **kwargs)
 
     def __getitem__(self, key):
         """Override to look in our special defaults attribute, if it exists."""
         try:
-            return OrderedDict.__getitem__(self, key)
+            return dict.__getitem__(self, key)
         except KeyError:
             if hasattr(self, 'defaults_'):
                 return self.defaults_[key]
             raise
 
-    def __setitem__(self, *args, **kwargs):
-        """Make sure that we don't set the default value!"""
-        self._allow_contains_default = False
-        return_value = OrderedDict.__setitem__(self, *args, **kwargs)
-        self._allow_contains_default = True
-        return return_value
+    def __setitem__(self, key, value):
+        """Set value of key, appending new keys to the ordered list."""
+        if not dict.__contains__(self, key):
+            if type(key) is str:
+                key = intern(key)
+            self._keys.append(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._keys.remove(key)
+
+    def __iter__(self):
+        """Iterate over actually-set keys, in order."""
+        return iter(self._keys)
+
+    def __reversed__(self):
+        return reversed(self._keys)
+
+    def __contains__(self, key):
+        return (dict.__contains__(self, key) or
+                key in getattr(self, "defaults_", {}))
+
+    has_key = __contains__
+
+    def __nonzero__(self):
+        """Include any default keys in the nonzero calculation."""
+        return bool(self._keys) or bool(getattr(self, "defaults_", None))
+
+    def __eq__(self, other):
+        """Order-sensitive comparison with another ordered dict."""
+        if isinstance(other, (OrderedDictWithDefaults, OrderedDict)):
+            return dict.__eq__(self, other) and list(self) == list(other)
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        """Include default items, as they are fetched like the others."""
+        items = self.items()
+        if not items:
+            return '%s()' % self.__class__.__name__
+        return '%s(%r)' % (self.__class__.__name__, items)
+
+    def __reduce__(self):
+        """For pickle and copy."""
+        state = None
+        if hasattr(self, 'defaults_'):
+            state = (None, {'defaults_': self.defaults_})
+        return (
+            self.__class__,
+            ([(key, dict.__getitem__(self, key)) for key in self._keys],),
+            state)
 
     def keys(self):
         """Include the default keys, after the list of actually-set ones."""
-        keys = list(self)
+        keys = list(self._keys)
         for key in getattr(self, 'defaults_', []):
-            if key not in keys:
+            if not dict.__contains__(self, key):
                 keys.append(key)
         return keys
 
@@ -74,10 +139,10 @@ class OrderedDictWithDefaults(OrderedDict):
 
     def iterkeys(self):
         """Include default keys"""
-        for key in OrderedDict.iterkeys(self):
+        for key in list(self._keys):
             yield key
         for key in getattr(self, 'defaults_', []):
-            if not OrderedDict.__contains__(self, key):
+            if not dict.__contains__(self, key):
                 yield key
 
     def itervalues(self):
@@ -90,38 +155,132 @@ class OrderedDictWithDefaults(OrderedDict):
         for k in self.iterkeys():
             yield (k, self[k])
 
-    def __contains__(self, key):
-        if self._allow_contains_default:
-            if key in getattr(self, "defaults_", {}):
-                return True
-        return OrderedDict.__contains__(self, key)
+    def clear(self):
+        dict.clear(self)
+        del self._keys[:]
 
-    def __nonzero__(self):
-        """Include any default keys in the nonzero calculation."""
-        return bool(self.keys())
-
-    def prepend(self, key, value, dict_setitem=dict.__setitem__):
-        """Prepend new item in the ordered dict.
-
-        https://stackoverflow.com/questions/16664874/
-           how-can-i-add-an-element-at-the-top-of-an-ordereddict-in-python
-
-        Tested with Python 2.7 collections.OrderedDict and our bundled
-        ActiveState implementation for Python 2.6.
-
-        """
-        root = self._OrderedDict__root
-        first = root[1]
-
-        if key in self:
-            link = self._OrderedDict__map[key]
-            link_prev, link_next, _ = link
-            link_prev[1] = link_next
-            link_next[0] = link_prev
-            link[0] = root
-            link[1] = first
-            root[1] = first[0] = link
-        else:
-            root[1] = first[0] = self._OrderedDict__map[key] = [
-                root, first, key]
-        dict_setitem(self, key, value)
+    def copy(self):
+        """Return a shallow copy, sharing defaults_ if set."""
+        ret = self.__class__()
+        for key in self._keys:
+            ret[key] = dict.__getitem__(self, key)
+        if hasattr(self, 'defaults_'):
+            ret.defaults_ = self.defaults_
+        return ret
+
+    def pop(self, key, *args):
+        if dict.__contains__(self, key):
+            self._keys.remove(key)
+        return dict.pop(self, key, *args)
+
+    def popitem(self, last=True):
+        """Remove and return the last (or first) actually-set item."""
+        if not self._keys:
+            raise KeyError('dictionary is empty')
+        key = self._keys.pop() if last else self._keys.pop(0)
+        return key, dict.pop(self, key)
+
+    def setdefault(self, key, default=None):
+        if not dict.__contains__(self, key):
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def update(self, *args, **kwargs):
+        """Like dict.update, but preserve order of ordered input."""
+        if len(args) > 1:
+            raise TypeError(
+                'update expected at most 1 arguments, got %d' % len(args))
+        if args:
+            other = args[0]
+            if isinstance(other, dict):
+                for key in other:
+                    self[key] = dict.__getitem__(other, key)
+            elif hasattr(other, 'keys'):
+                for key in other.keys():
+                    self[key] = other[key]
+            else:
+                for key, value in other:
+                    self[key] = value
+        for key, value in kwargs.items():
+            self[key] = value
+
+    def prepend(self, key, value):
+        """Prepend new item in the ordered dict, or move existing item."""
+        if dict.__contains__(self, key):
+            self._keys.remove(key)
+        elif type(key) is str:
+            key = intern(key)
+        self._keys.insert(0, key)
+        dict.__setitem__(self, key, value)
+
+
+class TestOrderedDictWithDefaults(unittest.TestCase):
+    """Unit tests for OrderedDictWithDefaults."""
+
+    def test_order(self):
+        """Keys should be in insertion order, then default keys."""
+        odict = OrderedDictWithDefaults()
+        for key in ['z', 'a', 'm']:
+            odict[key] = key.upper()
+        odict['a'] = 'A2'
+        self.assertEqual(list(odict), ['z', 'a', 'm'])
+        del odict['z']
+        odict['z'] = 'Z2'
+        self.assertEqual(
+            odict.items(), [('a', 'A2'), ('m', 'M'), ('z', 'Z2')])
+        odict.prepend('m', 'M2')
+        odict.prepend('b', 'B')
+        self.assertEqual(list(odict), ['b', 'm', 'a', 'z'])
+        self.assertEqual(odict.popitem(), ('z', 'Z2'))
+        self.assertEqual(odict.pop('b'), 'B')
+        self.assertEqual(odict.keys(), ['m', 'a'])
+        self.assertEqual(
+            OrderedDictWithDefaults([('y', 1), ('x', 2)]).keys(), ['y', 'x'])
+
+    def test_defaults(self):
+        """Defaults should be fetched and listed, but not by get."""
+        odict = OrderedDictWithDefaults([('a', 1)])
+        self.assertFalse(OrderedDictWithDefaults())
+        odict.defaults_ = {'a': 0, 'b': 2}
+        self.assertEqual(odict['a'], 1)
+        self.assertEqual(odict['b'], 2)
+        self.assertEqual(odict.get('b'), None)
+        self.assertTrue('b' in odict)
+        self.assertEqual(list(odict), ['a'])
+        self.assertEqual(len(odict), 1)
+        self.assertEqual(odict.keys(), ['a', 'b'])
+        self.assertEqual(list(odict.iteritems()), [('a', 1), ('b', 2)])
+        odict['b'] = 3
+        self.assertEqual(odict.items(), [('a', 1), ('b', 3)])
+        empty = OrderedDictWithDefaults()
+        empty.defaults_ = {'c': 1}
+        self.assertTrue(empty)
+        self.assertRaises(KeyError, OrderedDictWithDefaults().__getitem__, 1)
+
+    def test_compact(self):
+        """Instances should have no __dict__, string keys are interned."""
+        odict = OrderedDictWithDefaults()
+        self.assertRaises(AttributeError, setattr, odict, 'foo', 1)
+        odict[''.join(['env', 'ironment'])] = 1
+        self.assertTrue(list(odict)[0] is 'environment')
+
+    def test_copy(self):
+        """Pickle and copy should preserve order and defaults."""
+        odict = OrderedDictWithDefaults(
+            [('b', [1]), ('a', OrderedDictWithDefaults([('x', 1)]))])
+        odict.defaults_ = {'c': 3}
+        for other in [
+                cPickle.loads(cPickle.dumps(odict)),
+                cPickle.loads(cPickle.dumps(odict, cPickle.HIGHEST_PROTOCOL)),
+                deepcopy(odict), odict.copy()]:
+            self.assertEqual(other, odict)
+            self.assertEqual(other.keys(), ['b', 'a', 'c'])
+            self.assertEqual(other['c'], 3)
+        self.assertFalse(deepcopy(odict)['b'] is odict['b'])
+        self.assertTrue(odict.copy()['b'] is odict['b'])
+        self.assertNotEqual(
+            odict, OrderedDictWithDefaults([('a', odict['a']), ('b', [1])]))
+
+
+if __name__ == '__main__':
+    unittest.main()
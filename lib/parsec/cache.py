@@ -0,0 +1,349 @@
+#!/usr/bin/env python
+
+# THIS FILE IS PART OF THE CYLC SUITE ENGINE.
+# Copyright (C) 2008-2018 NIWA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""On-disk cache of processed parsec config file lines.
+
+Inlining include-files, Jinja2 processing and joining continuation lines can
+be slow for big templated config files. The processed lines are cached in a
+directory, keyed on the file path, the template variables and a version
+string. Each entry records what went into it: the content of the config file,
+its include-files, Jinja2 templates and filter modules, and the environment
+variables read by the template. The entry is only used if all of these are
+unchanged.
+"""
+
+import cPickle
+from glob import glob
+from hashlib import sha1
+import os
+import shutil
+from tempfile import mkdtemp, NamedTemporaryFile
+import unittest
+
+
+class ProcFileDeps(object):
+    """Record what went into a processed config file."""
+
+    def __init__(self):
+        # {path: sha1-hex-digest-or-None, ...}
+        self.files = {}
+        # {path: [name, ...]-or-None, ...}
+        self.dirs = {}
+        # {name: value-or-None, ...}
+        self.environ = {}
+        # True if the template looked at the whole environment.
+        self.environ_all = False
+
+    def add_file(self, path):
+        """Record the content of a file."""
+        if path not in self.files:
+            self.files[path] = get_file_digest(path)
+
+    def add_dir(self, path, pattern='*.py'):
+        """Record the files matching pattern in a directory.
+
+        (Also record the content of each of these files.)
+        """
+        if path not in self.dirs:
+            self.dirs[path] = get_dir_listing(path, pattern)
+            for name in self.dirs[path] or []:
+                self.add_file(os.path.join(path, name))
+
+    def get_environ(self):
+        """Return a copy of os.environ that records look ups."""
+        return _RecordingEnviron(self, os.environ)
+
+    def get_data(self):
+        """Return the dependencies as a dict of basic types."""
+        environ = self.environ
+        if self.environ_all:
+            environ = dict(os.environ)
+        return {
+            'files': self.files,
+            'dirs': self.dirs,
+            'environ': environ,
+            'environ_all': self.environ_all}
+
+
+class _RecordingEnviron(dict):
+    """A copy of the environment, which records look ups in a ProcFileDeps.
+
+    Anything that looks at all the variables marks the whole environment as
+    a dependency.
+    """
+
+    def __init__(self, deps, environ):
+        dict.__init__(self, environ)
+        self.deps = deps
+
+    def __getitem__(self, key):
+        self.deps.environ[key] = dict.get(self, key)
+        return dict.__getitem__(self, key)
+
+    def __contains__(self, key):
+        self.deps.environ[key] = dict.get(self, key)
+        return dict.__contains__(self, key)
+
+    def get(self, key, default=None):
+        self.deps.environ[key] = dict.get(self, key)
+        return dict.get(self, key, default)
+
+    has_key = __contains__
+
+    def _record_all(name):
+        """Return a method that marks all variables as dependencies."""
+        method = getattr(dict, name)
+
+        def _method(self, *args, **kwargs):
+            self.deps.environ_all = True
+            return method(self, *args, **kwargs)
+
+        _method.__name__ = name
+        return _method
+
+    for _name in [
+            '__iter__', '__len__', '__eq__', '__ne__', '__repr__', '__str__',
+            'copy', 'items', 'iteritems', 'iterkeys', 'itervalues', 'keys',
+            'values']:
+        locals()[_name] = _record_all(_name)
+    del _name
+    del _record_all
+
+
+def get_file_digest(path):
+    """Return the SHA1 hex digest of the content of a file, or None."""
+    try:
+        handle = open(path, 'rb')
+    except IOError:
+        return None
+    try:
+        return sha1(handle.read()).hexdigest()
+    finally:
+        handle.close()
+
+
+def get_dir_listing(path, pattern):
+    """Return a sorted list of file names matching pattern, or None."""
+    if not os.path.isdir(path):
+        return None
+    return sorted(
+        os.path.basename(name) for name in glob(os.path.join(path, pattern)))
+
+
+class ProcFileCache(object):
+    """On-disk cache of processed config file lines.
+
+    Entries are kept in cache_dir. The version string should change whenever
+    the processing may change, e.g. with the program version.
+    """
+
+    MAX_ENTRIES = 10
+    SUFFIX = '.proc'
+
+    def __init__(self, cache_dir, version=''):
+        self.cache_dir = cache_dir
+        self.version = version
+
+    def load(self, fpath, template_vars=None):
+        """Return the cached processed lines of fpath, or None.
+
+        Return None if there is no entry, or if any dependency of the entry
+        has changed.
+        """
+        try:
+            handle = open(self._get_entry_path(fpath, template_vars), 'rb')
+        except IOError:
+            return None
+        try:
+            deps, flines = cPickle.load(handle)
+        except (EnvironmentError, cPickle.UnpicklingError, EOFError,
+                AttributeError, ImportError, IndexError, TypeError,
+                ValueError):
+            return None
+        finally:
+            handle.close()
+        if not self._is_up_to_date(deps):
+            return None
+        return flines
+
+    def dump(self, fpath, template_vars, flines, deps):
+        """Cache processed lines of fpath, with their ProcFileDeps.
+
+        Failure to write the cache is not an error.
+        """
+        handle = None
+        try:
+            if not os.path.isdir(self.cache_dir):
+                os.makedirs(self.cache_dir)
+            handle = NamedTemporaryFile(
+                prefix='.tmp', dir=self.cache_dir, delete=False)
+            cPickle.dump(
+                (deps.get_data(), flines), handle, cPickle.HIGHEST_PROTOCOL)
+            handle.close()
+            os.rename(
+                handle.name, self._get_entry_path(fpath, template_vars))
+        except EnvironmentError:
+            if handle is not None:
+                try:
+                    os.unlink(handle.name)
+                except OSError:
+                    pass
+            return
+        self._housekeep()
+
+    def _get_entry_path(self, fpath, template_vars):
+        """Return the path to the cache entry for fpath + template_vars."""
+        if template_vars:
+            template_vars = sorted(template_vars.items())
+        key = sha1(repr(
+            (self.version, os.path.abspath(fpath), template_vars)))
+        return os.path.join(self.cache_dir, key.hexdigest() + self.SUFFIX)
+
+    def _housekeep(self):
+        """Remove all but the MAX_ENTRIES most recent entries."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(self.SUFFIX):
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    entries.append((os.stat(path).st_mtime, path))
+                except OSError:
+                    pass
+        entries.sort(reverse=True)
+        for _, path in entries[self.MAX_ENTRIES:]:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _is_up_to_date(deps):
+        """Return True if none of the dependencies have changed."""
+        if deps['environ_all']:
+            if deps['environ'] != dict(os.environ):
+                return False
+        else:
+            for key, value in deps['environ'].items():
+                if os.environ.get(key) != value:
+                    return False
+        for path, listing in deps['dirs'].items():
+            if get_dir_listing(path, '*.py') != listing:
+                return False
+        for path, digest in deps['files'].items():
+            if get_file_digest(path) != digest:
+                return False
+        return True
+
+
+class TestProcFileCache(unittest.TestCase):
+    """Unit tests for the processed file cache."""
+
+    def setUp(self):
+        self.tmp_dir = mkdtemp()
+        self.cache = ProcFileCache(os.path.join(self.tmp_dir, 'cache'), '1')
+        self.fpath = os.path.join(self.tmp_dir, 'suite.rc')
+        self.inc_path = os.path.join(self.tmp_dir, 'inc.rc')
+        for path in self.fpath, self.inc_path:
+            open(path, 'wb').write('# %s\n' % path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _dump(self, template_vars=None, environ_keys=None):
+        """Dump an entry depending on the files and environ_keys."""
+        deps = ProcFileDeps()
+        deps.add_file(self.fpath)
+        deps.add_file(self.inc_path)
+        deps.add_dir(self.tmp_dir, '*.py')
+        environ = deps.get_environ()
+        for key in environ_keys or []:
+            environ.get(key)
+        self.cache.dump(self.fpath, template_vars, ['foo', 'bar'], deps)
+
+    def test_load_dump(self):
+        """Load should return dumped lines while nothing has changed."""
+        self.assertEqual(self.cache.load(self.fpath), None)
+        self._dump()
+        self.assertEqual(self.cache.load(self.fpath), ['foo', 'bar'])
+        # Different template variables.
+        self.assertEqual(self.cache.load(self.fpath, {'FOO': '1'}), None)
+        self._dump({'FOO': '1'})
+        self.assertEqual(
+            self.cache.load(self.fpath, {'FOO': '1'}), ['foo', 'bar'])
+        # Different version.
+        self.assertEqual(
+            ProcFileCache(self.cache.cache_dir, '2').load(self.fpath), None)
+
+    def test_changed_files(self):
+        """Load should return None if a dependency file changes."""
+        self._dump()
+        open(self.inc_path, 'ab').write('# changed\n')
+        self.assertEqual(self.cache.load(self.fpath), None)
+        self._dump()
+        os.unlink(self.inc_path)
+        self.assertEqual(self.cache.load(self.fpath), None)
+        self._dump()
+        # A new Python module in a recorded directory.
+        open(os.path.join(self.tmp_dir, 'foo.py'), 'wb').write('')
+        self.assertEqual(self.cache.load(self.fpath), None)
+
+    def test_changed_environ(self):
+        """Load should return None if a recorded variable changes."""
+        key = 'CYLC_TEST_PROC_FILE_CACHE'
+        os.environ.pop(key, None)
+        self._dump(environ_keys=[key])
+        os.environ['CYLC_TEST_UNRECORDED'] = 'whatever'
+        self.assertEqual(self.cache.load(self.fpath), ['foo', 'bar'])
+        os.environ[key] = 'set'
+        try:
+            self.assertEqual(self.cache.load(self.fpath), None)
+            self._dump(environ_keys=[key])
+            self.assertEqual(self.cache.load(self.fpath), ['foo', 'bar'])
+        finally:
+            del os.environ[key]
+            del os.environ['CYLC_TEST_UNRECORDED']
+
+    def test_recording_environ(self):
+        """The environ copy should record look ups."""
+        deps = ProcFileDeps()
+        environ = deps.get_environ()
+        self.assertEqual(environ.get('CYLC_TEST_NO_SUCH_VAR'), None)
+        self.assertFalse('CYLC_TEST_NO_SUCH_VAR2' in environ)
+        self.assertEqual(
+            deps.environ,
+            {'CYLC_TEST_NO_SUCH_VAR': None, 'CYLC_TEST_NO_SUCH_VAR2': None})
+        self.assertFalse(deps.environ_all)
+        environ.items()
+        self.assertTrue(deps.environ_all)
+
+    def test_housekeep(self):
+        """Only the most recent MAX_ENTRIES entries should be kept."""
+        for i in range(ProcFileCache.MAX_ENTRIES + 2):
+            self._dump({'I': str(i)})
+        self.assertEqual(
+            len(os.listdir(self.cache.cache_dir)), ProcFileCache.MAX_ENTRIES)
+
+    def test_corrupt_entry(self):
+        """Load should return None for a corrupt entry."""
+        self._dump()
+        for name in os.listdir(self.cache.cache_dir):
+            open(os.path.join(self.cache.cache_dir, name), 'wb').write('x')
+        self.assertEqual(self.cache.load(self.fpath), None)
+
+
+if __name__ == '__main__':
+    unittest.main()
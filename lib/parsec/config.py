@@ -38,13 +38,15 @@ class NotSingleItemError(ParsecError):
 class config(object):
     "Object wrapper for parsec functions"
 
-    def __init__(self, spec, upgrader=None, output_fname=None, tvars=None):
+    def __init__(self, spec, upgrader=None, output_fname=None, tvars=None,
+                 proc_cache=None):
 
         self.sparse = OrderedDictWithDefaults()
         self.dense = OrderedDictWithDefaults()
         self.upgrader = upgrader
         self.tvars = tvars
         self.output_fname = output_fname
+        self.proc_cache = proc_cache
         self.checkspec(spec)
         self.spec = spec
 
@@ -67,7 +69,8 @@ class config(object):
         validate it against the spec, and if this is not the first load,
         combine/override with the existing loaded config."""
 
-        sparse = parse(rcfile, self.output_fname, self.tvars)
+        sparse = parse(
+            rcfile, self.output_fname, self.tvars, self.proc_cache)
 
         if self.upgrader is not None:
             self.upgrader(sparse, title)
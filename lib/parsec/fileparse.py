@@ -39,6 +39,7 @@ import traceback
 
 from parsec import ParsecError
 from parsec.OrderedDict import OrderedDictWithDefaults
+from parsec.cache import ProcFileDeps
 from parsec.include import inline, IncludeFileNotFoundError
 from parsec.jinja2support import jinja2process
 from jinja2 import TemplateError, UndefinedError
@@ -219,12 +220,16 @@ def multiline(flines, value, index, maxline):
     return quot + newvalue + line, index
 
 
-def read_and_proc(fpath, template_vars=None, viewcfg=None, asedit=False):
+def read_and_proc(fpath, template_vars=None, viewcfg=None, asedit=False,
+                  proc_cache=None):
     """
     Read a cylc parsec config file (at fpath), inline any include files,
     process with Jinja2, and concatenate continuation lines.
     Jinja2 processing must be done before concatenation - it could be
     used to generate continuation lines.
+
+    If proc_cache (a parsec.cache.ProcFileCache) is specified, return the
+    cached result if it is up to date, else cache the new result in it.
     """
     fdir = os.path.dirname(fpath)
 
@@ -233,6 +238,20 @@ def read_and_proc(fpath, template_vars=None, viewcfg=None, asedit=False):
     if os.path.isdir(suite_lib_python) and suite_lib_python not in sys.path:
         sys.path.append(suite_lib_python)
 
+    deps = None
+    if proc_cache is not None and not viewcfg and not asedit:
+        flines = proc_cache.load(fpath, template_vars)
+        if flines is not None:
+            if cylc.flags.verbose:
+                print "Loaded processed file from cache", fpath
+            return flines
+        deps = ProcFileDeps()
+        deps.add_file(fpath)
+        # Python modules in lib/python/ may be imported by Jinja2 filters.
+        deps.add_dir(suite_lib_python)
+        for dirpath, _, _ in os.walk(suite_lib_python):
+            deps.add_dir(dirpath)
+
     if cylc.flags.verbose:
         print "Reading file", fpath
 
@@ -255,7 +274,8 @@ def read_and_proc(fpath, template_vars=None, viewcfg=None, asedit=False):
     if do_inline:
         try:
             flines = inline(
-                flines, fdir, fpath, False, viewcfg=viewcfg, for_edit=asedit)
+                flines, fdir, fpath, False, viewcfg=viewcfg, for_edit=asedit,
+                deps=deps)
         except IncludeFileNotFoundError, x:
             raise FileParseError(str(x))
 
@@ -265,7 +285,11 @@ def read_and_proc(fpath, template_vars=None, viewcfg=None, asedit=False):
             if cylc.flags.verbose:
                 print "Processing with Jinja2"
             try:
-                flines = jinja2process(flines, fdir, template_vars)
+                cache_dir = None
+                if proc_cache is not None:
+                    cache_dir = proc_cache.cache_dir
+                flines = jinja2process(
+                    flines, fdir, template_vars, deps, cache_dir)
             except (StandardError, TemplateError, UndefinedError) as exc:
                 # Extract diagnostic info from the end of the Jinja2 traceback.
                 exc_lines = traceback.format_exc().splitlines()
@@ -303,14 +327,17 @@ def read_and_proc(fpath, template_vars=None, viewcfg=None, asedit=False):
         flines = _concatenate(flines)
 
     # return rstripped lines
-    return [fl.rstrip() for fl in flines]
+    flines = [fl.rstrip() for fl in flines]
+    if deps is not None:
+        proc_cache.dump(fpath, template_vars, flines, deps)
+    return flines
 
 
-def parse(fpath, output_fname=None, template_vars=None):
+def parse(fpath, output_fname=None, template_vars=None, proc_cache=None):
     "Parse file items line-by-line into a corresponding nested dict."
 
     # read and process the file (jinja2, include-files, line continuation)
-    flines = read_and_proc(fpath, template_vars)
+    flines = read_and_proc(fpath, template_vars, proc_cache=proc_cache)
     if output_fname:
         with open(output_fname, 'wb') as handle:
             handle.write('\n'.join(flines) + '\n')
@@ -54,8 +54,12 @@ include_re = re.compile(r'\s*%include\s+([\'"]?)(.*?)([\'"]?)\s*$')
 
 
 def inline(lines, dir_, filename, for_grep=False, for_edit=False, viewcfg=None,
-           level=None):
-    """Recursive inlining of parsec include-files"""
+           level=None, deps=None):
+    """Recursive inlining of parsec include-files
+
+    If deps (a parsec.cache.ProcFileDeps) is specified, record the
+    include-files in it.
+    """
 
     global flist
     if level is None:
@@ -119,6 +123,8 @@ def inline(lines, dir_, filename, for_grep=False, for_edit=False, viewcfg=None,
                     backup(inc)
                     # store original modtime
                     modtimes[inc] = os.stat(inc).st_mtime
+                if deps is not None:
+                    deps.add_file(inc)
                 if os.path.isfile(inc):
                     if for_grep or single or label or for_edit:
                         outf.append(
@@ -128,7 +134,8 @@ def inline(lines, dir_, filename, for_grep=False, for_edit=False, viewcfg=None,
                     h.close()
                     # recursive inclusion
                     outf.extend(inline(
-                        finc, dir_, inc, for_grep, for_edit, viewcfg, level))
+                        finc, dir_, inc, for_grep, for_edit, viewcfg, level,
+                        deps))
                     if for_grep or single or label or for_edit:
                         outf.append(
                             '#++++ END INLINED INCLUDE FILE ' + match + msg)
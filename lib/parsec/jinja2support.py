@@ -22,12 +22,25 @@ Importing code should catch ImportError in case Jinja2 is not installed.
 
 from glob import glob
 import os
+from shutil import rmtree
 import sys
+from tempfile import mkdtemp, NamedTemporaryFile
+from threading import Thread
+import unittest
 from jinja2 import (
+    BytecodeCache,
     Environment,
+    FileSystemBytecodeCache,
     FileSystemLoader,
     StrictUndefined)
 import cylc.flags
+from parsec.cache import ProcFileDeps
+
+# Name of the suite.rc template in the bytecode caches.
+SUITE_RC_TEMPLATE_NAME = 'suite.rc'
+
+# Jinja2 environments by (filter directories, bytecode cache directory).
+_ENVIRONMENTS = {}
 
 
 def raise_helper(message, error_type='Error'):
@@ -42,12 +55,104 @@ def assert_helper(logical, message):
     return ''  # Prevent None return value polluting output.
 
 
-def jinja2process(flines, dir_, template_vars=None):
-    """Pass configure file through Jinja2 processor."""
+class RecordingFileSystemLoader(FileSystemLoader):
+    """A FileSystemLoader that records loaded templates.
+
+    Loaded templates are recorded in deps (a parsec.cache.ProcFileDeps).
+    """
+
+    def __init__(self, searchpath, deps):
+        FileSystemLoader.__init__(self, searchpath)
+        self.deps = deps
+
+    def get_source(self, environment, template):
+        source, filename, uptodate = FileSystemLoader.get_source(
+            self, environment, template)
+        self.deps.add_file(filename)
+        return source, filename, uptodate
+
+
+class MemoryBytecodeCache(BytecodeCache):
+    """Jinja2 bytecode cache in memory, for the life of the process."""
+
+    def __init__(self):
+        self.store = {}
+
+    def load_bytecode(self, bucket):
+        if bucket.key in self.store:
+            bucket.bytecode_from_string(self.store[bucket.key])
+
+    def dump_bytecode(self, bucket):
+        self.store[bucket.key] = bucket.bytecode_to_string()
+
+
+class DirBytecodeCache(FileSystemBytecodeCache):
+    """Jinja2 bytecode cache in a directory, e.g. a suite service directory.
+
+    The directory is created on demand. Cache files are written atomically,
+    and failure to read or write them is not an error.
+    """
+
+    def __init__(self, directory):
+        FileSystemBytecodeCache.__init__(self, directory, 'jinja2-%s.cache')
+
+    def load_bytecode(self, bucket):
+        try:
+            FileSystemBytecodeCache.load_bytecode(self, bucket)
+        except EnvironmentError:
+            bucket.reset()
+
+    def dump_bytecode(self, bucket):
+        handle = None
+        try:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            handle = NamedTemporaryFile(
+                prefix='.tmp', dir=self.directory, delete=False)
+            bucket.write_bytecode(handle)
+            handle.close()
+            os.rename(handle.name, self._get_cache_filename(bucket))
+        except EnvironmentError:
+            if handle is not None:
+                try:
+                    os.unlink(handle.name)
+                except OSError:
+                    pass
+
+
+def get_filter_dirs(dir_):
+    """Return the custom Jinja2 filter directories for a suite."""
+    return [
+        os.path.join(os.environ['CYLC_DIR'], 'lib', 'Jinja2Filters'),
+        os.path.join(dir_, 'Jinja2Filters'),
+        os.path.join(os.environ['HOME'], '.cylc', 'Jinja2Filters')]
+
+
+def get_environment(dir_, cache_dir=None):
+    """Return a Jinja2 environment for a suite definition directory.
+
+    Environments are created once per process, so custom filters are only
+    imported once, and compiled templates are re-used. Templates are
+    compiled into a bytecode cache in cache_dir if specified, else in memory.
+    Environments are shared, so they must not be modified after creation,
+    see jinja2process for per-call state.
+    """
+    filter_dirs = get_filter_dirs(dir_)
+    key = (tuple(filter_dirs), cache_dir)
+    if key in _ENVIRONMENTS:
+        return _ENVIRONMENTS[key]
+    if cache_dir is None:
+        bytecode_cache = MemoryBytecodeCache()
+    else:
+        bytecode_cache = DirBytecodeCache(cache_dir)
+    # No in-memory template cache, so that loader always records templates.
+    # The bytecode cache does the work instead.
     env = Environment(
         loader=FileSystemLoader(dir_),
         undefined=StrictUndefined,
-        extensions=['jinja2.ext.do'])
+        extensions=['jinja2.ext.do'],
+        cache_size=0,
+        bytecode_cache=bytecode_cache)
 
     # Load any custom Jinja2 filters in the suite definition directory
     # Example: a filter to pad integer values some fill character:
@@ -55,23 +160,55 @@ def jinja2process(flines, dir_, template_vars=None):
     # |  #!/usr/bin/env python
     # |  def foo( value, length, fillchar ):
     # |     return str(value).rjust( int(length), str(fillchar) )
-    for fdir in [
-            os.path.join(os.environ['CYLC_DIR'], 'lib', 'Jinja2Filters'),
-            os.path.join(dir_, 'Jinja2Filters'),
-            os.path.join(os.environ['HOME'], '.cylc', 'Jinja2Filters')]:
+    for fdir in filter_dirs:
         if os.path.isdir(fdir):
-            sys.path.append(os.path.abspath(fdir))
+            if os.path.abspath(fdir) not in sys.path:
+                sys.path.append(os.path.abspath(fdir))
             for name in glob(os.path.join(fdir, '*.py')):
                 fname = os.path.splitext(os.path.basename(name))[0]
                 # TODO - EXCEPTION HANDLING FOR LOADING CUSTOM FILTERS
                 module = __import__(fname)
                 env.filters[fname] = getattr(module, fname)
 
+    env.globals['raise'] = raise_helper
+    env.globals['assert'] = assert_helper
     # Import SUITE HOST USER ENVIRONMENT into template:
     # (usage e.g.: {{environ['HOME']}}).
     env.globals['environ'] = os.environ
-    env.globals['raise'] = raise_helper
-    env.globals['assert'] = assert_helper
+    _ENVIRONMENTS[key] = env
+    return env
+
+
+def get_template(env, source):
+    """Return a template from source, compiled via the bytecode cache."""
+    bcc = env.bytecode_cache
+    bucket = bcc.get_bucket(env, SUITE_RC_TEMPLATE_NAME, None, source)
+    code = bucket.code
+    if code is None:
+        code = env.compile(source)
+        bucket.code = code
+        bcc.set_bucket(bucket)
+    return env.template_class.from_code(env, code, env.make_globals(None))
+
+
+def jinja2process(flines, dir_, template_vars=None, deps=None,
+                  cache_dir=None):
+    """Pass configure file through Jinja2 processor.
+
+    If deps (a parsec.cache.ProcFileDeps) is specified, record the templates,
+    filter modules and environment variables used in it. If cache_dir is
+    specified, cache compiled templates in it.
+    """
+    env = get_environment(dir_, cache_dir)
+    if deps is not None:
+        for fdir in get_filter_dirs(dir_):
+            deps.add_dir(fdir)
+        # The shared environment may be in use by other calls, so record
+        # dependencies via an overlay with its own loader and globals.
+        globals_ = dict(env.globals)
+        globals_['environ'] = deps.get_environ()
+        env = env.overlay(loader=RecordingFileSystemLoader(dir_, deps))
+        env.globals = globals_
 
     # Load file lines into a template, excluding '#!jinja2' so that
     # '#!cylc-x.y.z' rises to the top. Callers should handle jinja2
@@ -90,8 +227,9 @@ def jinja2process(flines, dir_, template_vars=None):
     # Convert unicode to plain str, ToDo - still needed for parsec?)
 
     suiterc = []
-    template = env.from_string('\n'.join(flines[1:]))
-    for line in str(template.render(template_vars)).splitlines():
+    template = get_template(env, '\n'.join(flines[1:]))
+    text = str(template.render(template_vars))
+    for line in text.splitlines():
         # Jinja2 leaves blank lines where source lines contain
         # only Jinja2 code; this matters if line continuation
         # markers are involved, so we remove blank lines here.
@@ -103,3 +241,61 @@ def jinja2process(flines, dir_, template_vars=None):
         suiterc.append(line)
 
     return suiterc
+
+
+class TestJinja2Process(unittest.TestCase):
+    """Unit tests for jinja2process."""
+
+    def setUp(self):
+        self.dir_ = mkdtemp()
+        for name in ['a', 'b']:
+            handle = open(os.path.join(self.dir_, 'inc-%s.rc' % name), 'w')
+            handle.write(
+                "title = %s {{ environ.get('CYLC_TEST_J2_%s') }}\n" % (
+                    name, name.upper()))
+            handle.close()
+
+    def tearDown(self):
+        rmtree(self.dir_)
+
+    def test_concurrent_deps(self):
+        """Concurrent calls should record their own dependencies only."""
+        flines = ['#!jinja2', "{% include 'inc-' + NAME + '.rc' %}"]
+        results = {'a': [], 'b': []}
+
+        def process(name):
+            """Process flines a few times with NAME=name."""
+            for _ in range(20):
+                deps = ProcFileDeps()
+                lines = jinja2process(flines, self.dir_, {'NAME': name}, deps)
+                results[name].append((lines, deps))
+
+        threads = [Thread(target=process, args=(name,)) for name in results]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for name, name_results in results.items():
+            self.assertEqual(len(name_results), 20)
+            for lines, deps in name_results:
+                self.assertEqual(lines, ['title = %s None' % name])
+                self.assertEqual(
+                    [path for path in deps.files if path.endswith('.rc')],
+                    [os.path.join(self.dir_, 'inc-%s.rc' % name)])
+                self.assertEqual(
+                    deps.environ.keys(), ['CYLC_TEST_J2_%s' % name.upper()])
+        # The shared environment should be unchanged.
+        env = get_environment(self.dir_)
+        self.assertTrue(env.globals['environ'] is os.environ)
+        self.assertFalse(isinstance(env.loader, RecordingFileSystemLoader))
+
+    def test_no_deps(self):
+        """Calls without deps should use the shared environment."""
+        self.assertEqual(
+            jinja2process(
+                ['#!jinja2', "{% include 'inc-b.rc' %}"], self.dir_),
+            ['title = b None'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -121,6 +121,60 @@ def replicate(target, source):
             target[key] = val
 
 
+def poverlay(base, source):
+    """Return a new pdict of source replicated over base.
+
+    The result is equal to replicating source into a deep copy of base, but
+    sections of base not overridden by source are shared, not copied. Items
+    are in the same order as with replicate. Neither base nor source are
+    altered, but the result must not be altered in-place below its top level
+    either, because of the sharing.
+    """
+    target = OrderedDictWithDefaults()
+    if base:
+        if hasattr(base, "defaults_"):
+            target.defaults_ = base.defaults_
+        for key, val in base.items():
+            target[key] = val
+    if not source:
+        return target
+    if hasattr(source, "defaults_"):
+        target.defaults_ = pdeepcopy(source.defaults_)
+    for key, val in source.items():
+        if isinstance(val, dict):
+            sub_base = None
+            if key in target and isinstance(target[key], dict):
+                sub_base = target[key]
+            target[key] = poverlay(sub_base, val)
+        elif isinstance(val, list):
+            target[key] = val[:]
+        else:
+            target[key] = val
+    return target
+
+
+def pequal(pdict1, pdict2):
+    """Return True if two pdicts have the same items, in the same order.
+
+    Unlike "==", this includes default items, and is quick for shared
+    sections.
+    """
+    if pdict1 is pdict2:
+        return True
+    keys = pdict1.keys()
+    if keys != pdict2.keys():
+        return False
+    for key in keys:
+        val1 = pdict1[key]
+        val2 = pdict2[key]
+        if isinstance(val1, dict):
+            if not isinstance(val2, dict) or not pequal(val1, val2):
+                return False
+        elif val1 != val2 or isinstance(val2, dict):
+            return False
+    return True
+
+
 def pdeepcopy(source):
     """Make a deep copy of a pdict source"""
     target = OrderedDictWithDefaults()
@@ -162,12 +216,19 @@ def m_override(target, sparse):
 
     Target keys must already exist unless there is a "__MANY__" placeholder in
     the right position.
+
+    A sparse section that appears in more than one place (e.g. a section
+    shared by memoized runtime inheritance, see poverlay) is only expanded
+    once, and the new target section is shared in the same way. Shared
+    sections must be copied before they are modified.
     """
     if not sparse:
         target = OrderedDictWithDefaults()
         return
     stack = [(sparse, target, [], OrderedDictWithDefaults())]
     defaults_list = []
+    # {(id(sparse section), id(many defaults)): new target section, ...}
+    expanded = {}
     while stack:
         source, dest, keylist, many_defaults = stack.pop(0)
         if many_defaults:
@@ -195,6 +256,13 @@ def m_override(target, sparse):
                             "parsec dict override: no __MANY__ placeholder" +
                             "%s" % (keylist + [key])
                         )
+                    expanded_key = (id(val), None)
+                    if child_many_defaults:
+                        expanded_key = (id(val), id(child_many_defaults))
+                    if expanded_key in expanded:
+                        dest[key] = expanded[expanded_key]
+                        continue
+                    expanded[expanded_key] = dest[key]
                 stack.append(
                     (val, dest[key], keylist + [key], child_many_defaults))
             else:
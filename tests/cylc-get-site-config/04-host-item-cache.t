@@ -0,0 +1,60 @@
+#!/bin/bash
+# THIS FILE IS PART OF THE CYLC SUITE ENGINE.
+# Copyright (C) 2008-2018 NIWA
+# 
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Test memoized host item look ups, for host pattern hit/miss and on reload.
+. "$(dirname "$0")/test_header"
+set_test_number 1
+
+create_test_globalrc '' '
+[hosts]
+    [[localhost]]
+        use login shell = True
+    [[mytesthost\d+]]
+        use login shell = False'
+
+run_ok "${TEST_NAME_BASE}" python - "${PWD}/conf/global.rc" <<'__PYTHON__'
+import sys
+
+from cylc.cfgspec.glbl_cfg import glbl_cfg
+
+item = 'use login shell'
+cfg = glbl_cfg()
+# Pattern hit, repeat hit from cache, miss defaults to localhost.
+assert cfg.get_host_item(item, 'mytesthost1') is False
+assert cfg.get_host_item(item, 'mytesthost1') is False
+assert cfg.get_host_item(item, 'mytesthost2') is False
+assert cfg.get_host_item(item, 'othertesthost') is True
+assert cfg.get_host_item(item) is True
+
+# Reload with changed host settings must not return stale values.
+with open(sys.argv[1], 'ab') as handle:
+    handle.write('''
+[hosts]
+    [[localhost]]
+        use login shell = False
+    [[mytesthost\d+]]
+        use login shell = True
+    [[othertesthost]]
+        use login shell = True
+''')
+cfg.load()
+assert cfg.get_host_item(item, 'mytesthost1') is True
+assert cfg.get_host_item(item, 'othertesthost') is True
+assert cfg.get_host_item(item, 'anothertesthost') is False
+assert cfg.get_host_item(item) is False
+__PYTHON__
+exit
@@ -0,0 +1,75 @@
+#!/bin/bash
+# THIS FILE IS PART OF THE CYLC SUITE ENGINE.
+# Copyright (C) 2008-2018 NIWA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#-------------------------------------------------------------------------------
+# Test "cylc jobs-poll" reads the job status journal, if enabled, and gets the
+# same results as reading the job status files.
+. "$(dirname "${0}")/test_header"
+
+set_test_number 4
+create_test_globalrc '' '
+[hosts]
+    [[localhost]]
+        job status journal = True'
+
+JOB_LOG_ROOT="${PWD}/log/job"
+for NAME in 't1' 't2'; do
+    mkdir -p "${JOB_LOG_ROOT}/1/${NAME}/01"
+    cat >"${JOB_LOG_ROOT}/1/${NAME}/01/job" <<'__JOB__'
+#!/bin/bash
+# Job submit method: background
+exit 0
+__JOB__
+    chmod +x "${JOB_LOG_ROOT}/1/${NAME}/01/job"
+done
+run_ok "${TEST_NAME_BASE}-submit" \
+    cylc jobs-submit "${JOB_LOG_ROOT}" '1/t1/01' '1/t2/01'
+CYLC_TASK_LOG_ROOT="${JOB_LOG_ROOT}/1/t1/01/job" \
+    cylc message -- "${TEST_NAME_BASE}" '1/t1/01' 'started' 'hello' 'succeeded' \
+    >/dev/null 2>&1
+CYLC_TASK_LOG_ROOT="${JOB_LOG_ROOT}/1/t2/01/job" \
+    cylc message -- "${TEST_NAME_BASE}" '1/t2/01' 'started' 'vacated/USR1' \
+    >/dev/null 2>&1
+sed 's/=.*$//' "${JOB_LOG_ROOT}/1/job.status.journal" >'journal.out'
+cmp_ok 'journal.out' <<'__OUT__'
+1/t1/01|CYLC_BATCH_SYS_NAME
+1/t1/01|CYLC_BATCH_SYS_JOB_ID
+1/t1/01|CYLC_BATCH_SYS_JOB_SUBMIT_TIME
+1/t2/01|CYLC_BATCH_SYS_NAME
+1/t2/01|CYLC_BATCH_SYS_JOB_ID
+1/t2/01|CYLC_BATCH_SYS_JOB_SUBMIT_TIME
+1/t1/01|CYLC_JOB_PID
+1/t1/01|CYLC_JOB_INIT_TIME
+1/t1/01|CYLC_MESSAGE
+1/t1/01|CYLC_JOB_EXIT
+1/t1/01|CYLC_JOB_EXIT_TIME
+1/t2/01|CYLC_JOB_PID
+1/t2/01|CYLC_JOB_INIT_TIME
+1/t2/01|CYLC_MESSAGE
+__OUT__
+
+# Poll twice, as the first poll records that t2 has exited the batch system.
+for SOURCE in 'journal-1' 'journal-2' 'files'; do
+    if [[ "${SOURCE}" == 'files' ]]; then
+        rm -f "${JOB_LOG_ROOT}/1/job.status.journal"
+    fi
+    cylc jobs-poll "${JOB_LOG_ROOT}" '1/t1/01' '1/t2/01' \
+        | sed 's/^\(\[[A-Z ]*\]\)[^|]*|/\1/' >"poll-${SOURCE}.out"
+done
+cmp_ok 'poll-journal-2.out' 'poll-files.out'
+run_ok "${TEST_NAME_BASE}-poll" \
+    grep -q -F '[TASK JOB SUMMARY]1/t2/01|background|' 'poll-files.out'
+exit
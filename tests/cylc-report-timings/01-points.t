@@ -0,0 +1,78 @@
+#!/bin/bash
+# THIS FILE IS PART OF THE CYLC SUITE ENGINE.
+# Copyright (C) 2008-2018 NIWA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#-------------------------------------------------------------------------------
+# Test that --start-point and --stop-point are converted to the cycle point
+# format and time zone of the suite, and that bad points are rejected.
+. "$(dirname "$0")/test_header"
+set_test_number 6
+
+# Create a suite run database with a few succeeded jobs.
+create_db() {
+    local SUITE_NAME="$1"
+    local INITIAL_POINT="$2"
+    shift 2
+    mkdir -p "${RUN_DIR}/${SUITE_NAME}/log"
+    python - "${RUN_DIR}/${SUITE_NAME}/log/db" "${INITIAL_POINT}" "$@" <<'__PYTHON__'
+import sys
+from cylc.rundb import CylcSuiteDAO
+dao = CylcSuiteDAO(sys.argv[1])
+conn = dao.connect()
+conn.execute(
+    'INSERT INTO suite_params VALUES (?, ?)', ['initial_point', sys.argv[2]])
+for cycle in sys.argv[3:]:
+    conn.execute(
+        'INSERT INTO task_jobs(cycle, name, submit_num, time_submit,'
+        ' time_run, time_run_exit, run_status, user_at_host, batch_sys_name)'
+        ' VALUES (?, "foo", 1, ?, ?, ?, 0, "localhost", "background")',
+        [cycle] + ['2020-01-01T00:00:0%dZ' % i for i in range(3)])
+conn.commit()
+__PYTHON__
+}
+
+RUN_DIR="$(cylc get-global-config --print-run-dir)"
+SUITE_NAME="cylctb-${CYLC_TEST_TIME_INIT}/${TEST_SOURCE_DIR_BASE}/${TEST_NAME_BASE}"
+
+# Date-time cycling, not in UTC.
+create_db "${SUITE_NAME}-iso" '20200101T0000+13' \
+    '20200101T0000+13' '20200102T0000+13' '20200103T0000+13'
+TEST_NAME="${TEST_NAME_BASE}-iso"
+run_ok "${TEST_NAME}" cylc report-timings --raw \
+    --start-point='2020-01-02' --stop-point='2020-01-02T11Z' \
+    "${SUITE_NAME}-iso"
+awk 'NR > 1 {print $2}' "${TEST_NAME}.stdout" >'iso.out'
+cmp_ok 'iso.out' <<'__OUT__'
+20200102T0000+13
+20200103T0000+13
+__OUT__
+run_fail "${TEST_NAME_BASE}-iso-bad" cylc report-timings --raw \
+    --start-point='tomorrow' "${SUITE_NAME}-iso"
+purge_suite "${SUITE_NAME}-iso"
+
+# Integer cycling.
+create_db "${SUITE_NAME}-integer" '1' '1' '2' '10'
+TEST_NAME="${TEST_NAME_BASE}-integer"
+run_ok "${TEST_NAME}" cylc report-timings --raw \
+    --start-point='2' --stop-point='+10' "${SUITE_NAME}-integer"
+awk 'NR > 1 {print $2}' "${TEST_NAME}.stdout" >'integer.out'
+cmp_ok 'integer.out' <<'__OUT__'
+2
+10
+__OUT__
+run_fail "${TEST_NAME_BASE}-integer-bad" cylc report-timings --raw \
+    --start-point='2020-01-01' "${SUITE_NAME}-integer"
+purge_suite "${SUITE_NAME}-integer"
+exit
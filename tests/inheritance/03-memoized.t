@@ -0,0 +1,129 @@
+#!/bin/bash
+# THIS FILE IS PART OF THE CYLC SUITE ENGINE.
+# Copyright (C) 2008-2018 NIWA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#-------------------------------------------------------------------------------
+# Test that memoized inheritance results, which share the sections they do not
+# override with their ancestors, give the right result for each namespace, and
+# that overrides in one namespace do not leak into others. The sharing should
+# persist in the dense runtime config and the task definitions.
+. $(dirname $0)/test_header
+#-------------------------------------------------------------------------------
+set_test_number 3
+install_suite $TEST_NAME_BASE $TEST_NAME_BASE
+#-------------------------------------------------------------------------------
+TEST_NAME=$TEST_NAME_BASE-validate
+run_ok "$TEST_NAME" cylc validate $SUITE_NAME
+#-------------------------------------------------------------------------------
+TEST_NAME=$TEST_NAME_BASE-get-config
+cylc get-config --sparse -i runtime $SUITE_NAME > runtime.out
+cmp_ok runtime.out <<'__DONE__'
+[[root]]
+    script = true
+    [[[environment]]]
+        ROOT = root
+        FOO = root
+[[A]]
+    script = true
+    [[[environment]]]
+        ROOT = root
+        FOO = A
+        BAR = A
+    [[[directives]]]
+        -l A = 1
+[[B]]
+    script = true
+    inherit = A
+    [[[environment]]]
+        ROOT = root
+        FOO = A
+        BAR = A
+        BAZ = B
+    [[[directives]]]
+        -l A = 1
+[[C]]
+    script = true
+    [[[environment]]]
+        ROOT = root
+        FOO = C
+        QUX = C
+[[a1]]
+    script = true
+    inherit = A
+    [[[environment]]]
+        ROOT = root
+        FOO = A
+        BAR = A
+    [[[directives]]]
+        -l A = 1
+[[a2]]
+    script = true
+    inherit = A
+    [[[environment]]]
+        ROOT = root
+        FOO = A
+        BAR = a2
+    [[[directives]]]
+        -l A = 1
+[[b1]]
+    script = true
+    inherit = B
+    [[[environment]]]
+        ROOT = root
+        FOO = A
+        BAR = A
+        BAZ = B
+    [[[directives]]]
+        -l A = 1
+        -l b1 = 1
+[[c1]]
+    script = false
+    inherit = C, B
+    [[[environment]]]
+        ROOT = root
+        FOO = C
+        BAR = A
+        BAZ = B
+        QUX = C
+    [[[directives]]]
+        -l A = 1
+__DONE__
+#-------------------------------------------------------------------------------
+TEST_NAME=$TEST_NAME_BASE-dense-shared
+run_ok "$TEST_NAME" python - "$SUITE_NAME" "$PWD/suite.rc" <<'__PYTHON__'
+import sys
+
+from cylc.config import SuiteConfig
+
+config = SuiteConfig(sys.argv[1], sys.argv[2])
+runtime = config.cfg['runtime']
+# Sections not overridden are shared with the ancestor.
+assert runtime['a1']['environment'] is runtime['A']['environment']
+assert runtime['a1']['directives'] is runtime['A']['directives']
+assert runtime['a2']['directives'] is runtime['A']['directives']
+assert runtime['b1']['environment'] is runtime['B']['environment']
+assert runtime['B']['directives'] is runtime['A']['directives']
+# Sections overridden are not.
+assert runtime['a2']['environment'] is not runtime['A']['environment']
+assert runtime['b1']['directives'] is not runtime['B']['directives']
+assert runtime['a2']['environment']['BAR'] == 'a2'
+assert runtime['A']['environment']['BAR'] == 'A'
+# Task definitions use the same sections.
+for name in ['a1', 'a2', 'b1', 'c1']:
+    assert config.taskdefs[name].rtconfig is runtime[name]
+__PYTHON__
+#-------------------------------------------------------------------------------
+purge_suite $SUITE_NAME
+exit
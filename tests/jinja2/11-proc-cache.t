@@ -0,0 +1,68 @@
+#!/bin/bash
+# THIS FILE IS PART OF THE CYLC SUITE ENGINE.
+# Copyright (C) 2008-2018 NIWA
+# 
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#-------------------------------------------------------------------------------
+# Test the processed suite definition cache is used only while the suite
+# definition, its include-files and the environment variables used by Jinja2
+# are unchanged.
+. "$(dirname "$0")/test_header"
+#-------------------------------------------------------------------------------
+set_test_number 11
+
+create_test_globalrc 'enable suite definition cache = True'
+#-------------------------------------------------------------------------------
+init_suite "${TEST_NAME_BASE}" <<'__SUITE_RC__'
+#!Jinja2
+[meta]
+    title = {{ environ['CYLC_TEST_PROC_CACHE'] }}
+{% include 'inc.rc' %}
+__SUITE_RC__
+cat >'inc.rc' <<'__RC__'
+[scheduling]
+    [[dependencies]]
+        graph = foo
+__RC__
+export CYLC_TEST_PROC_CACHE='one'
+#-------------------------------------------------------------------------------
+TEST_NAME="${TEST_NAME_BASE}-validate-1"
+run_ok "${TEST_NAME}" cylc validate -v -o 'suite.rc.processed' "${SUITE_NAME}"
+grep_ok 'title = one' 'suite.rc.processed'
+exists_ok "$(ls "${SUITE_RUN_DIR}/.service/proc-cache/"*'.proc')"
+#-------------------------------------------------------------------------------
+TEST_NAME="${TEST_NAME_BASE}-validate-2"
+run_ok "${TEST_NAME}" cylc validate -v -o 'suite.rc.processed' "${SUITE_NAME}"
+grep_ok 'Loaded processed file from cache' "${TEST_NAME}.stdout"
+#-------------------------------------------------------------------------------
+TEST_NAME="${TEST_NAME_BASE}-validate-environ"
+export CYLC_TEST_PROC_CACHE='two'
+run_ok "${TEST_NAME}" cylc validate -v -o 'suite.rc.processed' "${SUITE_NAME}"
+run_fail "${TEST_NAME}-no-cache" \
+    grep -q 'Loaded processed file from cache' "${TEST_NAME}.stdout"
+grep_ok 'title = two' 'suite.rc.processed'
+#-------------------------------------------------------------------------------
+TEST_NAME="${TEST_NAME_BASE}-validate-include"
+cat >'inc.rc' <<'__RC__'
+[scheduling]
+    [[dependencies]]
+        graph = bar
+__RC__
+run_ok "${TEST_NAME}" cylc validate -v -o 'suite.rc.processed' "${SUITE_NAME}"
+run_fail "${TEST_NAME}-no-cache" \
+    grep -q 'Loaded processed file from cache' "${TEST_NAME}.stdout"
+grep_ok 'graph = bar' 'suite.rc.processed'
+#-------------------------------------------------------------------------------
+purge_suite "${SUITE_NAME}"
+exit
@@ -0,0 +1,51 @@
+#!/bin/bash
+# THIS FILE IS PART OF THE CYLC SUITE ENGINE.
+# Copyright (C) 2008-2018 NIWA
+# 
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#-------------------------------------------------------------------------------
+# Test Jinja2 templates of a registered suite are compiled into a bytecode
+# cache, which is re-used with different template variables.
+. "$(dirname "$0")/test_header"
+#-------------------------------------------------------------------------------
+set_test_number 5
+
+create_test_globalrc 'enable suite definition cache = True'
+#-------------------------------------------------------------------------------
+init_suite "${TEST_NAME_BASE}" <<'__SUITE_RC__'
+#!Jinja2
+[meta]
+    title = {{ TITLE }}
+{% include 'inc.rc' %}
+__SUITE_RC__
+cat >'inc.rc' <<'__RC__'
+[scheduling]
+    [[dependencies]]
+        graph = foo
+__RC__
+#-------------------------------------------------------------------------------
+TEST_NAME="${TEST_NAME_BASE}-validate-1"
+run_ok "${TEST_NAME}" \
+    cylc validate -s 'TITLE=one' -o 'suite.rc.processed' "${SUITE_NAME}"
+grep_ok 'title = one' 'suite.rc.processed'
+ls "${SUITE_RUN_DIR}/.service/proc-cache/"*'.cache' >'cache-files.1'
+count_ok '.cache$' 'cache-files.1' 2
+#-------------------------------------------------------------------------------
+TEST_NAME="${TEST_NAME_BASE}-validate-2"
+run_ok "${TEST_NAME}" \
+    cylc validate -s 'TITLE=two' -o 'suite.rc.processed' "${SUITE_NAME}"
+grep_ok 'title = two' 'suite.rc.processed'
+#-------------------------------------------------------------------------------
+purge_suite "${SUITE_NAME}"
+exit
@@ -0,0 +1,53 @@
+#!/bin/bash
+# THIS FILE IS PART OF THE CYLC SUITE ENGINE.
+# Copyright (C) 2008-2018 NIWA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#-------------------------------------------------------------------------------
+# Test "cylc jobs-housekeep", archive and delete job logs of cycle points.
+. "$(dirname "$0")/test_header"
+set_test_number 10
+
+mkdir -p 'log/job'
+for POINT in '20200101T0000Z' '20200102T0000Z' '20200103T0000Z'; do
+    mkdir -p "log/job/${POINT}/foo/01"
+    echo "${POINT}" >"log/job/${POINT}/foo/01/job.out"
+done
+
+run_ok "${TEST_NAME_BASE}-archive" \
+    cylc jobs-housekeep --archive 'log/job' '20200101T0000Z' '20200102T0000Z'
+exists_fail 'log/job/20200101T0000Z'
+exists_fail 'log/job/20200102T0000Z'
+tar -tzf 'log/job/20200101T0000Z.tar.gz' >'archive.list'
+contains_ok 'archive.list' <<'__LIST__'
+20200101T0000Z/foo/01/job.out
+__LIST__
+
+# Archive a re-created cycle point directory without clobbering the archive.
+mkdir -p 'log/job/20200101T0000Z/foo/02'
+run_ok "${TEST_NAME_BASE}-archive-again" \
+    cylc jobs-housekeep --archive 'log/job' '20200101T0000Z'
+exists_ok 'log/job/20200101T0000Z.1.tar.gz'
+
+run_ok "${TEST_NAME_BASE}-delete" \
+    cylc jobs-housekeep 'log/job' '20200103T0000Z' '20200104T0000Z'
+exists_fail 'log/job/20200103T0000Z'
+exists_fail 'log/job/20200103T0000Z.tar.gz'
+ls 'log/job' >'ls.out'
+cmp_ok 'ls.out' <<'__LS__'
+20200101T0000Z.1.tar.gz
+20200101T0000Z.tar.gz
+20200102T0000Z.tar.gz
+__LS__
+exit
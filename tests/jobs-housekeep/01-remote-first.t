@@ -0,0 +1,87 @@
+#!/bin/bash
+# THIS FILE IS PART OF THE CYLC SUITE ENGINE.
+# Copyright (C) 2008-2018 NIWA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#-------------------------------------------------------------------------------
+# Test job log housekeeping deletes local cycle point directories only after
+# the remote housekeeping commands succeed.
+. "$(dirname "$0")/test_header"
+set_test_number 1
+
+mkdir -p 'log/job/1/foo/01' 'log/job/2/foo/01' 'log/job/3/foo/01'
+run_ok "${TEST_NAME_BASE}" python - "${PWD}/log/job" <<'__PYTHON__'
+import sys
+
+from cylc.cfgspec.glbl_cfg import glbl_cfg
+from cylc.cycling.loader import (
+    DefaultCycler, INTEGER_CYCLING_TYPE, get_point)
+from cylc.task_job_mgr import TaskJobManager
+
+
+class FakeProcPool(object):
+    """Record commands put to the process pool."""
+
+    def __init__(self):
+        self.items = []
+
+    def put_command(self, ctx, callback):
+        self.items.append((ctx, callback))
+
+    def run_items(self, ret_code):
+        """Return commands put so far, run callbacks with ret_code."""
+        items, self.items = self.items, []
+        for ctx, callback in items:
+            ctx.ret_code = ret_code
+            callback(ctx)
+        return [ctx.cmd for ctx, _ in items]
+
+
+class FakeDAO(object):
+    """Report a remote user@host for all cycle points."""
+
+    @staticmethod
+    def select_task_job_hosts(_):
+        return set(['localhost', 'nosuchuser@localhost'])
+
+
+class FakeSuiteDBMgr(object):
+    pri_dao = FakeDAO()
+
+
+DefaultCycler.TYPE = INTEGER_CYCLING_TYPE
+glbl_cfg().get_derived_host_item = lambda *_: sys.argv[1]
+proc_pool = FakeProcPool()
+mgr = TaskJobManager('foo', proc_pool, FakeSuiteDBMgr(), None)
+
+# Remote command fails: no local command, retry on next call.
+mgr.housekeep_job_logs('foo', get_point('3'))
+cmds = proc_pool.run_items(1)
+assert len(cmds) == 1, cmds
+assert '--user=nosuchuser' in cmds[0], cmds
+assert cmds[0][-2:] == ['1', '2'], cmds
+assert not proc_pool.items, proc_pool.items
+assert mgr.n_housekeep_cmds == 0
+
+# Remote command succeeds: then local commands.
+mgr.housekeep_job_logs('foo', get_point('3'))
+cmds = proc_pool.run_items(0)
+assert len(cmds) == 1 and cmds[0][-2:] == ['1', '2'], cmds
+cmds = proc_pool.run_items(0)
+assert [cmd[-2:] for cmd in cmds] == [
+    [sys.argv[1], '1'], [sys.argv[1], '2']], cmds
+assert not any('--user=nosuchuser' in cmd for cmd in cmds), cmds
+assert mgr.n_housekeep_cmds == 0
+__PYTHON__
+exit
@@ -0,0 +1,56 @@
+#!/bin/bash
+# THIS FILE IS PART OF THE CYLC SUITE ENGINE.
+# Copyright (C) 2008-2018 NIWA
+# 
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#-------------------------------------------------------------------------------
+# Test job files written from a task's job file template, and the fall-back to
+# full writes for jobs with broadcast settings or suite state polling scripts.
+. "$(dirname "$0")/test_header"
+set_test_number 5
+
+# Template jobs with different submit number, try number and cycle point.
+run_ok "${TEST_NAME_BASE}-unit" python -m 'cylc.job_file'
+
+# Suite state polling scripts are specific to the cycle point.
+install_suite "${TEST_NAME_BASE}-polling" "${TEST_NAME_BASE}/polling"
+run_ok "${TEST_NAME_BASE}-polling-submit" \
+    cylc submit --dry-run "${SUITE_NAME}" \
+    'upstream.20200101T0000Z' 'upstream.20200102T0000Z'
+sed -n '/^cylc suite-state/p' \
+    "${SUITE_RUN_DIR}/log/job/20200101T0000Z/upstream/01/job" \
+    "${SUITE_RUN_DIR}/log/job/20200102T0000Z/upstream/01/job" \
+    >'polling.out'
+cmp_ok 'polling.out' <<'__OUT__'
+cylc suite-state  --task=foo --point=20200101T0000Z --status=succeed other.suite
+cylc suite-state  --task=foo --point=20200102T0000Z --status=succeed other.suite
+__OUT__
+purge_suite "${SUITE_NAME}"
+
+# Broadcast settings apply to the targeted job only.
+install_suite "${TEST_NAME_BASE}-broadcast" "${TEST_NAME_BASE}/broadcast"
+suite_run_ok "${TEST_NAME_BASE}-broadcast-run" \
+    cylc run --debug --no-detach "${SUITE_NAME}"
+sed -n 's/^ *\(GREETING=\)/\1/p' \
+    "${SUITE_RUN_DIR}/log/job/20200101T0000Z/foo/01/job" \
+    "${SUITE_RUN_DIR}/log/job/20200102T0000Z/foo/01/job" \
+    "${SUITE_RUN_DIR}/log/job/20200103T0000Z/foo/01/job" \
+    >'broadcast.out'
+cmp_ok 'broadcast.out' <<'__OUT__'
+GREETING="hello"
+GREETING="hi"
+GREETING="hello"
+__OUT__
+purge_suite "${SUITE_NAME}"
+exit
@@ -17,7 +17,7 @@
 #-------------------------------------------------------------------------------
 . $(dirname $0)/test_header
 #-------------------------------------------------------------------------------
-set_test_number 49
+set_test_number 61
 #-------------------------------------------------------------------------------
 LOG_SCRIPT="$CYLC_DIR/lib/cylc/suite_logging.py"
 TMP_DIR=$(mktemp -d)
@@ -35,6 +35,18 @@ for N in $(seq 0 1 $(expr ${#LOG_FILES[@]} - 1)); do
     cmp_ok "$LOG_DIR/${LOG_FILES[$N]}" "$CMP_DIR/${CMP_FILES[$N]}"
 done
 #-------------------------------------------------------------------------------
+# Test log file rolling with records written by the background writer.
+mkdir "$TMP_DIR/test_roll_queued"
+TEST_NAME=$TEST_NAME_BASE-test-roll-queued
+run_ok $TEST_NAME python "$LOG_SCRIPT" "$TMP_DIR" "test-roll-queued"
+CMP_DIR="$TEST_SOURCE_DIR/01-suite-logging/test_roll"
+LOG_DIR="$TMP_DIR/test_roll_queued"
+LOG_FILES=($(ls $LOG_DIR))
+CMP_FILES=($(ls $CMP_DIR))
+for N in $(seq 0 1 $(expr ${#LOG_FILES[@]} - 1)); do
+    cmp_ok "$LOG_DIR/${LOG_FILES[$N]}" "$CMP_DIR/${CMP_FILES[$N]}"
+done
+#-------------------------------------------------------------------------------
 # Test back compatability to old logging system (i.e. log.1, log.2, ..., log.n)
 mkdir "$TMP_DIR/test_back_compat"
 TEST_NAME=$TEST_NAME_BASE-test-back-compat
@@ -69,5 +81,15 @@ for N in $(seq 0 1 $(expr ${#LOG_FILES[@]} - 1)); do
     cmp_ok "$LOG_DIR/${LOG_FILES[$N]}" "$CMP_DIR/${CMP_FILES[$N]}"
 done
 #-------------------------------------------------------------------------------
+# Test reading the tail of a log.
+mkdir "$TMP_DIR/test_get_lines"
+TEST_NAME=$TEST_NAME_BASE-test-get-lines
+run_ok $TEST_NAME python "$LOG_SCRIPT" "$TMP_DIR" "test-get-lines"
+#-------------------------------------------------------------------------------
+# Test that queued records only update the log when written.
+mkdir "$TMP_DIR/test_update_time"
+TEST_NAME=$TEST_NAME_BASE-test-update-time
+run_ok $TEST_NAME python "$LOG_SCRIPT" "$TMP_DIR" "test-update-time"
+#-------------------------------------------------------------------------------
 rm -rf $TMP_DIR
 #-------------------------------------------------------------------------------
@@ -0,0 +1,56 @@
+#!/bin/bash
+# THIS FILE IS PART OF THE CYLC SUITE ENGINE.
+# Copyright (C) 2008-2018 NIWA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#-------------------------------------------------------------------------------
+# Test simulation mode with a virtual clock. Simulated jobs should run for their
+# full simulated run length in suite time, but the suite should not take that
+# long to run in real time.
+. "$(dirname "$0")/test_header"
+if ! which sqlite3 > /dev/null; then
+    skip_all 'sqlite3 not installed?'
+fi
+set_test_number 4
+install_suite "${TEST_NAME_BASE}" "${TEST_NAME_BASE}"
+
+run_ok "${TEST_NAME_BASE}-validate" cylc validate "${SUITE_NAME}"
+SECONDS=0
+suite_run_ok "${TEST_NAME_BASE}-run" \
+    cylc run --mode=simulation --debug --no-detach "${SUITE_NAME}"
+# 4 hours of simulated jobs should take nowhere near that long.
+run_ok "${TEST_NAME_BASE}-elapsed" test "${SECONDS}" -lt 240
+
+# Simulation mode does not write task_jobs rows, but task state update times
+# come from the (virtual) suite clock. Each task should succeed a whole number
+# of simulated hours after the suite started, give or take the real seconds
+# spent running the suite.
+DB_FILE="$(cylc get-global-config '--print-run-dir')/${SUITE_NAME}/log/db"
+sqlite3 "${DB_FILE}" \
+    "SELECT cycle, name,
+            (strftime('%s', time_updated) -
+             (SELECT min(strftime('%s', time_created)) FROM task_states) +
+             1800) / 3600
+     FROM task_states ORDER BY cycle, name" >'select.out'
+cmp_ok 'select.out' <<'__SELECT__'
+20200101T0000Z|bar|2
+20200101T0000Z|foo|1
+20200102T0000Z|bar|3
+20200102T0000Z|foo|2
+20200103T0000Z|bar|4
+20200103T0000Z|foo|3
+__SELECT__
+
+purge_suite "${SUITE_NAME}"
+exit
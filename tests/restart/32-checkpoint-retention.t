@@ -0,0 +1,61 @@
+#!/bin/bash
+# THIS FILE IS PART OF THE CYLC SUITE ENGINE.
+# Copyright (C) 2008-2018 NIWA
+# 
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#-------------------------------------------------------------------------------
+# Test restart from the oldest checkpoint kept by the automatic checkpoint
+# retention. The restart checkpoint must not prune it before it is loaded.
+. "$(dirname "$0")/test_header"
+
+date-remove() {
+    sed 's/[0-9]\+\(-[0-9]\{2\}\)\{2\}T[0-9]\{2\}\(:[0-9]\{2\}\)\{2\}Z/DATE/'
+}
+
+set_test_number 5
+
+install_suite "${TEST_NAME_BASE}" "${TEST_NAME_BASE}"
+cp -p 'suite.rc' 'suite1.rc'
+
+run_ok "${TEST_NAME_BASE}-validate" cylc validate "${SUITE_NAME}"
+
+# Suite reloads+inserts new task to mess up prerequisites - suite should stall
+suite_run_fail "${TEST_NAME_BASE}-run" \
+    timeout 120 cylc run "${SUITE_NAME}" --debug --no-detach
+cylc ls-checkpoints "${SUITE_NAME}" | date-remove >'cylc-ls-checkpoints-1.out'
+cmp_ok 'cylc-ls-checkpoints-1.out' <<'__OUT__'
+#######################################################################
+# CHECKPOINT ID (ID|TIME|EVENT)
+1|DATE|reload-init
+2|DATE|reload-done
+0|DATE|latest
+__OUT__
+
+# Restart from checkpoint 1, which the restart checkpoint will push out of the
+# retention window, should allow the suite to proceed normally.
+cp -p 'suite1.rc' 'suite.rc'
+suite_run_ok "${TEST_NAME_BASE}-restart" \
+    timeout 120 cylc restart "${SUITE_NAME}" \
+    --checkpoint=1 --debug --no-detach --reference-test
+cylc ls-checkpoints "${SUITE_NAME}" | date-remove >'cylc-ls-checkpoints-2.out'
+cmp_ok 'cylc-ls-checkpoints-2.out' <<'__OUT__'
+#######################################################################
+# CHECKPOINT ID (ID|TIME|EVENT)
+2|DATE|reload-done
+3|DATE|restart
+0|DATE|latest
+__OUT__
+
+purge_suite "${SUITE_NAME}"
+exit
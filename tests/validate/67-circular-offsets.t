@@ -0,0 +1,91 @@
+#!/bin/bash
+# THIS FILE IS PART OF THE CYLC SUITE ENGINE.
+# Copyright (C) 2008-2018 NIWA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#-------------------------------------------------------------------------------
+# Test validation of circular dependence with inter-cycle offsets, which is
+# checked on the abstract graph first, then on the concrete graph if needed.
+. "$(dirname "$0")/test_header"
+
+set_test_number 6
+
+cat >'suite.rc' <<'__SUITE_RC__'
+[cylc]
+    cycle point format = %Y
+[scheduling]
+    initial cycle point = 2001
+    final cycle point = 2010
+    [[dependencies]]
+        [[[P1Y]]]
+            graph = '''
+a[-P1Y] => b => c => a
+c[-P2Y] => b
+'''
+__SUITE_RC__
+
+run_ok "${TEST_NAME_BASE}-same-sign" cylc validate 'suite.rc'
+
+cat >'suite.rc' <<'__SUITE_RC__'
+[cylc]
+    cycle point format = %Y
+[scheduling]
+    initial cycle point = 2001
+    final cycle point = 2010
+    [[dependencies]]
+        [[[P1Y]]]
+            graph = '''
+a[+P1Y] => b
+b[-P1Y] => a
+'''
+__SUITE_RC__
+
+run_fail "${TEST_NAME_BASE}-mixed-sign" cylc validate 'suite.rc'
+contains_ok "${TEST_NAME_BASE}-mixed-sign.stderr" <<'__ERR__'
+'ERROR: circular edges detected:  b.2001 => a.2002  b.2002 => a.2003  a.2002 => b.2001  a.2003 => b.2002'
+__ERR__
+
+cat >'suite.rc' <<'__SUITE_RC__'
+[cylc]
+    cycle point format = %Y
+[scheduling]
+    initial cycle point = 2001
+    final cycle point = 2010
+    [[dependencies]]
+        [[[P1Y]]]
+            graph = '''
+a[^] => b
+b => a
+'''
+__SUITE_RC__
+
+run_fail "${TEST_NAME_BASE}-icp" cylc validate 'suite.rc'
+contains_ok "${TEST_NAME_BASE}-icp.stderr" <<'__ERR__'
+'ERROR: circular edges detected:  b.2001 => a.2001  a.2001 => b.2001'
+__ERR__
+
+cat >'suite.rc' <<'__SUITE_RC__'
+[scheduling]
+    cycling mode = integer
+    initial cycle point = 1
+    [[dependencies]]
+        [[[1/P2]]]
+            graph = foo => bar
+        [[[2/P2]]]
+            graph = bar => foo
+__SUITE_RC__
+
+run_ok "${TEST_NAME_BASE}-sequences-no-meet" cylc validate 'suite.rc'
+
+exit
@@ -0,0 +1,45 @@
+#!/bin/bash
+# THIS FILE IS PART OF THE CYLC SUITE ENGINE.
+# Copyright (C) 2008-2018 NIWA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#-------------------------------------------------------------------------------
+# Test validation checks trigger expressions on all sequences, once for each
+# distinct expression structure.
+. "$(dirname "$0")/test_header"
+
+set_test_number 2
+
+cat >'suite.rc' <<'__SUITE_RC__'
+[cylc]
+    cycle point format = %Y
+    [[parameters]]
+        m = 1..5
+[scheduling]
+    initial cycle point = 2001
+    final cycle point = 2005
+    [[dependencies]]
+        [[[R1]]]
+            graph = a
+        [[[R1/+P2Y]]]
+            graph = "a[^] | b => c<m>"
+        [[[P1Y]]]
+            graph = "c<m>[-P1Y] => c<m>"
+[runtime]
+    [[a, b, c<m>]]
+__SUITE_RC__
+
+run_ok "${TEST_NAME_BASE}" cylc validate -v 'suite.rc'
+grep_ok '^  + 2 distinct trigger expressions ok$' "${TEST_NAME_BASE}.stdout"
+exit
@@ -0,0 +1,79 @@
+#!/bin/bash
+# THIS FILE IS PART OF THE CYLC SUITE ENGINE.
+# Copyright (C) 2008-2018 NIWA
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#-------------------------------------------------------------------------------
+# Test validation with graph sections parsed by a pool of processes.
+. "$(dirname "$0")/test_header"
+
+set_test_number 7
+
+create_test_globalrc 'suite config processes = 2'
+
+cat >'suite.rc' <<'__SUITE_RC__'
+[cylc]
+    cycle point format = %Y
+[scheduling]
+    initial cycle point = 2001
+    final cycle point = 2003
+    [[dependencies]]
+        [[[R1]]]
+            graph = "a => b"
+        [[[P1Y]]]
+            graph = "b[-P1Y] => b => c"
+        [[[R1/$]]]
+            graph = "c => d"
+[runtime]
+    [[a, b, c, d]]
+__SUITE_RC__
+
+run_ok "${TEST_NAME_BASE}" cylc validate -v 'suite.rc'
+grep_ok 'Parsing 3 graph sections with 2 processes' \
+    "${TEST_NAME_BASE}.stdout"
+grep_ok '^  + d\.2003 ok$' "${TEST_NAME_BASE}.stdout"
+
+# Callers that may have other threads, e.g. suite server programs, should not
+# fork worker processes.
+run_ok "${TEST_NAME_BASE}-no-pool" python - 'suite.rc' <<'__PYTHON__'
+import sys
+
+import cylc.flags
+from cylc.config import SuiteConfig
+
+cylc.flags.verbose = True
+SuiteConfig('suite', sys.argv[1])
+__PYTHON__
+count_ok 'graph sections with' "${TEST_NAME_BASE}-no-pool.stdout" 0
+
+# Errors should be reported in section order.
+cat >'suite.rc' <<'__SUITE_RC__'
+[scheduling]
+    initial cycle point = 2001
+    [[dependencies]]
+        [[[R1]]]
+            graph = "a => b"
+        [[[P1Y]]]
+            graph = "a => b & => c"
+        [[[P2Y]]]
+            graph = "a => => c"
+[runtime]
+    [[a, b, c]]
+__SUITE_RC__
+
+run_fail "${TEST_NAME_BASE}-bad" cylc validate 'suite.rc'
+cmp_ok "${TEST_NAME_BASE}-bad.stderr" <<'__ERR__'
+ERROR, null task name in graph: b& => c
+__ERR__
+exit